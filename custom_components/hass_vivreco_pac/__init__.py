@@ -1,15 +1,32 @@
 """Vivreco PAC integration."""
 
+import asyncio
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import config_validation as cv
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_TOKEN,
+    Platform,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.loader import async_get_integration
 
 from .api import VivrecoApiClient
-from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN, PLATFORMS
+from .const import (
+    CONF_CAPABILITIES,
+    CONF_HP_ID,
+    CONF_LOCAL_URL,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    PLATFORMS,
+)
 from .coordinator import VivrecoDataUpdateCoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
@@ -17,37 +34,163 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 async def async_setup(hass: HomeAssistant, config):
     """Plus de support configuration.yaml, tout passe par le config flow."""
+    await async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Vivreco PAC from a config entry."""
+    started = time.monotonic()
     hass.data.setdefault(DOMAIN, {})
 
-    # Initialise l'API
+    # Initialise l'API, en reprenant la PAC et le token du démarrage précédent
     api = VivrecoApiClient(
         username=entry.data[CONF_EMAIL],
         password=entry.data[CONF_PASSWORD],
+        hp_id=entry.data.get(CONF_HP_ID),
+        api_token=entry.data.get(CONF_TOKEN),
+        hass=hass,
+        local_url=entry.options.get(CONF_LOCAL_URL) or None,
     )
 
-    hass.data[DOMAIN]["api"] = api
-
     # Création du coordinateur
     coordinator = VivrecoDataUpdateCoordinator(
         hass,
+        entry,
+        api,
         update_interval=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_UPDATE_INTERVAL),
     )
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_load_state()
+
+    # Premier rafraîchissement et import des plateformes en parallèle, en se
+    # limitant à celles des fonctionnalités connues au démarrage précédent
+    known = entry.data.get(CONF_CAPABILITIES)
+    integration = await async_get_integration(hass, DOMAIN)
+    await asyncio.gather(
+        coordinator.async_config_entry_first_refresh(),
+        *(
+            integration.async_get_platform(platform)
+            for platform in (
+                supported_platforms(known) if known is not None else PLATFORMS
+            )
+        ),
+    )
+    refreshed = time.monotonic()
+
+    # Mémorise la PAC, le token et les fonctionnalités pour les prochains démarrages
+    capabilities = dict(coordinator.data.get("config", {}))
+    persisted = {
+        CONF_HP_ID: api.hp_id,
+        CONF_TOKEN: api.api_token,
+        CONF_CAPABILITIES: capabilities,
+    }
+    if any(entry.data.get(key) != value for key, value in persisted.items()):
+        hass.config_entries.async_update_entry(entry, data={**entry.data, **persisted})
+
+    if entry.minor_version < 2:
+        await _async_migrate_unique_ids(hass, entry, api.hp_id)
+
+    # Schéma des clés sans entité dédiée, inféré seulement si elles ont changé
+    if coordinator.discovery.update(coordinator.data):
+        _LOGGER.debug(
+            "Clés découvertes : %s relevés, %s paramètres",
+            len(coordinator.discovery.values),
+            len(coordinator.discovery.settings),
+        )
+        _async_remove_stale_discovered(hass, entry, coordinator.discovery.entities)
 
     # Stocker le coordinateur
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.platforms = supported_platforms(capabilities)
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    coordinator.bootstrap = {
+        "first_refresh": round(refreshed - started, 3),
+        "platforms": round(time.monotonic() - refreshed, 3),
+        "total": round(time.monotonic() - started, 3),
+    }
+    _LOGGER.debug("Démarrage Vivreco PAC : %s", coordinator.bootstrap)
+
+    # État calculé et file des commandes enregistrés avant un rechargement
+    entry.async_on_unload(coordinator.async_save_state)
     entry.async_on_unload(entry.add_update_listener(async_update_entry))
+    entry.async_on_unload(coordinator.command_tracker.async_cancel)
+    entry.async_on_unload(api.async_close)
+    if coordinator.exporter is not None:
+        entry.async_on_unload(coordinator.exporter.async_flush)
+
+    # Retard de la boucle d'événements (tâche annulée au déchargement)
+    entry.async_create_background_task(
+        hass, coordinator.probe.async_watch_loop(), "vivreco_loop_probe"
+    )
+
+    @callback
+    def _async_check_capabilities() -> None:
+        """Recharge l'entrée si les fonctionnalités de la PAC ont changé."""
+        current = coordinator.data.get("config", {})
+        if current and current != capabilities:
+            _LOGGER.info("Fonctionnalités de la PAC modifiées : %s", current)
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_capabilities))
 
     return True
 
 
+async def _async_migrate_unique_ids(
+    hass: HomeAssistant, entry: ConfigEntry, hp_id: str
+) -> None:
+    """Préfixe par la PAC les identifiants des entités créées avant la 1.2.
+
+    Les entrées créées avant le choix de la PAC dans le config flow reçoivent
+    aussi son identifiant, pour ne pas être ajoutées une seconde fois.
+    """
+
+    @callback
+    def _migrate(entity_entry: er.RegistryEntry) -> dict | None:
+        if entity_entry.unique_id.startswith(f"{hp_id}_"):
+            return None
+        return {"new_unique_id": f"{hp_id}_{entity_entry.unique_id}"}
+
+    await er.async_migrate_entries(hass, entry.entry_id, _migrate)
+    hass.config_entries.async_update_entry(
+        entry, unique_id=entry.unique_id or hp_id, minor_version=2
+    )
+
+
+@callback
+def _async_remove_stale_discovered(
+    hass: HomeAssistant, entry: ConfigEntry, expected: set[tuple[str, str]]
+) -> None:
+    """Supprime les entités découvertes qui ne correspondent plus au schéma.
+
+    Une clé disparue ou passée sur une autre plateforme (paramètre devenu
+    lecture seule, booléen en capteur binaire) laisserait sinon une entité
+    orpheline dans le registre.
+    """
+    registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        _, found, key = entity_entry.unique_id.partition("_discovered_")
+        if found and (entity_entry.domain, key) not in expected:
+            registry.async_remove(entity_entry.entity_id)
+
+
+def supported_platforms(capabilities: dict) -> list[Platform]:
+    """Plateformes utiles pour les fonctionnalités détectées."""
+    heating = capabilities.get("ch", False) or capabilities.get("raf", False)
+    ecs = capabilities.get("ecs", False)
+
+    platforms = [Platform.BINARY_SENSOR, Platform.SENSOR, Platform.SWITCH]
+    if heating:
+        platforms.append(Platform.CLIMATE)
+    if heating or ecs:
+        platforms.extend([Platform.NUMBER, Platform.SELECT])
+    if ecs:
+        platforms.append(Platform.WATER_HEATER)
+    return sorted(platforms)
+
+
 async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -57,4 +200,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
 
     _LOGGER.debug("async_unload_entry: %s", entry)
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    platforms = coordinator.platforms if coordinator else PLATFORMS
+    if unloaded := await hass.config_entries.async_unload_platforms(entry, platforms):
+        # Coordinateur, session et Store libérés : une entrée par PAC, rechargeable
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+    return unloaded
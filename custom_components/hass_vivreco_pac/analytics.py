@@ -0,0 +1,224 @@
+"""Analyse de la consommation (deltas glissants, coût, COP estimé) Vivreco PAC."""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from .const import (
+    COP_CARNOT_EFFICIENCY,
+    COP_FLOW_OFFSET_CH,
+    COP_FLOW_OFFSET_ECS,
+    COP_MAX,
+    COP_MIN,
+    ENERGY_ANALYTICS_DAYS,
+)
+
+# Catégories de production de chaleur pour lesquelles un COP a un sens
+HEATING_CATEGORIES = ("ch", "ecs")
+
+
+@dataclass
+class VivrecoTariff:
+    """Tarif heures pleines / heures creuses."""
+
+    peak_price: float
+    offpeak_price: float
+    offpeak_start: time
+    offpeak_end: time
+
+    def is_offpeak(self, moment: datetime) -> bool:
+        """Retourne True si l'instant est en heures creuses."""
+        current = moment.time()
+        if self.offpeak_start <= self.offpeak_end:
+            return self.offpeak_start <= current < self.offpeak_end
+        # Plage à cheval sur minuit (ex. 22:00 → 06:00)
+        return current >= self.offpeak_start or current < self.offpeak_end
+
+    def price_at(self, moment: datetime) -> float:
+        """Prix du kWh à l'instant donné."""
+        return self.offpeak_price if self.is_offpeak(moment) else self.peak_price
+
+
+def estimate_cop(category: str, t_ext: float | None, values: dict) -> float | None:
+    """Estime le COP instantané (Carnot pondéré) pour une catégorie d'énergie."""
+    if t_ext is None:
+        return None
+
+    if category == "ecs":
+        setpoint = values.get("cons_t_ecs")
+        offset = COP_FLOW_OFFSET_ECS
+    else:
+        setpoint = values.get("cons_t_int")
+        offset = COP_FLOW_OFFSET_CH
+    if setpoint is None:
+        return None
+
+    t_sink = float(setpoint) + offset
+    lift = t_sink - float(t_ext)
+    if lift <= 0:
+        return COP_MAX
+
+    cop = COP_CARNOT_EFFICIENCY * (t_sink + 273.15) / lift
+    return max(COP_MIN, min(COP_MAX, cop))
+
+
+class VivrecoEnergyAnalytics:
+    """Agrégats glissants calculés à partir des compteurs cumulés `energy_meters`.
+
+    Chaque rafraîchissement ne traite que le delta depuis l'échantillon précédent :
+    la fenêtre d'une heure est une file d'échantillons avec somme courante, la
+    journée est un accumulateur remis à zéro à minuit et l'historique quotidien
+    est borné à `ENERGY_ANALYTICS_DAYS` jours.
+    """
+
+    def __init__(self, tariff: VivrecoTariff) -> None:
+        """Initialise les agrégats."""
+        self.tariff = tariff
+        self._last_counters: dict[str, float] = {}
+
+        # Fenêtre glissante d'une heure : (horodatage, kWh, coût)
+        self._window: deque[tuple[datetime, float, float]] = deque()
+        self._window_energy = 0.0
+        self._window_cost = 0.0
+
+        # Journée calendaire en cours
+        self._day: date | None = None
+        self._day_start: datetime | None = None
+        self._day_energy: dict[str, float] = {}
+        self._day_cost = 0.0
+        self._day_heat = 0.0
+        self._day_heat_input = 0.0
+        self._cop: float | None = None
+        self._offpeak: bool | None = None
+
+        # Historique des journées terminées
+        self._days: deque[dict] = deque(maxlen=ENERGY_ANALYTICS_DAYS)
+
+    def update(self, now: datetime, counters: dict[str, float], values: dict) -> None:
+        """Intègre un nouvel échantillon des compteurs."""
+        self._roll_day(now)
+
+        price = self.tariff.price_at(now)
+        self._offpeak = self.tariff.is_offpeak(now)
+        t_ext = values.get("t_ext")
+        sample_energy = 0.0
+
+        for category, raw in counters.items():
+            if raw is None:
+                continue
+            current = float(raw)
+            previous = self._last_counters.get(category)
+            self._last_counters[category] = current
+            if previous is None:
+                continue
+
+            # Un compteur qui recule a été remis à zéro : tout le relevé est nouveau
+            delta = current - previous if current >= previous else current
+            if delta <= 0:
+                continue
+
+            sample_energy += delta
+            self._day_energy[category] = self._day_energy.get(category, 0.0) + delta
+
+            if category in HEATING_CATEGORIES:
+                cop = estimate_cop(category, t_ext, values)
+                if cop is not None:
+                    self._cop = cop
+                    self._day_heat += delta * cop
+                    self._day_heat_input += delta
+
+        sample_cost = sample_energy * price
+        self._day_cost += sample_cost
+
+        self._window.append((now, sample_energy, sample_cost))
+        self._window_energy += sample_energy
+        self._window_cost += sample_cost
+        self._prune_window(now)
+
+    def _prune_window(self, now: datetime) -> None:
+        """Retire les échantillons sortis de la fenêtre d'une heure."""
+        limit = now - timedelta(hours=1)
+        while self._window and self._window[0][0] <= limit:
+            _, energy, cost = self._window.popleft()
+            self._window_energy -= energy
+            self._window_cost -= cost
+
+    def _roll_day(self, now: datetime) -> None:
+        """Archive la journée écoulée au passage de minuit."""
+        today = now.date()
+        if self._day == today:
+            return
+
+        if self._day is not None:
+            self._days.append(
+                {
+                    "date": self._day.isoformat(),
+                    "energy": round(sum(self._day_energy.values()), 3),
+                    "cost": round(self._day_cost, 2),
+                    "cop": self._daily_cop(),
+                }
+            )
+
+        self._day = today
+        self._day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self._day_energy = {}
+        self._day_cost = 0.0
+        self._day_heat = 0.0
+        self._day_heat_input = 0.0
+
+    def _daily_cop(self) -> float | None:
+        """COP moyen de la journée pondéré par l'énergie consommée."""
+        if self._day_heat_input <= 0:
+            return None
+        return round(self._day_heat / self._day_heat_input, 2)
+
+    @property
+    def snapshot(self) -> dict:
+        """Valeurs exposées par les capteurs."""
+        return {
+            "energy_last_hour": round(max(self._window_energy, 0.0), 3),
+            "cost_last_hour": round(max(self._window_cost, 0.0), 4),
+            "energy_today": round(sum(self._day_energy.values()), 3),
+            "energy_today_by_type": {
+                key: round(value, 3) for key, value in self._day_energy.items()
+            },
+            "cost_today": round(self._day_cost, 4),
+            "day_start": self._day_start,
+            "cop_estimated": round(self._cop, 2) if self._cop is not None else None,
+            "cop_today": self._daily_cop(),
+            "offpeak": self._offpeak,
+            "history": list(self._days),
+        }
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "last_counters": self._last_counters,
+            "window": [
+                [moment.isoformat(), energy, cost]
+                for moment, energy, cost in self._window
+            ],
+            "day_start": self._day_start.isoformat() if self._day_start else None,
+            "day_energy": self._day_energy,
+            "day_cost": self._day_cost,
+            "day_heat": self._day_heat,
+            "day_heat_input": self._day_heat_input,
+            "days": list(self._days),
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage (journée en cours comprise)."""
+        self._last_counters = dict(data.get("last_counters", {}))
+        for moment, energy, cost in data.get("window", []):
+            self._window.append((datetime.fromisoformat(moment), energy, cost))
+            self._window_energy += energy
+            self._window_cost += cost
+        day_start = data.get("day_start")
+        if day_start:
+            self._day_start = datetime.fromisoformat(day_start)
+            self._day = self._day_start.date()
+        self._day_energy = dict(data.get("day_energy", {}))
+        self._day_cost = data.get("day_cost", 0.0)
+        self._day_heat = data.get("day_heat", 0.0)
+        self._day_heat_input = data.get("day_heat_input", 0.0)
+        self._days.extend(data.get("days", []))
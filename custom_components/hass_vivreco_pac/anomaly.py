@@ -0,0 +1,232 @@
+"""Détection en continu des anomalies de fonctionnement de la PAC."""
+
+from datetime import datetime
+import math
+
+from .const import ANOMALY_ALPHA, ANOMALY_MIN_SAMPLES, ANOMALY_SETTLE_TIME
+
+STATE_DEFROST = "degi"
+
+# Métriques surveillées (une valeur élevée est anormale) et nombre de valeurs
+# consécutives au-delà du seuil avant de signaler l'anomalie
+ANOMALY_METRICS = {
+    "defrost_duration": 1,
+    "ecs_recovery": 1,
+    "t_int_deviation": 3,
+    "energy_per_degree": 2,
+}
+
+# Écart type minimal, en fraction de la moyenne : une série très régulière ne
+# doit pas rendre anormale la moindre variation
+MIN_DEVIATION = 0.05
+
+# Écart type minimal dans l'unité de la métrique, pour celles dont la valeur
+# normale est nulle (°C sous la consigne)
+MIN_SCALE = {"t_int_deviation": 0.5}
+
+# Écart intérieur / extérieur minimal pour rapporter l'énergie aux degrés
+MIN_DEGREES = 5.0
+
+
+class VivrecoEwma:
+    """Moyenne et variance exponentielles d'une métrique, mises à jour en O(1)."""
+
+    def __init__(self, floor: float = 1e-3) -> None:
+        """Initialise la statistique (`floor` : écart type minimal)."""
+        self.floor = floor
+        self.mean: float | None = None
+        self.variance = 0.0
+        self.count = 0
+
+    def score(self, value: float) -> float | None:
+        """Écart réduit (z-score) de la valeur par rapport à la moyenne."""
+        if self.mean is None or self.count < ANOMALY_MIN_SAMPLES:
+            return None
+        deviation = max(
+            math.sqrt(self.variance), MIN_DEVIATION * abs(self.mean), self.floor
+        )
+        return (value - self.mean) / deviation
+
+    def update(self, value: float) -> None:
+        """Intègre une valeur."""
+        self.count += 1
+        if self.mean is None:
+            self.mean = value
+            return
+        delta = value - self.mean
+        self.mean += ANOMALY_ALPHA * delta
+        self.variance = (1 - ANOMALY_ALPHA) * (
+            self.variance + ANOMALY_ALPHA * delta * delta
+        )
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {"mean": self.mean, "variance": self.variance, "count": self.count}
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        self.mean = data.get("mean")
+        self.variance = float(data.get("variance", 0.0))
+        self.count = int(data.get("count", 0))
+
+
+class VivrecoAnomalyDetector:
+    """Extrait les métriques de santé des relevés et les compare à leur historique.
+
+    Une valeur dont le z-score dépasse le seuil n'entre pas dans la moyenne,
+    pour qu'une dérive durable ne devienne pas la norme ; l'anomalie est
+    signalée après `ANOMALY_METRICS[metric]` valeurs consécutives au-delà du
+    seuil et levée dès qu'une valeur revient en dessous.
+    """
+
+    def __init__(self, threshold: float) -> None:
+        """Initialise le détecteur."""
+        self.threshold = threshold
+        self.metrics = {
+            metric: VivrecoEwma(MIN_SCALE.get(metric, 1e-3))
+            for metric in ANOMALY_METRICS
+        }
+        self.scores: dict[str, float | None] = dict.fromkeys(ANOMALY_METRICS)
+        self.last: dict[str, float] = {}
+        self.active: set[str] = set()
+        self._exceeded: dict[str, int] = dict.fromkeys(ANOMALY_METRICS, 0)
+        self._defrost_start: float | None = None
+        self._last_recovery: float | None = None
+        self._last_hour: int | None = None
+        self._setpoint: float | None = None
+        self._setpoint_since: float | None = None
+        self._settled = False
+
+    def _samples(
+        self,
+        now: datetime,
+        values: dict,
+        ecs_recovery: float | None,
+        ecs_recovery_end: float | None,
+        energy_last_hour: float | None,
+    ) -> dict[str, float]:
+        """Métriques disponibles pour ce relevé."""
+        samples: dict[str, float] = {}
+        timestamp = now.timestamp()
+
+        # Durée (minutes) de chaque dégivrage terminé
+        if values.get("state") == STATE_DEFROST:
+            if self._defrost_start is None:
+                self._defrost_start = timestamp
+        elif self._defrost_start is not None:
+            samples["defrost_duration"] = (timestamp - self._defrost_start) / 60
+            self._defrost_start = None
+
+        # Durée de chaque chauffe ECS terminée, une seule fois par chauffe (deux
+        # chauffes successives peuvent avoir la même durée)
+        if (
+            ecs_recovery is not None
+            and ecs_recovery_end is not None
+            and ecs_recovery_end != self._last_recovery
+        ):
+            self._last_recovery = ecs_recovery_end
+            samples["ecs_recovery"] = ecs_recovery
+
+        t_int, t_ext = values.get("t_int"), values.get("t_ext")
+        setpoint = values.get("cons_t_int")
+        if setpoint is not None and float(setpoint) != self._setpoint:
+            self._setpoint = float(setpoint)
+            self._setpoint_since = timestamp
+            self._settled = False
+        # Manque de chauffe (température sous la consigne), mesuré une fois la
+        # consigne atteinte ou après le délai maximal de relance : le retour
+        # du confort après un abaissement n'est pas une anomalie
+        if t_int is not None and setpoint is not None:
+            shortfall = max(0.0, self._setpoint - float(t_int))
+            self._settled = self._settled or (
+                shortfall == 0
+                or timestamp - self._setpoint_since
+                >= ANOMALY_SETTLE_TIME.total_seconds()
+            )
+            if self._settled:
+                samples["t_int_deviation"] = shortfall
+
+        # Énergie de l'heure écoulée par degré d'écart, une fois par heure
+        hour = int(timestamp // 3600)
+        if (
+            hour != self._last_hour
+            and energy_last_hour is not None
+            and t_int is not None
+            and t_ext is not None
+            and float(t_int) - float(t_ext) >= MIN_DEGREES
+        ):
+            self._last_hour = hour
+            samples["energy_per_degree"] = energy_last_hour / (
+                float(t_int) - float(t_ext)
+            )
+        return samples
+
+    def update(
+        self,
+        now: datetime,
+        values: dict,
+        ecs_recovery: float | None = None,
+        ecs_recovery_end: float | None = None,
+        energy_last_hour: float | None = None,
+    ) -> tuple[set[str], set[str]]:
+        """Intègre un relevé ; retourne les anomalies apparues et disparues."""
+        raised: set[str] = set()
+        cleared: set[str] = set()
+
+        for metric, value in self._samples(
+            now, values, ecs_recovery, ecs_recovery_end, energy_last_hour
+        ).items():
+            statistic = self.metrics[metric]
+            score = statistic.score(value)
+            self.scores[metric] = round(score, 2) if score is not None else None
+            self.last[metric] = value
+
+            if score is not None and score > self.threshold:
+                self._exceeded[metric] += 1
+                if (
+                    metric not in self.active
+                    and self._exceeded[metric] >= ANOMALY_METRICS[metric]
+                ):
+                    self.active.add(metric)
+                    raised.add(metric)
+                continue
+
+            self._exceeded[metric] = 0
+            statistic.update(value)
+            if metric in self.active:
+                self.active.discard(metric)
+                cleared.add(metric)
+        return raised, cleared
+
+    def details(self, metric: str) -> dict:
+        """Valeur, moyenne et score d'une métrique."""
+        statistic = self.metrics[metric]
+        value = self.last.get(metric)
+        return {
+            "value": round(value, 2) if value is not None else None,
+            "mean": round(statistic.mean, 2) if statistic.mean is not None else None,
+            "score": self.scores.get(metric),
+        }
+
+    @property
+    def snapshot(self) -> dict:
+        """Valeurs exposées par les capteurs."""
+        return {metric: self.details(metric) for metric in ANOMALY_METRICS}
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            **{metric: ewma.as_dict() for metric, ewma in self.metrics.items()},
+            "active": sorted(self.active),
+            "last_recovery": self._last_recovery,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        for metric, ewma in self.metrics.items():
+            if metric in data:
+                ewma.load(data[metric])
+        self.active = {
+            metric for metric in data.get("active", []) if metric in self.metrics
+        }
+        self._last_recovery = data.get("last_recovery")
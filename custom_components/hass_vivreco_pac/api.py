@@ -2,88 +2,215 @@
 
 import base64
 import logging
+import time
 
 import aiohttp
 
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .const import (
+    API_BASE_URL,
     API_CHART_URL_TEMPLATE,
     API_ENERGY_URL_TEMPLATE,
     API_LOGIN_URL,
     API_SETTINGS_COMMAND,
     API_SETTINGS_URL_TEMPLATE,
     API_USER_URL,
+    LOCAL_RETRY_AFTER,
+    LOCAL_TIMEOUT,
+    VERSION_CONFLICT_STATUSES,
 )
+from .profiler import VivrecoRequestTimer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class VivrecoApiError(HomeAssistantError):
+    """Erreur lors d'un échange avec l'API Vivreco."""
+
+
+class VivrecoVersionConflictError(VivrecoApiError):
+    """La version des paramètres envoyée n'est plus la version courante."""
+
+
+class VivrecoConnectionError(VivrecoApiError):
+    """API Vivreco injoignable (réseau, délai dépassé ou erreur serveur)."""
+
+
+class VivrecoAuthError(ConfigEntryAuthFailed):
+    """Identifiants Vivreco refusés."""
+
+
+class VivrecoTransport:
+    """Point d'accès à l'API (cloud ou local) et sa disponibilité.
+
+    Un transport avec `retry_after` est écarté pendant ce délai après un
+    échec ; sans, il est toujours essayé (cloud, dernier recours).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float | None = None,
+        retry_after: float | None = None,
+    ) -> None:
+        """Initialise le transport."""
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        # Options des requêtes (délai propre, sinon celui de la session)
+        self.options = (
+            {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout else {}
+        )
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Transport utilisable (pas d'échec récent)."""
+        return time.monotonic() >= self._down_until
+
+    def url(self, path: str) -> str:
+        """URL complète d'un chemin de l'API."""
+        return f"{self.base_url}{path}"
+
+    def success(self) -> None:
+        """Enregistre une requête aboutie."""
+        self.requests += 1
+        self._down_until = 0.0
+
+    def failure(self, error) -> None:
+        """Enregistre un échec et écarte le transport si besoin."""
+        self.failures += 1
+        self.last_error = str(error)
+        if self.retry_after:
+            self._down_until = time.monotonic() + self.retry_after
+            _LOGGER.debug("Transport %s indisponible : %s", self.name, error)
+
+    @property
+    def stats(self) -> dict:
+        """Requêtes, échecs et disponibilité (diagnostics)."""
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "available": self.available,
+            "last_error": self.last_error,
+        }
+
+
 class VivrecoApiClient:
     """Client pour interagir avec l’API Vivreco."""
 
-    def __init__(self, username: str, password: str) -> None:
-        """Client API pour Vivreco PAC."""
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        hp_id: str | None = None,
+        api_token: str | None = None,
+        base_url: str = API_BASE_URL,
+        hass: HomeAssistant | None = None,
+        local_url: str | None = None,
+    ) -> None:
+        """Client API pour Vivreco PAC.
+
+        `hp_id` et `api_token` peuvent être repris de l'entrée de configuration
+        pour éviter `user/me` et la connexion au démarrage ; `base_url` permet
+        de viser un simulateur (banc de charge). Avec `hass`, la session
+        s'appuie sur le connecteur partagé de Home Assistant. Avec `local_url`,
+        relevés et commandes passent d'abord par l'accès local, le cloud
+        restant le recours ; connexion et liste des PAC passent par le cloud.
+        """
+        self.cloud = VivrecoTransport("cloud", base_url)
+        self.local = (
+            VivrecoTransport(
+                "local", local_url, timeout=LOCAL_TIMEOUT, retry_after=LOCAL_RETRY_AFTER
+            )
+            if local_url
+            else None
+        )
+        self.hass = hass
+        self.timer = VivrecoRequestTimer()
+        self._session: aiohttp.ClientSession | None = None
         self.username = username
         self.password = password
-        self.api_token: str | None = None
-        self.hp_id: str | None = None
+        self.api_token = api_token
+        self.hp_id = hp_id
         self.version: str | None = None
 
     async def login(self) -> None:
         """Connexion et récupération du token API."""
         headers = {"Authorization": self._generate_basic_auth_header()}
         try:
-            async with aiohttp.ClientSession() as session:  # noqa: SIM117
-                async with session.post(API_LOGIN_URL, headers=headers) as response:
-                    if response.status != 200:
-                        raise ConfigEntryNotReady(  # noqa: TRY301
-                            f"Erreur connexion API: {response.status}"
-                        )
-                    login_data = await response.json()
-                    self.api_token = login_data.get("token")
-                    if not self.api_token:
-                        raise ConfigEntryNotReady("Aucun token API trouvé.")  # noqa: TRY301
-                    _LOGGER.debug("Token API récupéré : %s", self.api_token)
+            async with self.session.post(
+                self.cloud.url(API_LOGIN_URL), headers=headers
+            ) as response:
+                if response.status in (401, 403):
+                    raise VivrecoAuthError(  # noqa: TRY301
+                        f"Identifiants refusés : {response.status}"
+                    )
+                if response.status != 200:
+                    raise ConfigEntryNotReady(  # noqa: TRY301
+                        f"Erreur connexion API: {response.status}"
+                    )
+                login_data = await response.json()
+                self.api_token = login_data.get("token")
+                if not self.api_token:
+                    raise ConfigEntryNotReady("Aucun token API trouvé.")  # noqa: TRY301
+                _LOGGER.debug("Token API récupéré : %s", self.api_token)
+        except VivrecoAuthError:
+            raise
         except Exception as e:  # noqa: BLE001
             raise ConfigEntryNotReady(f"Erreur connexion API: {e}")  # noqa: B904
 
+    async def get_hp_ids(self) -> list[str]:
+        """Liste les identifiants des PAC du compte."""
+        headers = self._headers
+        async with self.session.get(
+            self.cloud.url(API_USER_URL), headers=headers
+        ) as response:
+            if response.status != 200:
+                raise ConfigEntryNotReady(f"Erreur utilisateur API: {response.status}")
+            user_data = await response.json()
+            return user_data.get("hp_id", [])
+
     async def fetch_hp_id(self) -> None:
         """Récupère l'identifiant de la PAC."""
-        headers = self._headers
-        async with aiohttp.ClientSession() as session:  # noqa: SIM117
-            async with session.get(API_USER_URL, headers=headers) as response:
-                if response.status != 200:
-                    raise ConfigEntryNotReady(
-                        f"Erreur utilisateur API: {response.status}"
-                    )
-                user_data = await response.json()
-                hp_ids = user_data.get("hp_id", [])
-                if not hp_ids:
-                    raise ConfigEntryNotReady("Aucun identifiant de PAC trouvé.")
-                self.hp_id = hp_ids[0]
-                _LOGGER.debug("Identifiant de la PAC récupéré : %s", self.hp_id)
+        hp_ids = await self.get_hp_ids()
+        if not hp_ids:
+            raise ConfigEntryNotReady("Aucun identifiant de PAC trouvé.")
+        self.hp_id = hp_ids[0]
+        _LOGGER.debug("Identifiant de la PAC récupéré : %s", self.hp_id)
 
     async def get_chart_data(self) -> dict:
         """Récupère les données de type chart."""
-        url = API_CHART_URL_TEMPLATE.format(hp_id=self.hp_id)
-        api_data = await self._get_json(url)
+        api_data = await self._get_json(API_CHART_URL_TEMPLATE.format(hp_id=self.hp_id))
 
         _LOGGER.debug(f"Données API récupérées: {api_data}.")  # noqa: G004
         return api_data
 
     async def get_energy_data(self) -> dict:
         """Récupère les données de consommation d'énergie."""
-        url = API_ENERGY_URL_TEMPLATE.format(hp_id=self.hp_id)
-        api_data = await self._get_json(url)
+        api_data = await self._get_json(
+            API_ENERGY_URL_TEMPLATE.format(hp_id=self.hp_id)
+        )
 
         _LOGGER.debug(f"Données API énergie récupérées: {api_data}.")  # noqa: G004
         return api_data
 
     async def get_settings_data(self) -> dict:
         """Récupère les paramètres de la PAC."""
-        url = API_SETTINGS_URL_TEMPLATE.format(hp_id=self.hp_id)
-        api_data = await self._get_json(url)
+        api_data = await self._get_json(
+            API_SETTINGS_URL_TEMPLATE.format(hp_id=self.hp_id)
+        )
 
         if api_data and "values" in api_data:
             values_section = api_data["values"]
@@ -93,28 +220,125 @@ class VivrecoApiClient:
         _LOGGER.debug(f"Données API settings récupérées: {api_data}.")  # noqa: G004
         return api_data
 
-    async def send_command(self, group: str, values: dict) -> dict:
+    async def send_command(self, group: str, values: dict, retry: bool = True) -> dict:
         """Envoie une commande à la PAC."""
-        url = API_SETTINGS_COMMAND.format(hp_id=self.hp_id)
+        path = API_SETTINGS_COMMAND.format(hp_id=self.hp_id)
         headers = self._headers
         payload = {"group": group, "values": values, "version": self.version}
 
-        async with aiohttp.ClientSession() as session:  # noqa: SIM117
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status != 201:
-                    _LOGGER.error("Erreur envoi commande %s : %s", url, response.status)
-                    return {}
-                return await response.json()
+        for transport in self._transports():
+            try:
+                async with self.session.post(
+                    transport.url(path),
+                    headers=headers,
+                    json=payload,
+                    **transport.options,
+                ) as response:
+                    status = response.status
+                    if status == 201:
+                        transport.success()
+                        return await response.json()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                if transport is self.cloud:
+                    raise VivrecoConnectionError(
+                        f"API Vivreco injoignable : {err}"
+                    ) from err
+                transport.failure(err)
+                continue
+            # Réponse inattendue de l'accès local : repli sur le cloud
+            if transport is not self.cloud and status not in (
+                401,
+                *VERSION_CONFLICT_STATUSES,
+            ):
+                transport.failure(f"HTTP {status}")
+                continue
+            break
 
-    async def _get_json(self, url: str) -> dict:
+        if status == 401 and retry:
+            _LOGGER.debug("Token API expiré, reconnexion")
+            await self.login()
+            return await self.send_command(group, values, retry=False)
+        if status in VERSION_CONFLICT_STATUSES:
+            raise VivrecoVersionConflictError(
+                f"Version des paramètres obsolète ({self.version}) : {status}"
+            )
+        if status >= 500:
+            raise VivrecoConnectionError(f"Erreur serveur Vivreco : {status}")
+        _LOGGER.error("Erreur envoi commande %s : %s", path, status)
+        raise VivrecoApiError(f"Erreur envoi commande Vivreco : {status}")
+
+    async def _get_json(self, path: str, retry: bool = True) -> dict:
         """Envoie une requête GET et retourne la réponse JSON."""
         headers = self._headers
-        async with aiohttp.ClientSession() as session:  # noqa: SIM117
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    _LOGGER.error("Erreur API GET %s : %s", url, response.status)
-                    return {}
-                return await response.json()
+        for transport in self._transports():
+            try:
+                async with self.session.get(
+                    transport.url(path), headers=headers, **transport.options
+                ) as response:
+                    status = response.status
+                    if status == 200:
+                        transport.success()
+                        return await response.json()
+            except (aiohttp.ClientError, TimeoutError) as err:
+                if transport is self.cloud:
+                    raise VivrecoConnectionError(
+                        f"API Vivreco injoignable : {err}"
+                    ) from err
+                transport.failure(err)
+                continue
+            # Réponse inattendue de l'accès local : repli sur le cloud
+            if transport is not self.cloud and status != 401:
+                transport.failure(f"HTTP {status}")
+                continue
+            break
+
+        # Token expiré (ou repris d'un démarrage précédent) : reconnexion
+        if status == 401 and retry:
+            _LOGGER.debug("Token API expiré, reconnexion")
+            await self.login()
+            return await self._get_json(path, retry=False)
+
+        _LOGGER.error("Erreur API GET %s : %s", path, status)
+        return {}
+
+    def _transports(self) -> list[VivrecoTransport]:
+        """Transports à essayer dans l'ordre : local s'il est disponible, cloud."""
+        if self.local is not None and self.local.available:
+            return [self.local, self.cloud]
+        return [self.cloud]
+
+    @property
+    def transport_stats(self) -> dict:
+        """État des transports (diagnostics)."""
+        return {
+            transport.name: transport.stats
+            for transport in (self.local, self.cloud)
+            if transport is not None
+        }
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Session HTTP du client, créée au premier appel.
+
+        Une seule session pour toutes les requêtes : la connexion (DNS, TCP,
+        TLS) ouverte par la première requête d'un rafraîchissement sert aux
+        suivantes. La compression (gzip, deflate, et br si brotli est
+        installé) est négociée par aiohttp ; les traces alimentent `timer`.
+        """
+        if self._session is None or self._session.closed:
+            trace_configs = [self.timer.trace_config]
+            self._session = (
+                async_create_clientsession(self.hass, trace_configs=trace_configs)
+                if self.hass is not None
+                else aiohttp.ClientSession(trace_configs=trace_configs)
+            )
+        return self._session
+
+    async def async_close(self) -> None:
+        """Ferme la session HTTP (déchargement)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     def _generate_basic_auth_header(self) -> str:
         """Génère l'en-tête Basic Auth pour la connexion."""
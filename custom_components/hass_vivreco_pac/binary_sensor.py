@@ -5,6 +5,7 @@ import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN, MODE, MODE_ICON_MAPPING
 from .entity import VivrecoBaseEntity
@@ -56,6 +57,17 @@ async def async_setup_entry(
 
             entities.append(VivrecoModeSensor(coordinator, sensor_key, entity_name))
 
+    # Relevés et paramètres booléens découverts, désactivés par défaut
+    entities.extend(
+        VivrecoDiscoveredBinarySensor(coordinator, section, key, schema)
+        for section, schemas in (
+            ("values", coordinator.discovery.values),
+            ("settings", coordinator.discovery.settings),
+        )
+        for key, schema in schemas.items()
+        if schema["type"] == "binary"
+    )
+
     async_add_entities(entities)
 
 
@@ -78,11 +90,6 @@ class VivrecoModeSensor(VivrecoBaseEntity, BinarySensorEntity):
         """Retourne True si le mode est actif."""
         return bool(self.coordinator.data["settings"].get(self._sensor_key))
 
-    @property
-    def unique_id(self):
-        """Retourne l'identifiant unique du capteur."""
-        return self._attr_unique_id
-
     @property
     def icon(self):
         """Retourne une icône spécifique selon le mode."""
@@ -107,12 +114,30 @@ class VivrecoCompSensor(VivrecoBaseEntity, BinarySensorEntity):
         """Retourne True si le compresseur est en marche (1), False sinon (0)."""
         return bool(self.coordinator.data["values"].get(self._sensor_key))
 
-    @property
-    def unique_id(self):
-        """Retourne l'identifiant unique du capteur."""
-        return self._attr_unique_id
-
     @property
     def icon(self):
         """Icone."""
         return "mdi:engine-outline"
+
+
+class VivrecoDiscoveredBinarySensor(VivrecoBaseEntity, BinarySensorEntity):
+    """Booléen sans entité dédiée, en lecture seule (désactivé par défaut)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_registry_enabled_default = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, section, key, schema) -> None:
+        """Initialisation à partir du schéma découvert (`values` ou `settings`)."""
+
+        super().__init__(coordinator)
+        self._section = section
+        self._key = key
+        self._attr_name = schema["name"]
+        self._attr_unique_id = f"vivreco_discovered_{key}"
+
+    @property
+    def is_on(self):
+        """Valeur relevée."""
+        value = self.coordinator.data.get(self._section, {}).get(self._key)
+        return bool(value) if value is not None else None
@@ -130,11 +130,7 @@ class VivrecoClimate(VivrecoBaseEntity, ClimateEntity):
             _LOGGER.warning("Preset invalide : %s", preset_mode)
             return
 
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values={"mode_zone_p/ambiance": preset_mode},
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"mode_zone_p/ambiance": preset_mode})
 
     # ---------- Actions ----------
 
@@ -149,11 +145,7 @@ class VivrecoClimate(VivrecoBaseEntity, ClimateEntity):
 
         _LOGGER.debug("Mise à jour consigne %s -> %s°C", preset, value)
 
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values={key: value},
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({key: value})
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Change le mode HVAC (chauffage / rafraîchissement / arrêt)."""
@@ -182,7 +174,4 @@ class VivrecoClimate(VivrecoBaseEntity, ClimateEntity):
         else:
             return
 
-        await self.coordinator.api.send_command(
-            group="customer_settings", values=values
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings(values)
@@ -0,0 +1,131 @@
+"""Suivi des cycles du compresseur Vivreco PAC (marche, démarrages, dégivrages)."""
+
+from collections import deque
+from datetime import date, datetime
+
+from .const import COMPRESSOR_HISTORY_SIZE
+
+STATE_DEFROST = "degi"
+
+
+class VivrecoCompressorTracker:
+    """Tampon circulaire des transitions du compresseur et compteurs dérivés.
+
+    Seules les transitions (marche/arrêt) sont conservées, dans une file bornée :
+    les statistiques se calculent sans requête au recorder et l'état complet est
+    sérialisable pour survivre à un redémarrage.
+    """
+
+    def __init__(self, max_gap: float) -> None:
+        """Initialise le suivi.
+
+        `max_gap` (secondes) : au-delà, l'intervalle entre deux relevés n'est pas
+        comptabilisé dans le temps de marche (redémarrage, panne réseau...).
+        """
+        self._max_gap = max_gap
+        self._transitions: deque[tuple[float, bool]] = deque(
+            maxlen=COMPRESSOR_HISTORY_SIZE
+        )
+        self._running: bool | None = None
+        self._defrosting = False
+        self._last_ts: float | None = None
+        self._day: date | None = None
+        self._runtime_today = 0.0
+        self._starts_today = 0
+        self._defrosts_today = 0
+
+    def update(self, now: datetime, running: bool, state: str | None) -> None:
+        """Intègre un nouveau relevé de `comp_one` et `state`."""
+        timestamp = now.timestamp()
+
+        if self._day != now.date():
+            # Le temps de marche avant minuit reste sur la journée précédente
+            midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            if self._running and self._last_ts is not None:
+                self._last_ts = max(self._last_ts, midnight.timestamp())
+            self._day = now.date()
+            self._runtime_today = 0.0
+            self._starts_today = 0
+            self._defrosts_today = 0
+
+        if self._running and self._last_ts is not None:
+            elapsed = timestamp - self._last_ts
+            if 0 < elapsed <= self._max_gap:
+                self._runtime_today += elapsed
+
+        if running != self._running:
+            if self._running is not None or running:
+                self._transitions.append((timestamp, running))
+            if running and self._running is not None:
+                self._starts_today += 1
+            self._running = running
+
+        defrosting = state == STATE_DEFROST
+        if defrosting and not self._defrosting:
+            self._defrosts_today += 1
+        self._defrosting = defrosting
+
+        self._last_ts = timestamp
+
+    def starts_since(self, since: float) -> int:
+        """Nombre de démarrages depuis l'horodatage donné."""
+        count = 0
+        for timestamp, running in reversed(self._transitions):
+            if timestamp < since:
+                break
+            if running:
+                count += 1
+        return count
+
+    def average_cycle(self) -> float | None:
+        """Durée moyenne d'un cycle de marche (secondes) sur le tampon."""
+        total = 0.0
+        cycles = 0
+        started: float | None = None
+        for timestamp, running in self._transitions:
+            if running:
+                started = timestamp
+            elif started is not None:
+                total += timestamp - started
+                cycles += 1
+                started = None
+        return total / cycles if cycles else None
+
+    def snapshot(self, now: datetime) -> dict:
+        """Valeurs exposées par les capteurs."""
+        average = self.average_cycle()
+        return {
+            "runtime_today": round(self._runtime_today / 60, 1),
+            "starts_today": self._starts_today,
+            "starts_last_hour": self.starts_since(now.timestamp() - 3600),
+            "cycle_average": round(average / 60, 1) if average is not None else None,
+            "defrosts_today": self._defrosts_today,
+        }
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "transitions": [list(item) for item in self._transitions],
+            "running": self._running,
+            "defrosting": self._defrosting,
+            "last_ts": self._last_ts,
+            "day": self._day.isoformat() if self._day else None,
+            "runtime_today": self._runtime_today,
+            "starts_today": self._starts_today,
+            "defrosts_today": self._defrosts_today,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        self._transitions.extend(
+            (float(timestamp), bool(running))
+            for timestamp, running in data.get("transitions", [])
+        )
+        self._running = data.get("running")
+        self._defrosting = data.get("defrosting", False)
+        self._last_ts = data.get("last_ts")
+        day = data.get("day")
+        self._day = date.fromisoformat(day) if day else None
+        self._runtime_today = data.get("runtime_today", 0.0)
+        self._starts_today = data.get("starts_today", 0)
+        self._defrosts_today = data.get("defrosts_today", 0)
@@ -1,17 +1,110 @@
 """Gère la configuration de l'intégration Vivreco PAC via l'interface UI."""
 
+import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_SCAN_INTERVAL
+from homeassistant.const import (
+    CONF_EMAIL,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_TOKEN,
+)
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, selector
 
-from .const import DEFAULT_UPDATE_INTERVAL, DOMAIN
+from .api import VivrecoApiClient, VivrecoAuthError
+from .const import (
+    CONF_ANOMALY_THRESHOLD,
+    CONF_COMFORT_END,
+    CONF_COMFORT_MAX,
+    CONF_COMFORT_MIN,
+    CONF_COMFORT_SCHEDULER,
+    CONF_COMFORT_START,
+    CONF_ECS_LOOKAHEAD,
+    CONF_ECS_SCHEDULER,
+    CONF_ECS_TARGET,
+    CONF_EXPORT,
+    CONF_EXPORT_RETENTION,
+    CONF_HISTORY_DAYS,
+    CONF_HISTORY_MAX_KB,
+    CONF_HP_ID,
+    CONF_LOCAL_URL,
+    CONF_OFFPEAK_END,
+    CONF_OFFPEAK_PRICE,
+    CONF_OFFPEAK_START,
+    CONF_OPTIMIZER_MODE,
+    CONF_OPTIMIZER_THRESHOLD,
+    CONF_OPTIMIZER_WEATHER,
+    CONF_PEAK_PRICE,
+    DEFAULT_ANOMALY_THRESHOLD,
+    DEFAULT_COMFORT_END,
+    DEFAULT_COMFORT_MAX,
+    DEFAULT_COMFORT_MIN,
+    DEFAULT_COMFORT_START,
+    DEFAULT_ECS_LOOKAHEAD,
+    DEFAULT_ECS_TARGET,
+    DEFAULT_EXPORT_RETENTION,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_HISTORY_MAX_KB,
+    DEFAULT_OFFPEAK_END,
+    DEFAULT_OFFPEAK_PRICE,
+    DEFAULT_OFFPEAK_START,
+    DEFAULT_OPTIMIZER_MODE,
+    DEFAULT_OPTIMIZER_THRESHOLD,
+    DEFAULT_PEAK_PRICE,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    ECS_SETPOINTS,
+    OPTIMIZER_MODES,
+    THROTTLE_DEFAULTS,
+    THROTTLE_FAMILIES,
+)
+
+PRICE_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0, max=5, step="any", mode=selector.NumberSelectorMode.BOX
+    )
+)
 
 
 class VivrecoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Gérer un flux de configuration pour Vivreco PAC."""
 
     VERSION = 1
+    # 1.2 : identifiants d'entités préfixés par la PAC
+    MINOR_VERSION = 2
+
+    def __init__(self) -> None:
+        """Initialise le flux."""
+        self._user_input: dict = {}
+        self._token: str | None = None
+        self._hp_ids: list[str] = []
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Retourne le flux d'options."""
+        return VivrecoOptionsFlow(config_entry)
+
+    async def _async_validate(self, email: str, password: str) -> dict:
+        """Vérifie les identifiants et récupère les PAC du compte."""
+        api = VivrecoApiClient(username=email, password=password, hass=self.hass)
+        try:
+            await api.login()
+            self._hp_ids = await api.get_hp_ids()
+        except VivrecoAuthError:
+            return {"base": "invalid_auth"}
+        except (HomeAssistantError, aiohttp.ClientError, TimeoutError):
+            return {"base": "cannot_connect"}
+        finally:
+            await api.async_close()
+
+        if not self._hp_ids:
+            return {"base": "no_pump"}
+        self._token = api.api_token
+        return {}
 
     async def async_step_user(self, user_input=None):
         """Gérer l'étape initiale."""
@@ -19,7 +112,14 @@ class VivrecoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            return self.async_create_entry(title="Vivreco PAC", data=user_input)
+            errors = await self._async_validate(
+                user_input[CONF_EMAIL], user_input[CONF_PASSWORD]
+            )
+            if not errors:
+                self._user_input = user_input
+                if len(self._hp_ids) == 1:
+                    return await self._async_create_pump_entry(self._hp_ids[0])
+                return await self.async_step_pump()
 
         data_schema = vol.Schema(
             {
@@ -34,3 +134,343 @@ class VivrecoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=data_schema, errors=errors
         )
+
+    async def async_step_pump(self, user_input=None):
+        """Choix des PAC lorsque le compte en contient plusieurs.
+
+        Chaque PAC choisie a sa propre entrée : ce flux crée la première, un
+        flux `add_pump` est lancé pour chacune des suivantes.
+        """
+        configured = self._async_current_ids()
+        available = [hp_id for hp_id in self._hp_ids if hp_id not in configured]
+        if not available:
+            return self.async_abort(reason="already_configured")
+
+        errors = {}
+        if user_input is not None:
+            selected = user_input[CONF_HP_ID]
+            if selected:
+                for hp_id in selected[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": "add_pump"},
+                            data=self._pump_data(hp_id),
+                        )
+                    )
+                return await self._async_create_pump_entry(selected[0])
+            errors["base"] = "no_pump_selected"
+
+        data_schema = vol.Schema(
+            {
+                vol.Required(CONF_HP_ID, default=available): cv.multi_select(
+                    {hp_id: hp_id for hp_id in available}
+                )
+            }
+        )
+        return self.async_show_form(
+            step_id="pump", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_add_pump(self, data: dict):
+        """Crée l'entrée d'une PAC supplémentaire choisie à l'étape `pump`."""
+        return await self._async_create_pump_entry(data[CONF_HP_ID], data)
+
+    def _pump_data(self, hp_id: str) -> dict:
+        """Données de l'entrée d'une PAC."""
+        return {**self._user_input, CONF_HP_ID: hp_id, CONF_TOKEN: self._token}
+
+    async def _async_create_pump_entry(self, hp_id: str, data: dict | None = None):
+        """Crée l'entrée pour la PAC choisie."""
+        await self.async_set_unique_id(hp_id)
+        self._abort_if_unique_id_configured()
+        # Plusieurs PAC sur le compte : le titre (nom de l'appareil) les distingue
+        title = "Vivreco PAC" if len(self._hp_ids) == 1 else f"Vivreco PAC {hp_id}"
+        return self.async_create_entry(title=title, data=data or self._pump_data(hp_id))
+
+    async def async_step_reauth(self, entry_data):
+        """Identifiants refusés : demande un nouveau mot de passe."""
+        return await self.async_step_reauth_confirm()
+
+    async def async_step_reauth_confirm(self, user_input=None):
+        """Vérifie et enregistre les nouveaux identifiants."""
+        entry = self.hass.config_entries.async_get_entry(self.context["entry_id"])
+        errors = {}
+
+        if user_input is not None:
+            errors = await self._async_validate(
+                entry.data[CONF_EMAIL], user_input[CONF_PASSWORD]
+            )
+            if not errors:
+                return self.async_update_reload_and_abort(
+                    entry,
+                    data={
+                        **entry.data,
+                        CONF_PASSWORD: user_input[CONF_PASSWORD],
+                        CONF_TOKEN: self._token,
+                    },
+                )
+
+        return self.async_show_form(
+            step_id="reauth_confirm",
+            data_schema=vol.Schema({vol.Required(CONF_PASSWORD): str}),
+            description_placeholders={"email": entry.data[CONF_EMAIL]},
+            errors=errors,
+        )
+
+
+class VivrecoOptionsFlow(config_entries.OptionsFlow):
+    """Options de l'intégration Vivreco PAC."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialise le flux d'options."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Menu des options."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=[
+                "tariff",
+                "ecs_scheduler",
+                "comfort_scheduler",
+                "heating_curve",
+                "anomaly",
+                "history",
+                "export",
+                "throttle",
+                "transport",
+            ],
+        )
+
+    async def async_step_tariff(self, user_input=None):
+        """Tarif heures pleines / heures creuses."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_PEAK_PRICE,
+                    default=options.get(CONF_PEAK_PRICE, DEFAULT_PEAK_PRICE),
+                ): PRICE_SELECTOR,
+                vol.Required(
+                    CONF_OFFPEAK_PRICE,
+                    default=options.get(CONF_OFFPEAK_PRICE, DEFAULT_OFFPEAK_PRICE),
+                ): PRICE_SELECTOR,
+                vol.Required(
+                    CONF_OFFPEAK_START,
+                    default=options.get(CONF_OFFPEAK_START, DEFAULT_OFFPEAK_START),
+                ): selector.TimeSelector(),
+                vol.Required(
+                    CONF_OFFPEAK_END,
+                    default=options.get(CONF_OFFPEAK_END, DEFAULT_OFFPEAK_END),
+                ): selector.TimeSelector(),
+            }
+        )
+        return self.async_show_form(step_id="tariff", data_schema=data_schema)
+
+    async def async_step_ecs_scheduler(self, user_input=None):
+        """Préchauffage prédictif de l'ECS."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_ECS_SCHEDULER,
+                    default=options.get(CONF_ECS_SCHEDULER, False),
+                ): bool,
+                vol.Required(
+                    CONF_ECS_TARGET,
+                    default=options.get(CONF_ECS_TARGET, DEFAULT_ECS_TARGET),
+                ): vol.All(
+                    vol.Coerce(float),
+                    vol.Range(
+                        min=ECS_SETPOINTS["normal"]["min"],
+                        max=ECS_SETPOINTS["normal"]["max"],
+                    ),
+                ),
+                vol.Required(
+                    CONF_ECS_LOOKAHEAD,
+                    default=options.get(CONF_ECS_LOOKAHEAD, DEFAULT_ECS_LOOKAHEAD),
+                ): vol.All(int, vol.Range(min=1, max=12)),
+            }
+        )
+        return self.async_show_form(step_id="ecs_scheduler", data_schema=data_schema)
+
+    async def async_step_comfort_scheduler(self, user_input=None):
+        """Démarrage au plus juste du mode confort."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_COMFORT_SCHEDULER,
+                    default=options.get(CONF_COMFORT_SCHEDULER, False),
+                ): bool,
+                vol.Required(
+                    CONF_COMFORT_START,
+                    default=options.get(CONF_COMFORT_START, DEFAULT_COMFORT_START),
+                ): selector.TimeSelector(),
+                vol.Required(
+                    CONF_COMFORT_END,
+                    default=options.get(CONF_COMFORT_END, DEFAULT_COMFORT_END),
+                ): selector.TimeSelector(),
+            }
+        )
+        return self.async_show_form(
+            step_id="comfort_scheduler", data_schema=data_schema
+        )
+
+    async def async_step_heating_curve(self, user_input=None):
+        """Optimisation de la consigne de chauffage."""
+        errors = {}
+        if user_input is not None:
+            if user_input[CONF_COMFORT_MIN] < user_input[CONF_COMFORT_MAX]:
+                return self._save(user_input)
+            errors["base"] = "invalid_band"
+
+        options = {**self.config_entry.options, **(user_input or {})}
+        weather = options.get(CONF_OPTIMIZER_WEATHER)
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_OPTIMIZER_MODE,
+                    default=options.get(CONF_OPTIMIZER_MODE, DEFAULT_OPTIMIZER_MODE),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=OPTIMIZER_MODES, translation_key=CONF_OPTIMIZER_MODE
+                    )
+                ),
+                vol.Optional(
+                    CONF_OPTIMIZER_WEATHER,
+                    description={"suggested_value": weather} if weather else None,
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain="weather")
+                ),
+                vol.Required(
+                    CONF_COMFORT_MIN,
+                    default=options.get(CONF_COMFORT_MIN, DEFAULT_COMFORT_MIN),
+                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=30)),
+                vol.Required(
+                    CONF_COMFORT_MAX,
+                    default=options.get(CONF_COMFORT_MAX, DEFAULT_COMFORT_MAX),
+                ): vol.All(vol.Coerce(float), vol.Range(min=5, max=30)),
+                vol.Required(
+                    CONF_OPTIMIZER_THRESHOLD,
+                    default=options.get(
+                        CONF_OPTIMIZER_THRESHOLD, DEFAULT_OPTIMIZER_THRESHOLD
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+            }
+        )
+        return self.async_show_form(
+            step_id="heating_curve", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_anomaly(self, user_input=None):
+        """Détection d'anomalies."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_ANOMALY_THRESHOLD,
+                    default=options.get(
+                        CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD
+                    ),
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=10)),
+            }
+        )
+        return self.async_show_form(step_id="anomaly", data_schema=data_schema)
+
+    async def async_step_history(self, user_input=None):
+        """Historique en mémoire des relevés."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_HISTORY_DAYS,
+                    default=options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS),
+                ): vol.All(int, vol.Range(min=1, max=90)),
+                vol.Required(
+                    CONF_HISTORY_MAX_KB,
+                    default=options.get(CONF_HISTORY_MAX_KB, DEFAULT_HISTORY_MAX_KB),
+                ): vol.All(int, vol.Range(min=64)),
+            }
+        )
+        return self.async_show_form(step_id="history", data_schema=data_schema)
+
+    async def async_step_export(self, user_input=None):
+        """Export des relevés bruts."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_EXPORT, default=options.get(CONF_EXPORT, False)
+                ): bool,
+                vol.Required(
+                    CONF_EXPORT_RETENTION,
+                    default=options.get(
+                        CONF_EXPORT_RETENTION, DEFAULT_EXPORT_RETENTION
+                    ),
+                ): vol.All(int, vol.Range(min=1, max=3650)),
+            }
+        )
+        return self.async_show_form(step_id="export", data_schema=data_schema)
+
+    async def async_step_throttle(self, user_input=None):
+        """Filtrage des écritures d'état par famille de capteurs."""
+        if user_input is not None:
+            return self._save(user_input)
+
+        options = self.config_entry.options
+        fields = {}
+        for family in THROTTLE_FAMILIES:
+            delta, interval = THROTTLE_DEFAULTS[family]
+            fields[
+                vol.Required(
+                    f"{family}_delta", default=options.get(f"{family}_delta", delta)
+                )
+            ] = vol.All(vol.Coerce(float), vol.Range(min=0))
+            fields[
+                vol.Required(
+                    f"{family}_interval",
+                    default=options.get(f"{family}_interval", interval),
+                )
+            ] = vol.All(int, vol.Range(min=0, max=240))
+        return self.async_show_form(step_id="throttle", data_schema=vol.Schema(fields))
+
+    async def async_step_transport(self, user_input=None):
+        """Accès local à la PAC, avec repli sur le cloud."""
+        if user_input is not None:
+            # Champ vidé : retour au cloud seul
+            return self._save({CONF_LOCAL_URL: user_input.get(CONF_LOCAL_URL, "")})
+
+        local_url = self.config_entry.options.get(CONF_LOCAL_URL)
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_LOCAL_URL,
+                    description={"suggested_value": local_url} if local_url else None,
+                ): vol.All(str, vol.Url()),
+            }
+        )
+        return self.async_show_form(step_id="transport", data_schema=data_schema)
+
+    def _save(self, user_input: dict):
+        """Fusionne l'étape courante avec les options existantes."""
+        return self.async_create_entry(data={**self.config_entry.options, **user_input})
@@ -1,5 +1,7 @@
 """Les constantes pour l'intégration Vivreco PAC."""
 
+from datetime import timedelta
+
 from homeassistant.const import Platform
 
 DOMAIN = "hass_vivreco_pac"
@@ -14,16 +16,19 @@ PLATFORMS: list[Platform] = [
     Platform.WATER_HEATER,
 ]
 
+# Données persistées dans l'entrée de configuration
+CONF_HP_ID = "hp_id"
+CONF_CAPABILITIES = "capabilities"
+
 # Constantes pour les URLs de l'API
+# (chemins relatifs à l'URL de base, remplaçable par un simulateur)
 API_BASE_URL = "https://vivrecocontrol.com/api/v1"
-API_LOGIN_URL = f"{API_BASE_URL}/herja/login"
-API_USER_URL = f"{API_BASE_URL}/herja/user/me"
-API_CHART_URL_TEMPLATE = f"{API_BASE_URL}/charts/{{hp_id}}/dashboard"
-API_ENERGY_URL_TEMPLATE = f"{API_BASE_URL}/commands/{{hp_id}}/values/energy_meters"
-API_SETTINGS_URL_TEMPLATE = (
-    f"{API_BASE_URL}/commands/{{hp_id}}/values/customer_settings"
-)
-API_SETTINGS_COMMAND = f"{API_BASE_URL}/commands/{{hp_id}}/command"
+API_LOGIN_URL = "/herja/login"
+API_USER_URL = "/herja/user/me"
+API_CHART_URL_TEMPLATE = "/charts/{hp_id}/dashboard"
+API_ENERGY_URL_TEMPLATE = "/commands/{hp_id}/values/energy_meters"
+API_SETTINGS_URL_TEMPLATE = "/commands/{hp_id}/values/customer_settings"
+API_SETTINGS_COMMAND = "/commands/{hp_id}/command"
 
 # Mode de fonctionnement de la PAC
 MODE = {
@@ -104,6 +109,168 @@ CHAUFFAGE_SETPOINTS = {
 # Intervalle de récupération des données (en minutes)
 DEFAULT_UPDATE_INTERVAL = 5
 
+# Options : tarif heures pleines / heures creuses (€/kWh)
+CONF_PEAK_PRICE = "peak_price"
+CONF_OFFPEAK_PRICE = "offpeak_price"
+CONF_OFFPEAK_START = "offpeak_start"
+CONF_OFFPEAK_END = "offpeak_end"
+
+DEFAULT_PEAK_PRICE = 0.27
+DEFAULT_OFFPEAK_PRICE = 0.2068
+DEFAULT_OFFPEAK_START = "22:00:00"
+DEFAULT_OFFPEAK_END = "06:00:00"
+
+# Âge maximal du cache des paramètres pour ignorer une écriture sans effet
+SETTINGS_MAX_AGE = timedelta(minutes=15)
+
+# Codes HTTP signalant une version de paramètres obsolète et nombre de reprises.
+# Codes supposés : l'API ne documente pas sa réponse à une version obsolète,
+# 409 et 412 sont les codes usuels d'un conflit de verrouillage optimiste.
+VERSION_CONFLICT_STATUSES = (409, 412)
+COMMAND_MAX_RETRIES = 2
+
+# Confirmation d'application des commandes (secondes)
+COMMAND_CONFIRM_FIRST_DELAY = 2
+COMMAND_CONFIRM_MAX_DELAY = 30
+COMMAND_CONFIRM_TIMEOUT = 180
+EVENT_COMMAND_NOT_APPLIED = f"{DOMAIN}_command_not_applied"
+
+# Délai d'enregistrement de la file des commandes en attente (secondes)
+COMMAND_QUEUE_SAVE_DELAY = 1
+
+# Persistance de l'état calculé (compteurs compresseur, ...)
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
+# Nombre de transitions du compresseur conservées
+COMPRESSOR_HISTORY_SIZE = 512
+
+# Options : préchauffage prédictif de l'ECS
+CONF_ECS_SCHEDULER = "ecs_scheduler"
+CONF_ECS_TARGET = "ecs_target"
+CONF_ECS_LOOKAHEAD = "ecs_lookahead"
+
+DEFAULT_ECS_TARGET = 50
+DEFAULT_ECS_LOOKAHEAD = 3
+
+# Apprentissage des puisages ECS
+ECS_DRAW_THRESHOLD = 1.5
+ECS_USAGE_DECAY = 0.97
+ECS_USAGE_MIN_SCORE = 0.3
+
+# Options : démarrage au plus juste du mode confort (zone principale)
+CONF_COMFORT_SCHEDULER = "comfort_scheduler"
+CONF_COMFORT_START = "comfort_start"
+CONF_COMFORT_END = "comfort_end"
+
+DEFAULT_COMFORT_START = "07:00:00"
+DEFAULT_COMFORT_END = "22:00:00"
+
+# Modèle thermique : facteur d'oubli, écart maximal entre deux relevés
+# (secondes), relevés minimum avant prévision et marge de démarrage
+THERMAL_FORGETTING = 0.999
+THERMAL_MIN_SAMPLES = 48
+COMFORT_MARGIN = timedelta(minutes=15)
+
+# Options : optimisation de la consigne de chauffage (loi d'eau)
+CONF_OPTIMIZER_MODE = "optimizer_mode"
+CONF_OPTIMIZER_WEATHER = "optimizer_weather"
+CONF_COMFORT_MIN = "comfort_min"
+CONF_COMFORT_MAX = "comfort_max"
+CONF_OPTIMIZER_THRESHOLD = "optimizer_threshold"
+
+OPTIMIZER_MODES = ["off", "simulate", "apply"]
+OPTIMIZER_PRESETS = ("confort", "normal")
+DEFAULT_OPTIMIZER_MODE = "off"
+DEFAULT_COMFORT_MIN = 19.0
+DEFAULT_COMFORT_MAX = 21.0
+DEFAULT_OPTIMIZER_THRESHOLD = 0.3
+
+# Horizon de prévision (heures), pas des consignes candidates (°C), pas de
+# simulation (secondes), durée de remontée tolérée (heures), atténuation de
+# l'apprentissage de la consommation et rafraîchissement des prévisions météo
+OPTIMIZER_HORIZON = 12
+OPTIMIZER_STEP = 0.5
+OPTIMIZER_SIM_STEP = 300
+OPTIMIZER_RECOVERY = 1
+OPTIMIZER_ENERGY_DECAY = 0.99
+OPTIMIZER_FORECAST_REFRESH = timedelta(hours=1)
+
+# Options : détection d'anomalies (seuil du z-score)
+CONF_ANOMALY_THRESHOLD = "anomaly_threshold"
+DEFAULT_ANOMALY_THRESHOLD = 3.0
+
+# Lissage des statistiques et relevés minimum avant détection
+ANOMALY_ALPHA = 0.05
+ANOMALY_MIN_SAMPLES = 20
+# Délai maximal après un changement de consigne avant de comparer la
+# température intérieure à la consigne si elle ne l'a pas atteinte (relance)
+ANOMALY_SETTLE_TIME = timedelta(hours=6)
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+
+# Options : export des relevés bruts (CSV quotidiens compressés)
+CONF_EXPORT = "export"
+CONF_EXPORT_RETENTION = "export_retention"
+DEFAULT_EXPORT_RETENTION = 30
+
+# Dossier d'export (relatif à la configuration), relevés par écriture et
+# relevés gardés en mémoire tant que l'écriture échoue
+EXPORT_DIRECTORY = "vivreco_export"
+EXPORT_BATCH_SIZE = 12
+EXPORT_BUFFER_LIMIT = 288
+
+# Options : accès local à la PAC (même API que le cloud, sur le réseau local),
+# avec repli sur le cloud
+CONF_LOCAL_URL = "local_url"
+
+# Délai maximal d'une requête locale et pause avant de réessayer le local
+# après un échec (secondes)
+LOCAL_TIMEOUT = 3
+LOCAL_RETRY_AFTER = 300
+
+# Sonde de performance : lissage des durées, période de mesure du retard de
+# la boucle (secondes) et nombre de fonctions dans le rapport de profilage
+PROBE_ALPHA = 0.1
+PROBE_LOOP_INTERVAL = 5
+PROFILE_TOP = 30
+# Dossier des profils (sous la configuration) et nombre de profils conservés
+PROFILE_DIRECTORY = "vivreco_profiles"
+PROFILE_KEEP = 10
+
+# Options : historique en mémoire des relevés
+CONF_HISTORY_DAYS = "history_days"
+CONF_HISTORY_MAX_KB = "history_max_kb"
+
+DEFAULT_HISTORY_DAYS = 7
+DEFAULT_HISTORY_MAX_KB = 2048
+
+# Tendance des températures (lissage de Holt) et horizon de prévision (minutes)
+TREND_ALPHA = 0.5
+TREND_BETA = 0.3
+TREND_HORIZON = 30
+
+# Options : filtrage des écritures d'état par famille de capteurs
+# (variation significative, délai maximal avant d'écrire une faible variation
+# en minutes). Tout changement d'un état énuméré est significatif.
+THROTTLE_FAMILIES = ("temperature", "energy")
+THROTTLE_DEFAULTS = {
+    "temperature": (0.5, 15),
+    "energy": (0.1, 15),
+    "state": (0, 0),
+}
+
+# Sous ce ratio de la valeur précédente, la baisse d'un compteur est une remise à zéro
+ENERGY_RESET_RATIO = 0.1
+
+# Analyse énergétique
+ENERGY_ANALYTICS_DAYS = 7
+COP_CARNOT_EFFICIENCY = 0.45
+# Écart estimé entre la consigne et la température de départ d'eau (°C)
+COP_FLOW_OFFSET_CH = 10
+COP_FLOW_OFFSET_ECS = 5
+COP_MIN = 1.0
+COP_MAX = 7.0
+
 MODE_EMOJI = {
     "app_elec": "🔌",
     "ch": "🔥",
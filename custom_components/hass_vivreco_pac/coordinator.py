@@ -1,12 +1,89 @@
 """Coordinator Vivreco PAC API integration."""
 
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
 import logging
+from pathlib import Path
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .analytics import VivrecoEnergyAnalytics, VivrecoTariff
+from .anomaly import ANOMALY_METRICS, VivrecoAnomalyDetector
+from .api import (
+    VivrecoApiClient,
+    VivrecoApiError,
+    VivrecoConnectionError,
+    VivrecoVersionConflictError,
+)
+from .compressor import VivrecoCompressorTracker
+from .const import (
+    CHAUFFAGE_SETPOINTS,
+    COMMAND_MAX_RETRIES,
+    COMMAND_QUEUE_SAVE_DELAY,
+    CONF_ANOMALY_THRESHOLD,
+    CONF_COMFORT_END,
+    CONF_COMFORT_MAX,
+    CONF_COMFORT_MIN,
+    CONF_COMFORT_SCHEDULER,
+    CONF_COMFORT_START,
+    CONF_ECS_LOOKAHEAD,
+    CONF_ECS_SCHEDULER,
+    CONF_ECS_TARGET,
+    CONF_EXPORT,
+    CONF_EXPORT_RETENTION,
+    CONF_HISTORY_DAYS,
+    CONF_HISTORY_MAX_KB,
+    CONF_OFFPEAK_END,
+    CONF_OFFPEAK_PRICE,
+    CONF_OFFPEAK_START,
+    CONF_OPTIMIZER_MODE,
+    CONF_OPTIMIZER_THRESHOLD,
+    CONF_OPTIMIZER_WEATHER,
+    CONF_PEAK_PRICE,
+    DEFAULT_ANOMALY_THRESHOLD,
+    DEFAULT_COMFORT_END,
+    DEFAULT_COMFORT_MAX,
+    DEFAULT_COMFORT_MIN,
+    DEFAULT_COMFORT_START,
+    DEFAULT_ECS_LOOKAHEAD,
+    DEFAULT_ECS_TARGET,
+    DEFAULT_EXPORT_RETENTION,
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_HISTORY_MAX_KB,
+    DEFAULT_OFFPEAK_END,
+    DEFAULT_OFFPEAK_PRICE,
+    DEFAULT_OFFPEAK_START,
+    DEFAULT_OPTIMIZER_MODE,
+    DEFAULT_OPTIMIZER_THRESHOLD,
+    DEFAULT_PEAK_PRICE,
+    DOMAIN,
+    ENERGY_RESET_RATIO,
+    EVENT_ANOMALY,
+    EVENT_COMMAND_NOT_APPLIED,
+    EXPORT_DIRECTORY,
+    OPTIMIZER_FORECAST_REFRESH,
+    OPTIMIZER_HORIZON,
+    OPTIMIZER_PRESETS,
+    SENSORS,
+    SETTINGS_MAX_AGE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    THROTTLE_DEFAULTS,
+)
+from .discovery import VivrecoDiscovery
+from .ecs_scheduler import VivrecoEcsScheduler, VivrecoEcsUsageLearner
+from .history import VivrecoHistory
+from .profiler import VivrecoProbe
+from .thermal import VivrecoComfortScheduler, VivrecoThermalModel
+from .tracker import VivrecoCommandTracker
+from .trend import VivrecoTrend
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,7 +91,13 @@ _LOGGER = logging.getLogger(__name__)
 class VivrecoDataUpdateCoordinator(DataUpdateCoordinator):
     """Gère la récupération et la mise à jour des données depuis l'API."""
 
-    def __init__(self, hass: HomeAssistant, update_interval) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: VivrecoApiClient,
+        update_interval,
+    ) -> None:
         """Initialise le coordinateur."""
         super().__init__(
             hass,
@@ -29,12 +112,646 @@ class VivrecoDataUpdateCoordinator(DataUpdateCoordinator):
             "energy": {},
             "settings": {},
             "config": {},
+            "analytics": {},
+            "compressor": {},
+            "ecs_schedule": {},
+            "comfort": {},
+            "heating_curve": {},
+            "anomalies": {},
+            "history": {},
+            "trends": {},
         }
 
+        self.entry = entry
+        # Un client par entrée : plusieurs PAC peuvent cohabiter
+        self.api = api
+        options = entry.options
+        self.analytics = VivrecoEnergyAnalytics(
+            VivrecoTariff(
+                peak_price=options.get(CONF_PEAK_PRICE, DEFAULT_PEAK_PRICE),
+                offpeak_price=options.get(CONF_OFFPEAK_PRICE, DEFAULT_OFFPEAK_PRICE),
+                offpeak_start=dt_util.parse_time(
+                    options.get(CONF_OFFPEAK_START, DEFAULT_OFFPEAK_START)
+                ),
+                offpeak_end=dt_util.parse_time(
+                    options.get(CONF_OFFPEAK_END, DEFAULT_OFFPEAK_END)
+                ),
+            )
+        )
+        self.compressor = VivrecoCompressorTracker(
+            max_gap=3 * self.update_interval.total_seconds()
+        )
+        self.history = VivrecoHistory(
+            capacity=int(
+                options.get(CONF_HISTORY_DAYS, DEFAULT_HISTORY_DAYS)
+                * 86400
+                / self.update_interval.total_seconds()
+            ),
+            max_bytes=options.get(CONF_HISTORY_MAX_KB, DEFAULT_HISTORY_MAX_KB) * 1024,
+        )
+        self.trends = {key: VivrecoTrend() for key in SENSORS}
+        # Filtrage des écritures d'état : famille -> (variation, délai en secondes)
+        self.throttle = {
+            family: (
+                options.get(f"{family}_delta", delta),
+                options.get(f"{family}_interval", interval) * 60,
+            )
+            for family, (delta, interval) in THROTTLE_DEFAULTS.items()
+        }
+        self._energy_last: dict[str, float] = {}
+        self.discovery = VivrecoDiscovery()
+        self.ecs_learner = VivrecoEcsUsageLearner()
+        self.ecs_scheduler = (
+            VivrecoEcsScheduler(
+                self.ecs_learner,
+                self.analytics.tariff,
+                lookahead=options.get(CONF_ECS_LOOKAHEAD, DEFAULT_ECS_LOOKAHEAD),
+                target=options.get(CONF_ECS_TARGET, DEFAULT_ECS_TARGET),
+            )
+            if options.get(CONF_ECS_SCHEDULER, False)
+            else None
+        )
+        self.thermal = VivrecoThermalModel(
+            max_gap=3 * self.update_interval.total_seconds()
+        )
+        self.comfort_scheduler = (
+            VivrecoComfortScheduler(
+                self.thermal,
+                start=dt_util.parse_time(
+                    options.get(CONF_COMFORT_START, DEFAULT_COMFORT_START)
+                ),
+                end=dt_util.parse_time(
+                    options.get(CONF_COMFORT_END, DEFAULT_COMFORT_END)
+                ),
+            )
+            if options.get(CONF_COMFORT_SCHEDULER, False)
+            else None
+        )
+        self.optimizer_mode = options.get(CONF_OPTIMIZER_MODE, DEFAULT_OPTIMIZER_MODE)
+        self.optimizer = None
+        if self.optimizer_mode != "off":
+            # Module importé seulement si l'option est active
+            from .optimizer import VivrecoHeatingOptimizer  # noqa: PLC0415
+
+            self.optimizer = VivrecoHeatingOptimizer(
+                self.thermal,
+                comfort_min=options.get(CONF_COMFORT_MIN, DEFAULT_COMFORT_MIN),
+                comfort_max=options.get(CONF_COMFORT_MAX, DEFAULT_COMFORT_MAX),
+                threshold=options.get(
+                    CONF_OPTIMIZER_THRESHOLD, DEFAULT_OPTIMIZER_THRESHOLD
+                ),
+            )
+        self._weather_entity: str | None = options.get(CONF_OPTIMIZER_WEATHER)
+        self._forecast: list[tuple[datetime, float]] = []
+        self._forecast_at: datetime | None = None
+        self.anomalies = VivrecoAnomalyDetector(
+            threshold=options.get(CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD)
+        )
+        # Réparations d'anomalie comparées à l'état restauré au premier relevé
+        self._issues_synced = False
+        self.exporter = None
+        if options.get(CONF_EXPORT, False):
+            from .exporter import VivrecoExporter  # noqa: PLC0415
+
+            self.exporter = VivrecoExporter(
+                hass,
+                Path(hass.config.path(EXPORT_DIRECTORY, api.hp_id or "")),
+                retention=options.get(CONF_EXPORT_RETENTION, DEFAULT_EXPORT_RETENTION),
+            )
+        self.probe = VivrecoProbe()
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}")
+        # Plus d'enregistrement différé une fois l'entrée déchargée
+        self._unloaded = False
+
+        # Déduplication des écritures
+        self.settings_updated_at: datetime | None = None
+        self.commands_sent = 0
+        self.commands_skipped = 0
+        self.values_skipped = 0
+        self.command_tracker = VivrecoCommandTracker(hass, self)
+        # Écritures en attente pendant une coupure : clé -> valeur voulue et
+        # valeur connue au moment de la mise en file
+        self.command_queue: dict[str, dict] = {}
+        self._replay_task: asyncio.Task | None = None
+        # Plateformes chargées et durées du démarrage (secondes), renseignées
+        # par async_setup_entry
+        self.platforms: list[Platform] = []
+        self.bootstrap: dict[str, float] = {}
+
+    async def async_load_state(self) -> None:
+        """Restaure l'état calculé persisté (consommation, cycles du compresseur)."""
+        stored = await self._store.async_load() or {}
+        if "analytics" in stored:
+            self.analytics.load(stored["analytics"])
+        if "compressor" in stored:
+            self.compressor.load(stored["compressor"])
+        if "ecs_usage" in stored:
+            self.ecs_learner.load(stored["ecs_usage"])
+        self.command_queue = stored.get("command_queue", {})
+        if "discovery" in stored:
+            self.discovery.load(stored["discovery"])
+        if "thermal" in stored:
+            self.thermal.load(stored["thermal"])
+        if "anomalies" in stored:
+            self.anomalies.load(stored["anomalies"])
+        if self.ecs_scheduler is not None and "ecs_scheduler" in stored:
+            self.ecs_scheduler.load(stored["ecs_scheduler"])
+        if self.optimizer is not None and "optimizer" in stored:
+            self.optimizer.load(stored["optimizer"])
+
+    def _state_to_store(self) -> dict:
+        """État calculé à persister."""
+        return {
+            "analytics": self.analytics.as_dict(),
+            "compressor": self.compressor.as_dict(),
+            "ecs_usage": self.ecs_learner.as_dict(),
+            "command_queue": self.command_queue,
+            "discovery": self.discovery.as_dict(),
+            "thermal": self.thermal.as_dict(),
+            "ecs_scheduler": (
+                self.ecs_scheduler.as_dict() if self.ecs_scheduler else {}
+            ),
+            "optimizer": self.optimizer.as_dict() if self.optimizer else {},
+            "anomalies": self.anomalies.as_dict(),
+        }
+
+    def _schedule_save(self, delay: float) -> None:
+        """Programme l'enregistrement de l'état calculé."""
+        if not self._unloaded:
+            self._store.async_delay_save(self._state_to_store, delay)
+
+    async def async_save_state(self) -> None:
+        """Enregistre l'état calculé au déchargement de l'entrée.
+
+        L'écriture immédiate remplace l'enregistrement différé en attente,
+        qui écraserait sinon l'état relu par l'entrée rechargée.
+        """
+        self._unloaded = True
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+        await self._store.async_save(self._state_to_store())
+
     @property
-    def api(self):
-        """API Vivreco."""
-        return self.hass.data[DOMAIN]["api"]
+    def settings_fresh(self) -> bool:
+        """Indique si les paramètres en cache sont assez récents pour dédupliquer."""
+        return (
+            self.settings_updated_at is not None
+            and dt_util.utcnow() - self.settings_updated_at <= SETTINGS_MAX_AGE
+        )
+
+    async def async_set_settings(
+        self, values: dict, force: bool = False
+    ) -> dict[str, dict]:
+        """Envoie en une seule commande les paramètres qui diffèrent de l'état connu.
+
+        Les valeurs identiques au cache sont ignorées, sauf si `force` est demandé
+        ou si le cache est plus ancien que `SETTINGS_MAX_AGE`. Une clé encore en
+        file ou dont l'écriture attend sa confirmation est toujours envoyée : le
+        cache ne reflète pas encore la dernière valeur demandée. Si l'API est
+        injoignable, les valeurs sont mises en file et rejouées au retour.
+
+        Retourne les valeurs envoyées (`sent`) et celles mises en file
+        (`queued`).
+        """
+        if force or not self.settings_fresh:
+            changes = dict(values)
+        else:
+            current = self.data.get("settings", {})
+            changes = {
+                key: value
+                for key, value in values.items()
+                if key in self.command_queue
+                or self.command_tracker.confirming(key)
+                or current.get(key) != value
+            }
+            self.values_skipped += len(values) - len(changes)
+
+        if not changes:
+            self.commands_skipped += 1
+            _LOGGER.debug("Aucun paramètre modifié, commande ignorée : %s", values)
+            return {"sent": {}, "queued": {}}
+
+        pending = dict(changes)
+        for attempt in range(COMMAND_MAX_RETRIES + 1):
+            try:
+                await self.api.send_command(group="customer_settings", values=pending)
+                break
+            except VivrecoConnectionError as err:
+                return self._queue_unreachable(pending, err)
+            except VivrecoVersionConflictError as err:
+                if attempt == COMMAND_MAX_RETRIES:
+                    raise VivrecoVersionConflictError(
+                        f"Paramètres modifiés en parallèle, commande abandonnée après "
+                        f"{attempt + 1} tentatives : {pending}"
+                    ) from err
+
+                # Relit uniquement customer_settings pour récupérer la version
+                _LOGGER.debug("Conflit de version, relecture des paramètres : %s", err)
+                try:
+                    await self.async_refresh_settings()
+                except VivrecoConnectionError as read_err:
+                    return self._queue_unreachable(pending, read_err)
+                settings = self.data.get("settings", {})
+                pending = {
+                    key: value
+                    for key, value in pending.items()
+                    if settings.get(key) != value
+                }
+                if not pending:
+                    _LOGGER.debug("Paramètres déjà appliqués après relecture")
+                    return {"sent": changes, "queued": {}}
+
+        self.commands_sent += 1
+        self.command_tracker.track(pending)
+        if self.command_queue.keys() & pending.keys():
+            # Une écriture plus récente remplace les valeurs en attente
+            for key in pending:
+                self.command_queue.pop(key, None)
+            self._save_queue()
+        return {"sent": changes, "queued": {}}
+
+    def _queue_unreachable(self, pending: dict, err: Exception) -> dict[str, dict]:
+        """Met en file une commande que l'API injoignable n'a pas reçue."""
+        self._queue_settings(pending)
+        _LOGGER.warning(
+            "API Vivreco injoignable, commande mise en attente (%s) : %s",
+            err,
+            pending,
+        )
+        return {"sent": {}, "queued": pending}
+
+    def _queue_settings(self, values: dict) -> None:
+        """Met en file les valeurs, en ne gardant que la dernière par clé."""
+        settings = self.data.get("settings", {})
+        for key, value in values.items():
+            queued = self.command_queue.get(key)
+            base = queued["base"] if queued else settings.get(key)
+            self.command_queue[key] = {"value": value, "base": base}
+        self._save_queue()
+
+    def _save_queue(self) -> None:
+        """Enregistre rapidement la file pour survivre à un redémarrage."""
+        self._schedule_save(COMMAND_QUEUE_SAVE_DELAY)
+
+    async def _async_replay_queue(self) -> None:
+        """Rejoue en une seule commande les écritures mises en attente.
+
+        Une clé modifiée ailleurs pendant la coupure (valeur actuelle différente
+        de celle connue à la mise en file) n'est pas écrasée.
+        """
+        queued, self.command_queue = self.command_queue, {}
+        settings = self.data.get("settings", {})
+        pending: dict = {}
+        conflicts: dict = {}
+        for key, item in queued.items():
+            current = settings.get(key)
+            if current == item["value"]:
+                continue
+            if key in settings and current != item["base"]:
+                conflicts[key] = item["value"]
+            else:
+                pending[key] = item["value"]
+
+        if conflicts:
+            _LOGGER.warning(
+                "Paramètres modifiés ailleurs pendant la coupure, "
+                "commande en attente abandonnée : %s",
+                conflicts,
+            )
+            self.hass.bus.async_fire(
+                EVENT_COMMAND_NOT_APPLIED,
+                {"values": conflicts, "reason": "changed_elsewhere"},
+            )
+
+        if pending:
+            _LOGGER.debug("Reprise des commandes en attente : %s", pending)
+            try:
+                await self.async_set_settings(pending, force=True)
+            except VivrecoApiError as err:
+                _LOGGER.error("Reprise des commandes en attente impossible : %s", err)
+                self.hass.bus.async_fire(
+                    EVENT_COMMAND_NOT_APPLIED,
+                    {"values": pending, "reason": "error"},
+                )
+        self._save_queue()
+
+    async def async_refresh_settings(self, notify: bool = True) -> bool:
+        """Relit customer_settings (et la version) sans rafraîchissement complet."""
+        settings_data = await self.api.get_settings_data()
+        updated = self._apply_settings(settings_data)
+        if updated and notify:
+            self.async_update_listeners()
+        return updated
+
+    def _apply_settings(self, settings_data: dict) -> bool:
+        """Met à jour les paramètres et les fonctionnalités détectées."""
+        if not settings_data or "values" not in settings_data:
+            return False
+
+        settings = settings_data["values"]["values"]
+        self.data["settings"] = settings
+        self.settings_updated_at = dt_util.utcnow()
+
+        # Détection des fonctionnalités disponibles
+        self.data["config"] = {
+            "app_elec": "auth_p/etat_glob/aut_app_elec" in settings,
+            "ch": "auth_p/etat_glob/aut_ch" in settings,
+            "ecs": "auth_p/etat_glob/aut_ecs" in settings,
+            "raf": "auth_p/etat_glob/aut_raf" in settings,
+        }
+        return True
+
+    def _index_energy(self, totals: list) -> dict[str, float]:
+        """Indexe les compteurs par catégorie en filtrant les baisses parasites.
+
+        Une baisse franche (sous `ENERGY_RESET_RATIO` de la valeur précédente) est
+        une remise à zéro du compteur et est conservée ; une légère baisse est un
+        relevé incohérent et l'ancienne valeur est gardée pour ne pas fausser les
+        statistiques long terme.
+        """
+        energy: dict[str, float] = {}
+        for item in totals:
+            name, value = item.get("name"), item.get("y")
+            if name is None or value is None:
+                continue
+            value = float(value)
+            previous = self._energy_last.get(name)
+            if (
+                previous is not None
+                and value < previous
+                and value > previous * ENERGY_RESET_RATIO
+            ):
+                _LOGGER.debug(
+                    "Baisse du compteur %s ignorée : %s -> %s", name, previous, value
+                )
+                value = previous
+            energy[name] = value
+
+        self._energy_last.update(energy)
+        return energy
+
+    def _update_history(self, values: dict) -> None:
+        """Ajoute le relevé à l'historique en mémoire et calcule les tendances."""
+        sample = dict(values)
+        sample.update(
+            (f"settings.{key}", value)
+            for key, value in self.data.get("settings", {}).items()
+        )
+        sample.update(
+            (f"energy.{name}", value)
+            for name, value in self.data.get("energy", {}).items()
+        )
+        now = dt_util.now()
+        self.history.append(now, sample)
+
+        timestamp = now.timestamp()
+        for key, trend in self.trends.items():
+            if (value := values.get(key)) is not None:
+                trend.update(timestamp, float(value))
+        self.data["trends"] = {
+            key: trend.snapshot for key, trend in self.trends.items()
+        }
+
+        recovery = self.history.ecs_recovery()
+        rate = self.history.rate_of_change("t_int", 3600)
+        self.data["history"] = {
+            "t_int_rate": round(rate, 2) if rate is not None else None,
+            "ecs_recovery_time": round(recovery[1] / 60, 1) if recovery else None,
+            "ecs_recovery_end": recovery[0] if recovery else None,
+            **self.history.stats(),
+        }
+
+    def _update_anomalies(self, values: dict) -> None:
+        """Met à jour les scores d'anomalie et signale les écarts (réparations)."""
+        raised, cleared = self.anomalies.update(
+            dt_util.now(),
+            values,
+            ecs_recovery=self.data["history"].get("ecs_recovery_time"),
+            ecs_recovery_end=self.data["history"].get("ecs_recovery_end"),
+            energy_last_hour=self.data["analytics"].get("energy_last_hour"),
+        )
+        self.data["anomalies"] = self.anomalies.snapshot
+
+        if not self._issues_synced and self.api.hp_id:
+            # Premier relevé : réparations restées d'une anomalie levée depuis
+            # supprimées
+            self._issues_synced = True
+            for metric in ANOMALY_METRICS:
+                if metric not in self.anomalies.active:
+                    ir.async_delete_issue(
+                        self.hass, DOMAIN, f"anomaly_{metric}_{self.api.hp_id}"
+                    )
+
+        for metric in raised:
+            details = self.anomalies.details(metric)
+            _LOGGER.warning("Anomalie détectée (%s) : %s", metric, details)
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                f"anomaly_{metric}_{self.api.hp_id}",
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=f"anomaly_{metric}",
+                translation_placeholders={
+                    "pump": self.entry.title,
+                    **{key: str(value) for key, value in details.items()},
+                },
+            )
+            self.hass.bus.async_fire(EVENT_ANOMALY, {"metric": metric, **details})
+        for metric in cleared:
+            ir.async_delete_issue(
+                self.hass, DOMAIN, f"anomaly_{metric}_{self.api.hp_id}"
+            )
+
+    def _update_ecs_schedule(self, values: dict) -> None:
+        """Apprend les puisages ECS et applique le plan de préchauffage."""
+        now = dt_util.now()
+        self.ecs_learner.update(now, values.get("t_ecs"), values.get("state"))
+        if self.ecs_scheduler is None:
+            return
+
+        scheduler = self.ecs_scheduler
+        planned = scheduler.plan(now, self.data.get("settings", {}))
+        changes = self._scheduled_changes(scheduler, planned)
+        if (
+            not changes
+            and scheduler.saved is not None
+            and planned.get(scheduler.SETPOINT) == scheduler.saved
+            and scheduler.SETPOINT not in self.command_queue
+            and not self.command_tracker.confirming(scheduler.SETPOINT)
+        ):
+            # Mode repris en main : la consigne de l'utilisateur est tout de
+            # même rétablie après le préchauffage
+            changes = {scheduler.SETPOINT: planned[scheduler.SETPOINT]}
+        self.data["ecs_schedule"] = {
+            "demand": round(scheduler.demand * 100),
+            "planned": planned,
+            "overridden": scheduler.overridden,
+        }
+        if changes:
+            self.hass.async_create_background_task(
+                self._async_apply_plan(changes), "vivreco_ecs_scheduler"
+            )
+
+    def _update_comfort_schedule(self, values: dict) -> None:
+        """Apprend le modèle thermique et démarre le confort au plus juste."""
+        now = dt_util.now()
+        settings = self.data.get("settings", {})
+        t_int, t_ext = values.get("t_int"), values.get("t_ext")
+        if t_int is None or t_ext is None or settings.get("auth_p/etat_glob/aut_raf"):
+            self.thermal.skip()
+        else:
+            self.thermal.update(
+                now.timestamp(),
+                float(t_int),
+                float(t_ext),
+                bool(values.get("comp_one")),
+            )
+
+        loss, gain, offset = self.thermal.theta
+        self.data["comfort"] = {
+            "model": {
+                "loss": round(loss, 4),
+                "gain": round(gain, 3),
+                "offset": round(offset, 3),
+                "samples": self.thermal.samples,
+                "ready": self.thermal.ready,
+            }
+        }
+        if self.comfort_scheduler is None or settings.get("auth_p/etat_glob/aut_raf"):
+            return
+
+        planned = self.comfort_scheduler.plan(now, values, settings)
+        changes = self._scheduled_changes(self.comfort_scheduler, planned)
+        preheat = self.comfort_scheduler.preheat
+        self.data["comfort"].update(
+            {
+                "preheat": round(preheat * 60) if preheat is not None else None,
+                "next_start": self.comfort_scheduler.next_start.isoformat(),
+                "planned": planned,
+                "overridden": self.comfort_scheduler.overridden,
+            }
+        )
+        if changes:
+            self.hass.async_create_background_task(
+                self._async_apply_plan(changes), "vivreco_comfort_scheduler"
+            )
+
+    def _scheduled_changes(self, scheduler, planned: dict) -> dict:
+        """Paramètres du plan à envoyer, sauf si l'utilisateur a repris la main.
+
+        Un planificateur ne remplace que les modes qu'il pilote : un autre mode
+        (hors-gel, absence, auto...) n'est jamais écrasé. Un mode différent de
+        sa dernière écriture est un choix manuel, respecté jusqu'à l'étape
+        suivante du plan.
+        """
+        key = scheduler.KEY
+        if key in self.command_queue or self.command_tracker.confirming(key):
+            # Écriture en cours (du planificateur ou de l'utilisateur)
+            return {}
+
+        mode = planned[key]
+        current = self.data.get("settings", {}).get(key)
+        if mode != scheduler.last_plan:
+            scheduler.last_plan = mode
+            scheduler.overridden = False
+        elif scheduler.written is not None and current != scheduler.written:
+            if not scheduler.overridden:
+                _LOGGER.info(
+                    "%s modifié manuellement (%s), planification suspendue",
+                    key,
+                    current,
+                )
+            scheduler.overridden = True
+
+        if scheduler.overridden or current not in scheduler.MODES:
+            return {}
+        scheduler.written = mode
+        return planned
+
+    async def _async_update_heating_curve(self, values: dict) -> None:
+        """Compare la consigne active à la consigne de préchauffage optimale."""
+        now = dt_util.now()
+        t_int, t_ext = values.get("t_int"), values.get("t_ext")
+        self.optimizer.learn(
+            now.timestamp(),
+            self.data["energy"].get("ch"),
+            bool(values.get("comp_one")),
+            float(t_ext) if t_ext is not None else None,
+        )
+
+        settings = self.data.get("settings", {})
+        preset = settings.get("mode_zone_p/ambiance")
+        key = CHAUFFAGE_SETPOINTS.get(preset, {}).get("key")
+        current = settings.get(key)
+        if (
+            preset not in OPTIMIZER_PRESETS
+            or None in (t_int, t_ext, current)
+            or settings.get("auth_p/etat_glob/aut_raf")
+        ):
+            self.data["heating_curve"] = {}
+            return
+
+        forecast = await self._async_outdoor_forecast(now, float(t_ext))
+        result = self.optimizer.optimize(float(t_int), forecast, float(current))
+        kwh_per_hour = self.optimizer.kwh_per_hour
+        self.data["heating_curve"] = {
+            **result,
+            "preset": preset,
+            "mode": self.optimizer_mode,
+            "kwh_per_hour": round(kwh_per_hour, 2) if kwh_per_hour else None,
+            "forecast": forecast,
+        }
+        if result.get("apply") and self.optimizer_mode == "apply":
+            self.hass.async_create_background_task(
+                self._async_apply_plan({key: result["setpoint"]}),
+                "vivreco_heating_curve",
+            )
+
+    async def _async_outdoor_forecast(self, now: datetime, t_ext: float) -> list:
+        """Températures extérieures heure par heure sur l'horizon d'optimisation.
+
+        La première heure est la mesure de la PAC ; les suivantes viennent de
+        l'entité météo (relue au plus une fois par heure) ou, à défaut,
+        reprennent la dernière valeur connue.
+        """
+        if self._weather_entity and (
+            self._forecast_at is None
+            or now - self._forecast_at >= OPTIMIZER_FORECAST_REFRESH
+        ):
+            self._forecast_at = now
+            try:
+                response = await self.hass.services.async_call(
+                    "weather",
+                    "get_forecasts",
+                    {"entity_id": self._weather_entity, "type": "hourly"},
+                    blocking=True,
+                    return_response=True,
+                )
+            except HomeAssistantError as err:
+                _LOGGER.warning("Prévisions météo indisponibles : %s", err)
+                response = {}
+            self._forecast = [
+                (moment, float(item["temperature"]))
+                for item in response.get(self._weather_entity, {}).get("forecast", [])
+                if item.get("temperature") is not None
+                and (moment := dt_util.parse_datetime(item.get("datetime", "")))
+            ]
+
+        forecast = [t_ext]
+        forecast.extend(
+            temperature for moment, temperature in self._forecast if moment > now
+        )
+        forecast = forecast[:OPTIMIZER_HORIZON]
+        forecast.extend([forecast[-1]] * (OPTIMIZER_HORIZON - len(forecast)))
+        return forecast
+
+    async def _async_apply_plan(self, planned: dict) -> None:
+        """Envoie les paramètres planifiés (ignorés s'ils sont déjà en place)."""
+        try:
+            await self.async_set_settings(planned)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Plan %s non appliqué : %s", planned, err)
 
     async def _async_update_data(self):
         """Récupère les données depuis l'API."""
@@ -48,31 +765,84 @@ class VivrecoDataUpdateCoordinator(DataUpdateCoordinator):
         if not self.api.hp_id:
             await self.api.fetch_hp_id()
 
-        chart_data = await self.api.get_chart_data()
-        energy_data = await self.api.get_energy_data()
-        settings_data = await self.api.get_settings_data()
+        with self.probe.measure("fetch"):
+            try:
+                chart_data = await self.api.get_chart_data()
+                energy_data = await self.api.get_energy_data()
+                settings_data = await self.api.get_settings_data()
+            except VivrecoConnectionError as err:
+                raise UpdateFailed(str(err)) from err
+
+        with self.probe.measure("processing"):
+            self._process(chart_data, energy_data, settings_data)
+
+        if self.optimizer is not None and self.data.get("config", {}).get("ch"):
+            await self._async_update_heating_curve(self.data.get("values", {}))
+
+        self._schedule_save(STORAGE_SAVE_DELAY)
+
+        return self.data
+
+    def _process(
+        self, chart_data: dict, energy_data: dict, settings_data: dict
+    ) -> None:
+        """Analyse les réponses de l'API et met à jour les données dérivées."""
 
         if chart_data and "elements" in chart_data:
             self.data = chart_data["elements"]
 
         if energy_data:
-            self.data["energy"] = (
+            self.data["energy"] = self._index_energy(
                 energy_data.get("values", {})
                 .get("values", {})
                 .get("energyValues", {})
-                .get("total", {})
+                .get("total", [])
             )
+        else:
+            self.data.setdefault("energy", {})
 
-        if settings_data and "values" in settings_data:
-            settings = settings_data["values"]["values"]
-            self.data["settings"] = settings
+        # API de nouveau joignable : reprise des écritures en attente
+        if (
+            self._apply_settings(settings_data)
+            and self.command_queue
+            and (self._replay_task is None or self._replay_task.done())
+        ):
+            self._replay_task = self.hass.async_create_background_task(
+                self._async_replay_queue(), "vivreco_command_queue"
+            )
 
-            # Détection des fonctionnalités disponibles
-            self.data["config"] = {
-                "app_elec": "auth_p/etat_glob/aut_app_elec" in settings,
-                "ch": "auth_p/etat_glob/aut_ch" in settings,
-                "ecs": "auth_p/etat_glob/aut_ecs" in settings,
-                "raf": "auth_p/etat_glob/aut_raf" in settings,
-            }
+        # Agrégats de consommation : uniquement le delta depuis le dernier relevé
+        self.analytics.update(
+            dt_util.now(),
+            self.data["energy"],
+            self.data.get("values", {}),
+        )
+        self.data["analytics"] = self.analytics.snapshot
 
-        return self.data
+        values = self.data.get("values", {})
+        if self.exporter is not None:
+            self.exporter.append(
+                dt_util.now(),
+                values,
+                self.data.get("settings", {}),
+                self.data["energy"],
+            )
+        self._update_history(values)
+        self._update_anomalies(values)
+
+        if "comp_one" in values:
+            now = dt_util.now()
+            self.compressor.update(now, bool(values["comp_one"]), values.get("state"))
+            self.data["compressor"] = self.compressor.snapshot(now)
+
+        if self.data.get("config", {}).get("ch"):
+            self._update_comfort_schedule(values)
+
+        if self.data.get("config", {}).get("ecs"):
+            self._update_ecs_schedule(values)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notifie les entités en mesurant le temps passé dans leurs rappels."""
+        with self.probe.measure("entities"):
+            super().async_update_listeners()
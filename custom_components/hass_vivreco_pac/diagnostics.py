@@ -0,0 +1,41 @@
+"""Diagnostics pour Vivreco PAC."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Retourne les diagnostics de l'entrée."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "data": coordinator.data,
+        "bootstrap": coordinator.bootstrap,
+        "commands": {
+            "sent": coordinator.commands_sent,
+            "skipped": coordinator.commands_skipped,
+            "values_skipped": coordinator.values_skipped,
+            "settings_updated_at": coordinator.settings_updated_at,
+            "confirmed": coordinator.command_tracker.confirmed,
+            "not_applied": coordinator.command_tracker.not_applied,
+            "last_latency": coordinator.command_tracker.last_latency,
+            "average_latency": coordinator.command_tracker.average_latency,
+            "queued": coordinator.command_queue,
+        },
+        "history": coordinator.history.export(),
+        "export": coordinator.exporter.stats if coordinator.exporter else None,
+        "performance": {
+            **coordinator.probe.stats,
+            "requests": coordinator.api.timer.stats,
+        },
+        "transport": coordinator.api.transport_stats,
+    }
@@ -0,0 +1,151 @@
+"""Découverte des clés `values` / `customer_settings` sans entité dédiée."""
+
+import hashlib
+
+from .const import (
+    CHAUFFAGE_SETPOINTS,
+    ECS_SETPOINTS,
+    MODE,
+    MODE_AMBIANCE_ECS,
+    MODE_AMBIANCE_ZONE_PRINCIPALE,
+    SENSORS,
+)
+
+# Clés déjà exposées par les entités dédiées
+HANDLED_VALUES = {*SENSORS, "state", "comp_one"}
+HANDLED_SETTINGS = {
+    *MODE,
+    *(info["key"] for info in ECS_SETPOINTS.values()),
+    *(info["key"] for info in CHAUFFAGE_SETPOINTS.values()),
+    "mode_zone_p/ambiance",
+    "mode_ecs/ambiance_ecs",
+}
+
+# Options connues des paramètres textuels (suffixe de clé -> options)
+KNOWN_OPTIONS = {
+    "/ambiance": MODE_AMBIANCE_ZONE_PRINCIPALE,
+    "/ambiance_ecs": MODE_AMBIANCE_ECS,
+}
+
+# Plateforme des entités créées pour chaque type de schéma
+ENTITY_DOMAINS = {
+    "binary": "binary_sensor",
+    "numeric": "sensor",
+    "text": "sensor",
+    "select": "select",
+}
+
+# Version des règles d'inférence, incluse dans l'empreinte : un changement de
+# règles invalide le schéma persisté
+SCHEMA_VERSION = 3
+
+
+def _is_temperature(key: str) -> bool:
+    """Les clés de température suivent la convention `t_*` ou `*/t_*`."""
+    name = key.rsplit("/", 1)[-1]
+    return name.startswith(("t_", "cons_t"))
+
+
+def _infer_value(key: str, value, label: str | None) -> dict | None:
+    """Description en lecture seule d'un relevé ou d'un paramètre."""
+    if isinstance(value, bool):
+        return {"type": "binary", "name": label or key}
+    if isinstance(value, (int, float)):
+        return {
+            "type": "numeric",
+            "name": label or key,
+            "temperature": _is_temperature(key),
+        }
+    if isinstance(value, str):
+        return {"type": "text", "name": label or key}
+    return None
+
+
+def _infer_setting(key: str, value) -> dict | None:
+    """Description d'un paramètre `customer_settings`.
+
+    Liste de choix si ses options sont connues, lecture seule sinon : l'API
+    n'indique pas les limites des paramètres numériques et n'en refuse pas
+    toujours une valeur hors limites.
+    """
+    if isinstance(value, str):
+        for suffix, options in KNOWN_OPTIONS.items():
+            if key.endswith(suffix):
+                return {"type": "select", "name": key, "options": list(options)}
+    return _infer_value(key, value, None)
+
+
+class VivrecoDiscovery:
+    """Schéma inféré des clés non couvertes, mis en cache par empreinte.
+
+    L'inférence (type, unité) n'est faite qu'au démarrage, et seulement si le
+    jeu de clés a changé depuis la dernière fois (mise à jour du
+    micrologiciel) ; le résultat est persisté avec l'état du coordinateur. La
+    `version` de `customer_settings` numérote les écritures de paramètres, pas
+    le micrologiciel : l'empreinte du jeu de clés en tient lieu.
+    """
+
+    def __init__(self) -> None:
+        """Initialise le cache."""
+        self.fingerprint: str | None = None
+        self.values: dict[str, dict] = {}
+        self.settings: dict[str, dict] = {}
+
+    @staticmethod
+    def _fingerprint(values: dict, settings: dict) -> str:
+        """Empreinte du jeu de clés (et de leurs types) exposé par la PAC."""
+        signature = f"{SCHEMA_VERSION}|" + "|".join(
+            f"{section}:{key}:{type(value).__name__}"
+            for section, data in (("v", values), ("s", settings))
+            for key, value in sorted(data.items())
+        )
+        return hashlib.sha1(signature.encode(), usedforsecurity=False).hexdigest()
+
+    def update(self, data: dict) -> bool:
+        """Infère le schéma si le jeu de clés a changé (retourne True dans ce cas)."""
+        values = data.get("values", {})
+        settings = data.get("settings", {})
+        fingerprint = self._fingerprint(values, settings)
+        if fingerprint == self.fingerprint:
+            return False
+
+        labels = data.get("labels")
+        if not isinstance(labels, dict):
+            labels = {}
+        self.values = {
+            key: schema
+            for key, value in values.items()
+            if key not in HANDLED_VALUES
+            and (schema := _infer_value(key, value, labels.get(key))) is not None
+        }
+        self.settings = {
+            key: schema
+            for key, value in settings.items()
+            if key not in HANDLED_SETTINGS
+            and (schema := _infer_setting(key, value)) is not None
+        }
+        self.fingerprint = fingerprint
+        return True
+
+    @property
+    def entities(self) -> set[tuple[str, str]]:
+        """Couples (plateforme, clé) des entités découvertes."""
+        return {
+            (ENTITY_DOMAINS[schema["type"]], key)
+            for schemas in (self.values, self.settings)
+            for key, schema in schemas.items()
+        }
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "fingerprint": self.fingerprint,
+            "values": self.values,
+            "settings": self.settings,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure le schéma depuis le stockage."""
+        self.fingerprint = data.get("fingerprint")
+        self.values = data.get("values", {})
+        self.settings = data.get("settings", {})
@@ -0,0 +1,154 @@
+"""Préchauffage prédictif de l'ECS à partir des habitudes de puisage."""
+
+from datetime import datetime, timedelta
+
+from .analytics import VivrecoTariff
+from .const import (
+    ECS_DRAW_THRESHOLD,
+    ECS_SETPOINTS,
+    ECS_USAGE_DECAY,
+    ECS_USAGE_MIN_SCORE,
+)
+
+SLOTS = 7 * 24
+STATE_ECS = "ecs"
+
+
+def _slot(moment: datetime) -> int:
+    """Créneau horaire de la semaine (0 = lundi 0h)."""
+    return moment.weekday() * 24 + moment.hour
+
+
+class VivrecoEcsUsageLearner:
+    """Histogramme hebdomadaire des puisages d'eau chaude.
+
+    Chaque relevé ne touche qu'un créneau ; l'histogramme (168 valeurs) est
+    atténué une fois par jour pour suivre l'évolution des habitudes.
+    """
+
+    def __init__(self) -> None:
+        """Initialise l'histogramme."""
+        self.histogram = [0.0] * SLOTS
+        self._last_t_ecs: float | None = None
+        self._last_state: str | None = None
+        self._last_decay: str | None = None
+
+    def update(self, now: datetime, t_ecs: float | None, state: str | None) -> None:
+        """Intègre un relevé de `t_ecs` et `state`."""
+        day = now.date().isoformat()
+        if self._last_decay != day:
+            if self._last_decay is not None:
+                self.histogram = [value * ECS_USAGE_DECAY for value in self.histogram]
+            self._last_decay = day
+
+        slot = _slot(now)
+
+        # Baisse de température hors chauffe : puisage
+        if (
+            t_ecs is not None
+            and self._last_t_ecs is not None
+            and state != STATE_ECS
+            and self._last_t_ecs - t_ecs >= ECS_DRAW_THRESHOLD
+        ):
+            self.histogram[slot] += self._last_t_ecs - t_ecs
+
+        # Début d'une période de chauffe ECS : le ballon a été sollicité
+        if state == STATE_ECS and self._last_state != STATE_ECS:
+            self.histogram[slot] += ECS_DRAW_THRESHOLD
+
+        if t_ecs is not None:
+            self._last_t_ecs = float(t_ecs)
+        self._last_state = state
+
+    def demand(self, start: datetime, hours: int) -> float:
+        """Score de demande (0-1) sur les `hours` heures à partir de `start`."""
+        peak = max(self.histogram)
+        if peak <= 0:
+            return 0.0
+        return (
+            max(
+                self.histogram[_slot(start + timedelta(hours=offset))]
+                for offset in range(hours)
+            )
+            / peak
+        )
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "histogram": self.histogram,
+            "last_decay": self._last_decay,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        histogram = data.get("histogram", [])
+        if len(histogram) == SLOTS:
+            self.histogram = [float(value) for value in histogram]
+        self._last_decay = data.get("last_decay")
+
+
+class VivrecoEcsScheduler:
+    """Choisit le mode ECS et la consigne en anticipant la demande.
+
+    La chauffe est lancée de préférence en heures creuses dès qu'une demande est
+    prévue dans l'horizon, et en heures pleines seulement si le puisage est
+    attendu dans l'heure. La consigne normale de l'utilisateur est mémorisée
+    pendant le préchauffage et rétablie à sa fin.
+    """
+
+    # Paramètre piloté et modes que le planificateur peut écrire
+    KEY = "mode_ecs/ambiance_ecs"
+    MODES = ("normal", "reduit")
+    # Consigne remplacée par la cible pendant le préchauffage
+    SETPOINT = ECS_SETPOINTS["normal"]["key"]
+
+    def __init__(
+        self,
+        learner: VivrecoEcsUsageLearner,
+        tariff: VivrecoTariff,
+        lookahead: int,
+        target: float,
+    ) -> None:
+        """Initialise le planificateur."""
+        self.learner = learner
+        self.tariff = tariff
+        self.lookahead = lookahead
+        self.target = target
+        self.demand: float = 0.0
+        # Dernier mode planifié et écrit, reprise en main par l'utilisateur
+        self.last_plan: str | None = None
+        self.written: str | None = None
+        self.overridden = False
+        # Consigne normale de l'utilisateur à rétablir après le préchauffage
+        self.saved: float | None = None
+
+    def plan(self, now: datetime, settings: dict) -> dict:
+        """Retourne les paramètres ECS souhaités pour l'instant donné."""
+        self.demand = self.learner.demand(now, self.lookahead)
+        imminent = self.learner.demand(now, 1) >= ECS_USAGE_MIN_SCORE
+        setpoint = settings.get(self.SETPOINT)
+
+        if self.demand >= ECS_USAGE_MIN_SCORE and (
+            imminent or self.tariff.is_offpeak(now)
+        ):
+            if self.saved is None and setpoint not in (None, self.target):
+                self.saved = setpoint
+            return {self.KEY: "normal", self.SETPOINT: self.target}
+
+        planned = {self.KEY: "reduit"}
+        if self.saved is not None:
+            if setpoint == self.saved:
+                # Consigne rétablie
+                self.saved = None
+            else:
+                planned[self.SETPOINT] = self.saved
+        return planned
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {"saved": self.saved}
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        self.saved = data.get("saved")
@@ -1,5 +1,8 @@
 """Base Vivreco entity."""
 
+import time
+
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -9,11 +12,65 @@ from .const import MODE_EMOJI
 class VivrecoBaseEntity(CoordinatorEntity):
     """Classe de base pour toutes les entités Vivreco PAC."""
 
+    # Famille de filtrage des écritures (voir THROTTLE_DEFAULTS), None : aucun
+    _throttle_family: str | None = None
+
     def __init__(self, coordinator) -> None:
         """Base Vivreco entity."""
 
         super().__init__(coordinator)
         self.coordinator = coordinator
+        self._written_state = None
+        self._written_at = 0.0
+
+    async def async_added_to_hass(self) -> None:
+        """Retient l'état écrit à l'ajout comme référence du filtrage."""
+        await super().async_added_to_hass()
+        if self._throttle_family is not None:
+            self._written_state = self.state if self.available else None
+            self._written_at = time.monotonic()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Écrit l'état, sauf variation non significative récente."""
+        if self._throttle_family is None or self._significant_change():
+            super()._handle_coordinator_update()
+
+    def _significant_change(self) -> bool:
+        """Indique si l'état courant doit être écrit.
+
+        Une faible variation (sous le seuil de la famille) n'est écrite qu'une
+        fois le délai écoulé depuis la dernière écriture ; un changement franc,
+        une indisponibilité ou un retour sont écrits immédiatement.
+        """
+        delta, interval = self.coordinator.throttle[self._throttle_family]
+        now = time.monotonic()
+        state = self.state if self.available else None
+        previous = self._written_state
+
+        if (
+            state is not None
+            and previous is not None
+            and now - self._written_at < interval
+        ):
+            if state == previous:
+                return False
+            try:
+                if abs(float(state) - float(previous)) < delta:
+                    return False
+            except (TypeError, ValueError):
+                pass
+
+        self._written_state = state
+        self._written_at = now
+        return True
+
+    @property
+    def unique_id(self) -> str | None:
+        """Identifiant préfixé par la PAC : un compte peut en avoir plusieurs."""
+        if self._attr_unique_id is None:
+            return None
+        return f"{self.coordinator.api.hp_id}_{self._attr_unique_id}"
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -29,7 +86,7 @@ class VivrecoBaseEntity(CoordinatorEntity):
             identifiers={("vivreco_pac", self.coordinator.api.hp_id)},
             model="PAC Connectée",
             manufacturer="Vivreco",
-            name="Vivreco PAC",
+            name=self.coordinator.entry.title,
             configuration_url="https://vivrecocontrol.com",
             serial_number=self.coordinator.api.hp_id,
             hw_version=active_icons or "Aucune option active",
@@ -0,0 +1,171 @@
+"""Export des relevés bruts dans des CSV quotidiens, compressés à leur clôture."""
+
+import asyncio
+import csv
+from datetime import date, datetime, timedelta
+import gzip
+import logging
+from pathlib import Path
+import re
+import shutil
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import EXPORT_BATCH_SIZE, EXPORT_BUFFER_LIMIT
+
+_LOGGER = logging.getLogger(__name__)
+
+FILE_PATTERN = re.compile(r"vivreco_(\d{4}-\d{2}-\d{2})_\d{6}\.csv(\.gz)?")
+
+
+class VivrecoExporter:
+    """Accumule les relevés en mémoire et les écrit par lots hors de la boucle.
+
+    Chaque jour a son fichier `vivreco_<date>_<heure>.csv` (une colonne par
+    clé `values.*`, `settings.*`, `energy.*`, heure de la première ligne) ; un
+    nouveau fichier est ouvert au changement de jour, si les colonnes changent
+    ou après un redémarrage. Les lots sont ajoutés en CSV simple et un fichier
+    n'est compressé (`.csv.gz`) qu'une fois clos. Le découpage en fichiers est
+    décidé dans la boucle ; l'exécuteur ne fait qu'écrire. Un lot dont
+    l'écriture échoue est remis en tête du tampon.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path, retention: int) -> None:
+        """Initialise l'export."""
+        self.hass = hass
+        self.directory = directory
+        self.retention = retention
+        self._buffer: list[dict] = []
+        self._flush_task: asyncio.Task | None = None
+        self._day: str | None = None
+        self._columns: list[str] = []
+        self._path: Path | None = None
+
+        self.rows_written = 0
+        self.last_flush: dict | None = None
+        self.last_error: str | None = None
+
+    def append(self, now: datetime, values: dict, settings: dict, energy: dict) -> None:
+        """Ajoute un relevé au tampon et lance l'écriture si le lot est complet."""
+        row = {"timestamp": now.isoformat()}
+        for prefix, data in (
+            ("values", values),
+            ("settings", settings),
+            ("energy", energy),
+        ):
+            row.update((f"{prefix}.{key}", value) for key, value in data.items())
+        self._buffer.append(row)
+
+        if len(self._buffer) >= EXPORT_BATCH_SIZE and (
+            self._flush_task is None or self._flush_task.done()
+        ):
+            rows, self._buffer = self._buffer, []
+            self._flush_task = self.hass.async_create_task(
+                self._async_write(rows), "vivreco_export"
+            )
+
+    async def async_flush(self) -> None:
+        """Écrit les relevés restants (déchargement)."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._buffer:
+            rows, self._buffer = self._buffer, []
+            await self._async_write(rows)
+
+    async def _async_write(self, rows: list[dict]) -> None:
+        """Écrit un lot dans l'exécuteur ; le remet en tampon en cas d'échec."""
+        segments = self._segments(rows)
+        try:
+            self.last_flush = await self.hass.async_add_executor_job(
+                self._write, segments, date.fromisoformat(self._day)
+            )
+        except OSError as err:
+            self.last_error = str(err)
+            _LOGGER.warning("Export Vivreco impossible : %s", err)
+            self._buffer[:0] = rows
+            if (excess := len(self._buffer) - EXPORT_BUFFER_LIMIT) > 0:
+                _LOGGER.warning("Export Vivreco : %s relevés abandonnés", excess)
+                del self._buffer[:excess]
+            return
+        self.last_error = None
+        self.rows_written += len(rows)
+        _LOGGER.debug("Export Vivreco : %s", self.last_flush)
+
+    def _segments(self, rows: list[dict]) -> list[tuple[Path, list[str], list]]:
+        """Découpe le lot en suites de lignes écrites dans le même fichier.
+
+        Change de fichier au changement de jour ou quand une ligne apporte de
+        nouvelles colonnes ; le fichier en cours est mémorisé pour le lot
+        suivant.
+        """
+        segments: list[tuple[Path, list[str], list]] = []
+        for row in rows:
+            day = row["timestamp"][:10]
+            if day != self._day or not row.keys() <= set(self._columns):
+                self._day = day
+                self._columns = ["timestamp", *sorted(row.keys() - {"timestamp"})]
+                stamp = row["timestamp"][11:19].replace(":", "")
+                self._path = self.directory / f"vivreco_{day}_{stamp}.csv"
+                segments.append((self._path, self._columns, []))
+            elif not segments:
+                segments.append((self._path, self._columns, []))
+            segments[-1][2].append(row)
+        return segments
+
+    def _write(self, segments: list[tuple[Path, list[str], list]], today: date) -> dict:
+        """Écrit les suites de lignes, compresse les fichiers clos (exécuteur)."""
+        started = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        for path, columns, segment in segments:
+            new_file = not path.exists()
+            with path.open("a", newline="", encoding="utf-8") as handle:
+                writer = csv.DictWriter(handle, columns, restval="")
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(segment)
+
+        current = segments[-1][0]
+        for path in self.directory.glob("vivreco_*.csv"):
+            if path != current:
+                self._compress(path)
+        self._prune(today)
+
+        elapsed = time.perf_counter() - started
+        rows = sum(len(segment) for _, _, segment in segments)
+        return {
+            "rows": rows,
+            "seconds": round(elapsed, 4),
+            "rows_per_second": round(rows / elapsed) if elapsed else None,
+            "path": str(current),
+        }
+
+    @staticmethod
+    def _compress(path: Path) -> None:
+        """Compresse un fichier clos et supprime le CSV."""
+        with (
+            path.open("rb") as source,
+            gzip.open(path.with_name(f"{path.name}.gz"), "wb") as target,
+        ):
+            shutil.copyfileobj(source, target)
+        path.unlink()
+
+    def _prune(self, today: date) -> None:
+        """Supprime les fichiers plus anciens que la durée de rétention."""
+        limit = today - timedelta(days=self.retention)
+        for path in self.directory.glob("vivreco_*.csv*"):
+            match = FILE_PATTERN.fullmatch(path.name)
+            if match and date.fromisoformat(match.group(1)) < limit:
+                _LOGGER.debug("Suppression de l'export %s", path.name)
+                path.unlink(missing_ok=True)
+
+    @property
+    def stats(self) -> dict:
+        """Lignes en attente et écrites, dernière écriture (diagnostics)."""
+        return {
+            "buffered": len(self._buffer),
+            "rows_written": self.rows_written,
+            "last_flush": self.last_flush,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,191 @@
+"""Historique en mémoire des valeurs relevées (tampon circulaire compact)."""
+
+from array import array
+from datetime import datetime
+import logging
+import math
+
+_LOGGER = logging.getLogger(__name__)
+
+NAN = float("nan")
+STATE_ECS = "ecs"
+
+# Octets par échantillon : horodatage (double) et valeur (float)
+TIMESTAMP_SIZE = array("d").itemsize
+VALUE_SIZE = array("f").itemsize
+
+
+class VivrecoHistory:
+    """Séries temporelles des relevés, une `array('f')` par métrique.
+
+    Tous les tableaux sont préalloués à la capacité et partagent le même index
+    d'écriture : un relevé coûte une écriture par métrique, sans allocation. Les
+    valeurs textuelles (`state`, modes) sont codées en entiers via une table.
+    """
+
+    def __init__(self, capacity: int, max_bytes: int) -> None:
+        """Initialise le tampon."""
+        self.capacity = max(capacity, 2)
+        self.max_bytes = max_bytes
+        self._timestamps = array("d", [NAN]) * self.capacity
+        self._series: dict[str, array] = {}
+        self._index = 0
+        self._size = 0
+        self._codes: dict[str, int] = {}
+        self._labels: list[str] = []
+        self._refused: set[str] = set()
+        self._categorical: set[str] = set()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Mémoire occupée par les tableaux."""
+        return self.capacity * (TIMESTAMP_SIZE + VALUE_SIZE * len(self._series))
+
+    def append(self, now: datetime, sample: dict) -> None:
+        """Ajoute un relevé (clés absentes enregistrées comme NaN)."""
+        index = self._index
+        self._timestamps[index] = now.timestamp()
+
+        for metric, value in sample.items():
+            encoded = self._encode(metric, value)
+            if encoded is None:
+                continue
+            series = self._series.get(metric)
+            if series is None:
+                series = self._add_metric(metric)
+                if series is None:
+                    continue
+            series[index] = encoded
+
+        # Les métriques absentes de ce relevé ne gardent pas l'ancienne valeur
+        for metric, series in self._series.items():
+            if metric not in sample:
+                series[index] = NAN
+
+        self._index = (index + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def _add_metric(self, metric: str) -> array | None:
+        """Alloue une série si le plafond mémoire le permet."""
+        if self.memory_bytes + self.capacity * VALUE_SIZE > self.max_bytes:
+            if metric not in self._refused:
+                self._refused.add(metric)
+                _LOGGER.debug("Plafond mémoire atteint, métrique ignorée : %s", metric)
+            return None
+        series = array("f", [NAN]) * self.capacity
+        self._series[metric] = series
+        return series
+
+    def _encode(self, metric: str, value) -> float | None:
+        """Convertit une valeur relevée en float stockable."""
+        if isinstance(value, bool):
+            return float(value)
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            self._categorical.add(metric)
+            code = self._codes.get(value)
+            if code is None:
+                code = self._codes[value] = len(self._labels)
+                self._labels.append(value)
+            return float(code)
+        return None
+
+    def _positions(self):
+        """Index des échantillons, du plus ancien au plus récent."""
+        start = (self._index - self._size) % self.capacity
+        for offset in range(self._size):
+            yield (start + offset) % self.capacity
+
+    def _positions_reversed(self):
+        """Index des échantillons, du plus récent au plus ancien."""
+        for offset in range(1, self._size + 1):
+            yield (self._index - offset) % self.capacity
+
+    def series(self, metric: str) -> list[tuple[float, float]]:
+        """Série (horodatage, valeur) d'une métrique, dans l'ordre chronologique."""
+        values = self._series.get(metric)
+        if values is None:
+            return []
+        return [
+            (self._timestamps[pos], values[pos])
+            for pos in self._positions()
+            if not math.isnan(values[pos])
+        ]
+
+    def rate_of_change(self, metric: str, window: float) -> float | None:
+        """Variation par heure de la métrique sur la fenêtre (secondes)."""
+        values = self._series.get(metric)
+        if values is None:
+            return None
+
+        latest: tuple[float, float] | None = None
+        oldest: tuple[float, float] | None = None
+        for pos in self._positions_reversed():
+            value = values[pos]
+            if math.isnan(value):
+                continue
+            timestamp = self._timestamps[pos]
+            if latest is None:
+                latest = (timestamp, value)
+            elif latest[0] - timestamp > window:
+                break
+            oldest = (timestamp, value)
+
+        if latest is None or oldest is None or latest[0] <= oldest[0]:
+            return None
+        return (latest[1] - oldest[1]) * 3600 / (latest[0] - oldest[0])
+
+    def ecs_recovery(self) -> tuple[float, float] | None:
+        """Fin (horodatage) et durée (secondes) de la dernière chauffe ECS terminée."""
+        states = self._series.get("state")
+        code = self._codes.get(STATE_ECS)
+        if states is None or code is None:
+            return None
+
+        after: float | None = None
+        end: float | None = None
+        start: float | None = None
+        for pos in self._positions_reversed():
+            in_ecs = states[pos] == code
+            timestamp = self._timestamps[pos]
+            if end is None:
+                # Recherche de la fin de la dernière période (premier relevé hors ECS)
+                if not in_ecs:
+                    after = timestamp
+                elif after is not None:
+                    end, start = after, timestamp
+                continue
+            if not in_ecs:
+                return end, end - start
+            start = timestamp
+        # Début de la période hors du tampon : durée inconnue
+        return None
+
+    def stats(self) -> dict:
+        """Taille et occupation mémoire du tampon."""
+        return {
+            "capacity": self.capacity,
+            "samples": self._size,
+            "metrics": len(self._series),
+            "refused_metrics": sorted(self._refused),
+            "memory_bytes": self.memory_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def export(self) -> dict:
+        """Export complet des séries (diagnostics)."""
+        timestamps = [self._timestamps[pos] for pos in self._positions()]
+        series = {}
+        for metric, values in self._series.items():
+            points = [values[pos] for pos in self._positions()]
+            if metric in self._categorical:
+                series[metric] = [
+                    None if math.isnan(value) else self._labels[int(value)]
+                    for value in points
+                ]
+            else:
+                series[metric] = [
+                    None if math.isnan(value) else round(value, 2) for value in points
+                ]
+        return {"timestamps": timestamps, "series": series}
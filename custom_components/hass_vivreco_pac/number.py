@@ -75,11 +75,7 @@ class VivrecoEcsConsignesNumber(VivrecoBaseEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Send new ECS temperature to API."""
         _LOGGER.debug("Setting %s temperature to %s", self._mode, value)
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values={self._key: value},
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({self._key: value})
 
 
 class VivrecoChauffageConsignesNumber(VivrecoBaseEntity, NumberEntity):
@@ -109,8 +105,4 @@ class VivrecoChauffageConsignesNumber(VivrecoBaseEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Send new chauffage temperature to API."""
         _LOGGER.debug("Setting chauffage %s temperature to %s", self._mode, value)
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values={self._key: value},
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({self._key: value})
@@ -0,0 +1,179 @@
+"""Optimisation de la consigne de chauffage selon les prévisions extérieures."""
+
+from .const import (
+    OPTIMIZER_ENERGY_DECAY,
+    OPTIMIZER_RECOVERY,
+    OPTIMIZER_SIM_STEP,
+    OPTIMIZER_STEP,
+)
+from .thermal import VivrecoThermalModel
+
+# Durée de marche minimale (heures) avant d'estimer la consommation horaire
+MIN_RUNTIME = 1.0
+# Dispersion minimale (°C) de `t_ext` pour estimer l'effet de la température
+# extérieure sur la consommation (rendement de la PAC)
+MIN_SPREAD = 2.0
+# Oscillation tolérée sous la consigne (régulation tout ou rien simulée)
+TOLERANCE = 0.2
+
+
+class VivrecoHeatingOptimizer:
+    """Décide s'il vaut mieux préchauffer maintenant ou attendre.
+
+    La consommation horaire du compresseur est apprise en fonction de la
+    température extérieure (régression linéaire sur les compteurs
+    `energy_meters`) : quand les prévisions annoncent un refroidissement,
+    stocker de la chaleur pendant que la PAC a un meilleur rendement peut
+    coûter moins que chauffer plus tard. Chaque consigne candidate de la plage
+    est appliquée pendant la première heure, puis le bas de la plage ; la
+    température intérieure est simulée sur l'horizon avec le modèle thermique
+    (régulation tout ou rien) et la consigne de la première heure la plus
+    économe est retenue, si la température reste dans la plage après la
+    remontée. Relancé à chaque relevé, le choix suit les prévisions.
+    """
+
+    def __init__(
+        self,
+        model: VivrecoThermalModel,
+        comfort_min: float,
+        comfort_max: float,
+        threshold: float,
+    ) -> None:
+        """Initialise l'optimiseur."""
+        self.model = model
+        self.comfort_min = comfort_min
+        self.comfort_max = comfort_max
+        self.threshold = threshold
+        # Sommes atténuées de la régression consommation ~ t_ext, pondérées
+        # par le temps de marche
+        self._energy = 0.0
+        self._energy_t = 0.0
+        self._runtime = 0.0
+        self._runtime_t = 0.0
+        self._runtime_tt = 0.0
+        self._last: tuple[float, float | None, bool, float | None] | None = None
+
+    @property
+    def kwh_per_hour(self) -> float | None:
+        """Consommation horaire moyenne du compresseur en chauffage."""
+        if self._runtime < MIN_RUNTIME:
+            return None
+        return self._energy / self._runtime
+
+    def power(self, t_ext: float) -> float | None:
+        """Consommation horaire prévue du compresseur à cette température."""
+        mean = self.kwh_per_hour
+        if mean is None:
+            return None
+        mean_t = self._runtime_t / self._runtime
+        variance = self._runtime_tt / self._runtime - mean_t * mean_t
+        if variance < MIN_SPREAD * MIN_SPREAD:
+            return mean
+        slope = (self._energy_t / self._runtime - mean * mean_t) / variance
+        return max(mean + slope * (t_ext - mean_t), 0.0)
+
+    def learn(
+        self,
+        timestamp: float,
+        ch_kwh: float | None,
+        running: bool,
+        t_ext: float | None,
+    ) -> None:
+        """Intègre le compteur de chauffage, l'état du compresseur et `t_ext`."""
+        last, self._last = self._last, (timestamp, ch_kwh, running, t_ext)
+        if last is None or last[1] is None or ch_kwh is None or last[3] is None:
+            return
+
+        delta = ch_kwh - last[1]
+        if delta < 0:
+            # Remise à zéro du compteur : intervalle ignoré
+            return
+        runtime = (timestamp - last[0]) / 3600 if last[2] else 0.0
+        temperature = last[3]
+        decay = OPTIMIZER_ENERGY_DECAY
+        self._energy = self._energy * decay + delta
+        self._energy_t = self._energy_t * decay + delta * temperature
+        self._runtime = self._runtime * decay + runtime
+        self._runtime_t = self._runtime_t * decay + runtime * temperature
+        self._runtime_tt = (
+            self._runtime_tt * decay + runtime * temperature * temperature
+        )
+
+    def simulate(
+        self, t_int: float, forecast: list[float], setpoints: list[float]
+    ) -> tuple[float, float]:
+        """Consommation prévue (kWh) et température minimale après remontée.
+
+        `forecast` donne la température extérieure et `setpoints` la consigne
+        heure par heure.
+        """
+        loss, gain, offset = self.model.theta
+        step = OPTIMIZER_SIM_STEP / 3600
+        steps_per_hour = round(1 / step)
+        temperature = t_int
+        energy = 0.0
+        lowest = float("inf")
+
+        for hour, (t_ext, setpoint) in enumerate(zip(forecast, setpoints, strict=True)):
+            power = self.power(t_ext) or 0.0
+            for index in range(steps_per_hour):
+                running = temperature < setpoint
+                energy += step * power if running else 0.0
+                temperature += step * (
+                    loss * (t_ext - temperature) + gain * running + offset
+                )
+                if hour + index * step >= OPTIMIZER_RECOVERY:
+                    lowest = min(lowest, temperature)
+        return energy, lowest
+
+    def optimize(self, t_int: float, forecast: list[float], current: float) -> dict:
+        """Compare la consigne actuelle à la meilleure consigne de préchauffage."""
+        if not forecast or self.kwh_per_hour is None or not self.model.ready:
+            return {}
+
+        hours = len(forecast)
+        current_energy, _ = self.simulate(t_int, forecast, [current] * hours)
+        best, best_energy = None, float("inf")
+        candidate = self.comfort_min
+        while candidate <= self.comfort_max:
+            energy, lowest = self.simulate(
+                t_int, forecast, [candidate] + [self.comfort_min] * (hours - 1)
+            )
+            if lowest >= self.comfort_min - TOLERANCE and energy < best_energy:
+                best, best_energy = candidate, energy
+            candidate = round(candidate + OPTIMIZER_STEP, 1)
+        if best is None:
+            # Plage intenable sur l'horizon : le haut de la plage
+            best = self.comfort_max
+            best_energy, _ = self.simulate(t_int, forecast, [best] * hours)
+
+        saving = current_energy - best_energy
+        return {
+            "setpoint": best,
+            "preheat": best > self.comfort_min,
+            "energy": round(best_energy, 2),
+            "current_energy": round(current_energy, 2),
+            "saving": round(saving, 2),
+            "apply": best != current and abs(saving) >= self.threshold,
+        }
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "energy": self._energy,
+            "energy_t": self._energy_t,
+            "runtime": self._runtime,
+            "runtime_t": self._runtime_t,
+            "runtime_tt": self._runtime_tt,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        if "runtime_tt" not in data:
+            # Moyenne seule (ancienne version) : apprentissage repris
+            return
+        self._energy = float(data.get("energy", 0.0))
+        self._energy_t = float(data.get("energy_t", 0.0))
+        self._runtime = float(data.get("runtime", 0.0))
+        self._runtime_t = float(data.get("runtime_t", 0.0))
+        self._runtime_tt = float(data.get("runtime_tt", 0.0))
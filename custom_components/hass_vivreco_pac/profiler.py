@@ -0,0 +1,246 @@
+"""Mesure du coût de l'intégration : sonde permanente et profilage à la demande."""
+
+import asyncio
+from contextlib import contextmanager
+from pathlib import Path
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PROBE_ALPHA,
+    PROBE_LOOP_INTERVAL,
+    PROFILE_DIRECTORY,
+    PROFILE_KEEP,
+    PROFILE_TOP,
+)
+
+
+class VivrecoProbe:
+    """Durées par rafraîchissement (API, traitement, rappels des entités).
+
+    Chaque phase garde sa dernière durée, une moyenne exponentielle et son
+    maximum ; le retard de la boucle d'événements est mesuré en parallèle par
+    un réveil périodique.
+    """
+
+    def __init__(self) -> None:
+        """Initialise la sonde."""
+        self.last: dict[str, float] = {}
+        self.average: dict[str, float] = {}
+        self.maximum: dict[str, float] = {}
+        self.loop_lag: float | None = None
+        self.loop_lag_max = 0.0
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Enregistre la durée d'une phase."""
+        self.last[phase] = seconds
+        previous = self.average.get(phase)
+        self.average[phase] = (
+            seconds
+            if previous is None
+            else previous + PROBE_ALPHA * (seconds - previous)
+        )
+        self.maximum[phase] = max(self.maximum.get(phase, 0.0), seconds)
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Mesure la durée du bloc."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started)
+
+    async def async_watch_loop(self) -> None:
+        """Mesure en continu le retard de réveil de la boucle d'événements."""
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(PROBE_LOOP_INTERVAL)
+            self.loop_lag = max(time.monotonic() - started - PROBE_LOOP_INTERVAL, 0.0)
+            self.loop_lag_max = max(self.loop_lag_max, self.loop_lag)
+
+    @property
+    def stats(self) -> dict:
+        """Durées en millisecondes (diagnostics, capteur)."""
+
+        def _ms(values: dict) -> dict:
+            return {phase: round(value * 1000, 2) for phase, value in values.items()}
+
+        return {
+            "last": _ms(self.last),
+            "average": _ms(self.average),
+            "max": _ms(self.maximum),
+            "loop_lag": round(self.loop_lag * 1000, 2)
+            if self.loop_lag is not None
+            else None,
+            "loop_lag_max": round(self.loop_lag_max * 1000, 2),
+        }
+
+
+class VivrecoRequestTimer:
+    """Durées des requêtes HTTP par phase, relevées par les traces aiohttp.
+
+    Phases : `dns`, `connect` (TCP et TLS, qu'aiohttp ne distingue pas),
+    `wait` (envoi jusqu'aux en-têtes de la réponse) et `transfer` (lecture du
+    corps) ; `dns` et `connect` sont absents quand la connexion est réutilisée.
+    """
+
+    def __init__(self) -> None:
+        """Initialise le relevé et ses points de trace."""
+        self.last: dict[str, float] = {}
+        self.average: dict[str, float] = {}
+        self.requests = 0
+        self.reused = 0
+        self.bytes = 0
+        self.encodings: dict[str, int] = {}
+
+        self.trace_config = aiohttp.TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_dns_resolvehost_start.append(self._on_dns_start)
+        self.trace_config.on_dns_resolvehost_end.append(self._on_dns_end)
+        self.trace_config.on_connection_create_start.append(self._on_connect_start)
+        self.trace_config.on_connection_create_end.append(self._on_connect_end)
+        self.trace_config.on_connection_reuseconn.append(self._on_reuse)
+        self.trace_config.on_request_end.append(self._on_request_end)
+        self.trace_config.on_response_chunk_received.append(self._on_body)
+
+    def _record(self, phase: str, seconds: float) -> None:
+        """Enregistre la durée d'une phase."""
+        self.last[phase] = seconds
+        previous = self.average.get(phase)
+        self.average[phase] = (
+            seconds
+            if previous is None
+            else previous + PROBE_ALPHA * (seconds - previous)
+        )
+
+    async def _on_request_start(self, session, context: SimpleNamespace, params):
+        """Début de la requête."""
+        context.started = context.sent = time.perf_counter()
+
+    async def _on_dns_start(self, session, context: SimpleNamespace, params):
+        """Début de la résolution DNS."""
+        context.dns = time.perf_counter()
+
+    async def _on_dns_end(self, session, context: SimpleNamespace, params):
+        """Fin de la résolution DNS."""
+        context.dns_seconds = time.perf_counter() - context.dns
+        self._record("dns", context.dns_seconds)
+
+    async def _on_connect_start(self, session, context: SimpleNamespace, params):
+        """Ouverture d'une nouvelle connexion."""
+        context.connect = time.perf_counter()
+
+    async def _on_connect_end(self, session, context: SimpleNamespace, params):
+        """Connexion établie (TCP et TLS)."""
+        # La création de la connexion inclut la résolution DNS, comptée à part
+        context.sent = time.perf_counter()
+        dns = getattr(context, "dns_seconds", 0.0)
+        self._record("connect", max(context.sent - context.connect - dns, 0.0))
+
+    async def _on_reuse(self, session, context: SimpleNamespace, params):
+        """Connexion existante réutilisée."""
+        context.sent = time.perf_counter()
+        self.reused += 1
+
+    async def _on_request_end(self, session, context: SimpleNamespace, params):
+        """En-têtes de la réponse reçus."""
+        context.headers = time.perf_counter()
+        self._record("wait", context.headers - context.sent)
+        self.requests += 1
+        encoding = params.response.headers.get(
+            aiohttp.hdrs.CONTENT_ENCODING, "identity"
+        )
+        self.encodings[encoding] = self.encodings.get(encoding, 0) + 1
+
+    async def _on_body(self, session, context: SimpleNamespace, params):
+        """Corps de la réponse lu."""
+        if hasattr(context, "headers"):
+            now = time.perf_counter()
+            self._record("transfer", now - context.headers)
+            self._record("total", now - context.started)
+        self.bytes += len(params.chunk)
+
+    @property
+    def stats(self) -> dict:
+        """Durées en millisecondes et réutilisation des connexions."""
+        return {
+            "last": {
+                phase: round(value * 1000, 2) for phase, value in self.last.items()
+            },
+            "average": {
+                phase: round(value * 1000, 2) for phase, value in self.average.items()
+            },
+            "requests": self.requests,
+            "reused_connections": self.reused,
+            "bytes": self.bytes,
+            "encodings": self.encodings,
+        }
+
+
+async def async_profile(hass: HomeAssistant, coordinator, cycles: int) -> dict:
+    """Profile `cycles` rafraîchissements complets (API, traitement, entités).
+
+    Le profil brut (`.prof`, lisible avec pstats ou snakeviz) et un résumé
+    texte sont écrits dans `vivreco_profiles/` ; seuls les `PROFILE_KEEP`
+    derniers profils sont conservés.
+    """
+    # Profileur importé à la demande : inutile au démarrage
+    import cProfile  # noqa: PLC0415
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        for _ in range(cycles):
+            await coordinator.async_refresh()
+    finally:
+        profiler.disable()
+    elapsed = time.perf_counter() - started
+
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    path = Path(hass.config.path(PROFILE_DIRECTORY, f"vivreco_profile_{stamp}.prof"))
+    summary = await hass.async_add_executor_job(_write_report, profiler, path)
+    return {
+        "cycles": cycles,
+        "seconds": round(elapsed, 3),
+        "profile": str(path),
+        "report": str(path.with_suffix(".txt")),
+        "top": summary,
+    }
+
+
+def _write_report(profiler, path: Path) -> list[str]:
+    """Écrit le profil brut et le résumé trié par temps cumulé (exécuteur)."""
+    import io  # noqa: PLC0415
+    import pstats  # noqa: PLC0415
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(path)
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+    stats.print_stats(PROFILE_TOP)
+    path.with_suffix(".txt").write_text(stream.getvalue(), encoding="utf-8")
+    _prune(path.parent)
+
+    return [
+        f"{func[0]}:{func[1]}({func[2]}) {cumulative:.4f}s"
+        for func, (_, _, _, cumulative, _) in sorted(
+            stats.stats.items(), key=lambda item: item[1][3], reverse=True
+        )[:PROFILE_TOP]
+    ]
+
+
+def _prune(directory: Path) -> None:
+    """Supprime les profils au-delà des `PROFILE_KEEP` plus récents (exécuteur)."""
+    profiles = sorted(
+        directory.glob("vivreco_profile_*.prof"), key=lambda path: path.stat().st_mtime
+    )
+    for path in profiles[:-PROFILE_KEEP]:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".txt").unlink(missing_ok=True)
@@ -33,6 +33,13 @@ async def async_setup_entry(
     if config.get("ecs", False):
         selects.append(VivrecoModeEcsSelect(coordinator))
 
+    # Paramètres découverts, désactivés par défaut
+    selects.extend(
+        VivrecoDiscoveredSelect(coordinator, key, schema)
+        for key, schema in coordinator.discovery.settings.items()
+        if schema["type"] == "select"
+    )
+
     async_add_entities(selects)
 
 
@@ -76,10 +83,7 @@ class VivrecoModeZoneSelect(VivrecoBaseEntity, SelectEntity):
             _LOGGER.warning("Option invalide: %s", option)
             return
 
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"mode_zone_p/ambiance": option}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"mode_zone_p/ambiance": option})
 
 
 class VivrecoModeEcsSelect(VivrecoBaseEntity, SelectEntity):
@@ -114,7 +118,29 @@ class VivrecoModeEcsSelect(VivrecoBaseEntity, SelectEntity):
             _LOGGER.warning("Option ECS invalide: %s", option)
             return
 
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"mode_ecs/ambiance_ecs": option}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"mode_ecs/ambiance_ecs": option})
+
+
+class VivrecoDiscoveredSelect(VivrecoBaseEntity, SelectEntity):
+    """Paramètre à choix sans entité dédiée (désactivé par défaut)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_registry_enabled_default = False
+    _attr_entity_category = EntityCategory.CONFIG
+
+    def __init__(self, coordinator, key, schema) -> None:
+        """Init à partir du schéma découvert."""
+        super().__init__(coordinator)
+        self._key = key
+        self._attr_name = schema["name"]
+        self._attr_unique_id = f"{DOMAIN}_discovered_{key}"
+        self._attr_options = list(schema["options"])
+
+    @property
+    def current_option(self):
+        """Valeur actuelle."""
+        return self.coordinator.data.get("settings", {}).get(self._key)
+
+    async def async_select_option(self, option: str):
+        """Envoie la nouvelle valeur à l'API."""
+        await self.coordinator.async_set_settings({self._key: option})
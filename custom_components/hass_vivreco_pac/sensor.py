@@ -8,9 +8,17 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfTemperature
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import EntityCategory
 
+from .anomaly import ANOMALY_METRICS
 from .const import DOMAIN, SENSORS
 from .entity import VivrecoBaseEntity
 
@@ -47,6 +55,12 @@ async def async_setup_entry(
         sensors.append(
             VivrecoTemperatureSensor(coordinator, key, SensorDeviceClass.TEMPERATURE)
         )
+        sensors.extend(
+            [
+                VivrecoTrendSensor(coordinator, key, "slope"),
+                VivrecoTrendSensor(coordinator, key, "forecast"),
+            ]
+        )
 
     if config.get("ch", True):
         sensors.append(
@@ -75,6 +89,130 @@ async def async_setup_entry(
         )
     )
 
+    currency = hass.config.currency
+    sensors.extend(
+        [
+            VivrecoAnalyticsSensor(
+                coordinator,
+                "energy_last_hour",
+                UnitOfEnergy.KILO_WATT_HOUR,
+                None,
+                SensorStateClass.MEASUREMENT,
+            ),
+            VivrecoAnalyticsSensor(
+                coordinator,
+                "energy_today",
+                UnitOfEnergy.KILO_WATT_HOUR,
+                SensorDeviceClass.ENERGY,
+                SensorStateClass.TOTAL_INCREASING,
+                attributes=("energy_today_by_type", "history"),
+            ),
+            VivrecoAnalyticsSensor(
+                coordinator,
+                "cost_last_hour",
+                currency,
+                None,
+                SensorStateClass.MEASUREMENT,
+            ),
+            VivrecoAnalyticsSensor(
+                coordinator,
+                "cost_today",
+                currency,
+                SensorDeviceClass.MONETARY,
+                SensorStateClass.TOTAL,
+                attributes=("offpeak",),
+            ),
+            VivrecoAnalyticsSensor(
+                coordinator,
+                "cop_estimated",
+                None,
+                None,
+                SensorStateClass.MEASUREMENT,
+                attributes=("cop_today",),
+            ),
+        ]
+    )
+
+    if "comp_one" in coordinator.data["values"]:
+        sensors.extend(
+            [
+                VivrecoCompressorStatSensor(
+                    coordinator,
+                    "runtime_today",
+                    UnitOfTime.MINUTES,
+                    SensorDeviceClass.DURATION,
+                    SensorStateClass.TOTAL_INCREASING,
+                ),
+                VivrecoCompressorStatSensor(
+                    coordinator,
+                    "starts_today",
+                    None,
+                    None,
+                    SensorStateClass.TOTAL_INCREASING,
+                ),
+                VivrecoCompressorStatSensor(
+                    coordinator,
+                    "starts_last_hour",
+                    None,
+                    None,
+                    SensorStateClass.MEASUREMENT,
+                ),
+                VivrecoCompressorStatSensor(
+                    coordinator,
+                    "cycle_average",
+                    UnitOfTime.MINUTES,
+                    SensorDeviceClass.DURATION,
+                    SensorStateClass.MEASUREMENT,
+                ),
+                VivrecoCompressorStatSensor(
+                    coordinator,
+                    "defrosts_today",
+                    None,
+                    None,
+                    SensorStateClass.TOTAL_INCREASING,
+                ),
+            ]
+        )
+
+    if config.get("ecs", False) and coordinator.ecs_scheduler is not None:
+        sensors.append(VivrecoEcsDemandSensor(coordinator))
+
+    if config.get("ch", False) and coordinator.comfort_scheduler is not None:
+        sensors.append(VivrecoComfortPreheatSensor(coordinator))
+
+    if config.get("ch", False) and coordinator.optimizer is not None:
+        sensors.append(VivrecoHeatingCurveSensor(coordinator))
+
+    if config.get("ecs", False):
+        sensors.append(
+            VivrecoHistorySensor(
+                coordinator,
+                "ecs_recovery_time",
+                UnitOfTime.MINUTES,
+                SensorDeviceClass.DURATION,
+            )
+        )
+
+    sensors.extend(
+        VivrecoAnomalySensor(coordinator, metric)
+        for metric in ANOMALY_METRICS
+        if metric != "ecs_recovery" or config.get("ecs", False)
+    )
+
+    sensors.append(VivrecoCommandLatencySensor(coordinator))
+    sensors.append(VivrecoHistoryMemorySensor(coordinator))
+
+    # Relevés et paramètres découverts en lecture seule, désactivés par défaut
+    sensors.extend(
+        VivrecoDiscoveredSensor(coordinator, section, key, schema)
+        for section, schemas in (
+            ("values", coordinator.discovery.values),
+            ("settings", coordinator.discovery.settings),
+        )
+        for key, schema in schemas.items()
+        if schema["type"] in ("numeric", "text")
+    )
+
     async_add_entities(sensors)
 
 
@@ -97,11 +235,6 @@ class VivrecoSensor(VivrecoBaseEntity, SensorEntity):
         """Valeur native."""
         return self.coordinator.data["values"].get(self._sensor_key)
 
-    @property
-    def unique_id(self):
-        """Retourne l'identifiant unique du capteur."""
-        return f"vivreco_{self._sensor_key}"
-
     @property
     def device_class(self):
         """Retourne la classe du capteur (température ici)."""
@@ -111,6 +244,8 @@ class VivrecoSensor(VivrecoBaseEntity, SensorEntity):
 class VivrecoTemperatureSensor(VivrecoSensor):
     """Représentation d'un capteur de température Vivreco."""
 
+    _throttle_family = "temperature"
+
     @property
     def native_unit_of_measurement(self):
         """Retourne l'unité de mesure (°C pour les températures)."""
@@ -125,6 +260,8 @@ class VivrecoTemperatureSensor(VivrecoSensor):
 class VivrecoStateSensor(VivrecoBaseEntity, SensorEntity):
     """Représentation du capteur d'état de la pompe à chaleur."""
 
+    _throttle_family = "state"
+
     def __init__(self, coordinator, sensor_key) -> None:
         """Initialisation du capteur d'état."""
 
@@ -144,15 +281,12 @@ class VivrecoStateSensor(VivrecoBaseEntity, SensorEntity):
         """Retourne l'état actuel de la pompe à chaleur."""
         return self.coordinator.data["values"].get(self._sensor_key)
 
-    @property
-    def unique_id(self):
-        """Retourne l'identifiant unique du capteur."""
-        return f"vivreco_{self._sensor_key}"
-
 
 class VivrecoConsumptionSensor(VivrecoSensor):
     """Représentation d'un capteur de consommation quotidienne Vivreco."""
 
+    _throttle_family = "energy"
+
     def __init__(self, coordinator, sensor_key, energy_type, device_class=None) -> None:
         """Initialisation du capteur avec un nom et un type d'énergie spécifique."""
 
@@ -170,18 +304,329 @@ class VivrecoConsumptionSensor(VivrecoSensor):
         """Type compteur cumulatif."""
         return SensorStateClass.TOTAL_INCREASING
 
-    def get_consumption(self):
-        """Retourne la consommation pour un type d'énergie donné (ch, ecs, raf, other)."""
-        ch_consumption = None
+    @property
+    def native_value(self):
+        """Consommation cumulée (kWh) du type d'énergie (ch, ecs, raf, other)."""
+        return self.coordinator.data.get("energy", {}).get(self.energy_type)
+
+    @property
+    def available(self) -> bool:
+        """Indisponible tant que l'API ne fournit pas ce compteur."""
+        return super().available and self.native_value is not None
+
+
+class VivrecoAnalyticsSensor(VivrecoBaseEntity, SensorEntity):
+    """Capteur dérivé des agrégats de consommation (énergie, coût, COP)."""
+
+    # L'historique des journées grossit chaque jour : hors de l'enregistreur
+    _unrecorded_attributes = frozenset({"history"})
+
+    def __init__(
+        self,
+        coordinator,
+        sensor_key,
+        unit,
+        device_class,
+        state_class,
+        attributes: tuple[str, ...] = (),
+    ) -> None:
+        """Initialisation du capteur d'analyse."""
+
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._extra_keys = attributes
+        self._attr_has_entity_name = True
+        self._attr_translation_key = sensor_key
+        self._attr_unique_id = f"vivreco_{sensor_key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        """Valeur calculée par le moteur d'analyse."""
+        return self.coordinator.data.get("analytics", {}).get(self._sensor_key)
+
+    @property
+    def extra_state_attributes(self):
+        """Détails complémentaires (répartition, historique, heures creuses)."""
+        analytics = self.coordinator.data.get("analytics", {})
+        return {key: analytics.get(key) for key in self._extra_keys}
+
+    @property
+    def last_reset(self):
+        """Début de la journée pour les cumuls remis à zéro à minuit."""
+        if self._attr_state_class is SensorStateClass.TOTAL:
+            return self.coordinator.data.get("analytics", {}).get("day_start")
+        return None
+
+
+class VivrecoCompressorStatSensor(VivrecoBaseEntity, SensorEntity):
+    """Capteur dérivé des cycles du compresseur (temps de marche, démarrages...)."""
+
+    _attr_icon = "mdi:engine-outline"
+
+    def __init__(
+        self, coordinator, sensor_key, unit, device_class, state_class
+    ) -> None:
+        """Initialisation du capteur de cycles."""
+
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._attr_has_entity_name = True
+        self._attr_translation_key = f"comp_{sensor_key}"
+        self._attr_unique_id = f"vivreco_comp_{sensor_key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self):
+        """Valeur calculée à partir des transitions du compresseur."""
+        return self.coordinator.data.get("compressor", {}).get(self._sensor_key)
+
+
+class VivrecoCommandLatencySensor(VivrecoBaseEntity, SensorEntity):
+    """Délai constaté entre l'envoi d'une commande et son application par la PAC."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "command_latency"
+    _attr_unique_id = "vivreco_command_latency"
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def native_value(self):
+        """Délai d'application de la dernière commande confirmée."""
+        return self.coordinator.command_tracker.last_latency
+
+    @property
+    def extra_state_attributes(self):
+        """Statistiques de confirmation des commandes."""
+        tracker = self.coordinator.command_tracker
+        return {
+            "average": tracker.average_latency,
+            "confirmed": tracker.confirmed,
+            "not_applied": tracker.not_applied,
+        }
+
+
+class VivrecoEcsDemandSensor(VivrecoBaseEntity, SensorEntity):
+    """Demande d'eau chaude prévue par le planificateur ECS."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "ecs_demand"
+    _attr_unique_id = "vivreco_ecs_demand"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:water-thermometer"
+
+    @property
+    def native_value(self):
+        """Score de demande sur l'horizon de prévision."""
+        return self.coordinator.data.get("ecs_schedule", {}).get("demand")
+
+    @property
+    def extra_state_attributes(self):
+        """Paramètres ECS planifiés et reprise en main manuelle."""
+        schedule = self.coordinator.data.get("ecs_schedule", {})
+        return {
+            "planned": schedule.get("planned"),
+            "overridden": schedule.get("overridden"),
+        }
+
+
+class VivrecoComfortPreheatSensor(VivrecoBaseEntity, SensorEntity):
+    """Durée de montée en confort prévue par le modèle thermique."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "comfort_preheat"
+    _attr_unique_id = "vivreco_comfort_preheat"
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Durée prévue pour atteindre la consigne confort."""
+        return self.coordinator.data.get("comfort", {}).get("preheat")
+
+    @property
+    def extra_state_attributes(self):
+        """Prochain début de plage confort, mode planifié et modèle appris."""
+        comfort = self.coordinator.data.get("comfort", {})
+        return {
+            "next_start": comfort.get("next_start"),
+            "planned": comfort.get("planned"),
+            "overridden": comfort.get("overridden"),
+            "model": comfort.get("model"),
+        }
+
+
+class VivrecoHeatingCurveSensor(VivrecoBaseEntity, SensorEntity):
+    """Consigne de chauffage recommandée par l'optimiseur."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "heating_curve_setpoint"
+    _attr_unique_id = "vivreco_heating_curve_setpoint"
+    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Consigne optimale pour le mode d'ambiance actif."""
+        return self.coordinator.data.get("heating_curve", {}).get("setpoint")
+
+    @property
+    def extra_state_attributes(self):
+        """Consommations prévues, économie et mode de l'optimiseur."""
+        curve = self.coordinator.data.get("heating_curve", {})
+        return {
+            key: curve.get(key)
+            for key in (
+                "preset",
+                "mode",
+                "preheat",
+                "energy",
+                "current_energy",
+                "saving",
+                "kwh_per_hour",
+                "forecast",
+            )
+        }
+
+
+class VivrecoAnomalySensor(VivrecoBaseEntity, SensorEntity):
+    """Score d'anomalie (z-score) d'une métrique de santé de la PAC."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:heart-pulse"
+
+    def __init__(self, coordinator, metric) -> None:
+        """Initialisation du capteur d'anomalie."""
+
+        super().__init__(coordinator)
+        self._metric = metric
+        self._attr_translation_key = f"anomaly_{metric}"
+        self._attr_unique_id = f"vivreco_anomaly_{metric}"
+
+    @property
+    def native_value(self):
+        """Écart réduit de la dernière valeur."""
+        return (
+            self.coordinator.data.get("anomalies", {})
+            .get(self._metric, {})
+            .get("score")
+        )
+
+    @property
+    def extra_state_attributes(self):
+        """Dernière valeur, moyenne et état de l'anomalie."""
+        details = self.coordinator.data.get("anomalies", {}).get(self._metric, {})
+        return {
+            "value": details.get("value"),
+            "mean": details.get("mean"),
+            "anomaly": self._metric in self.coordinator.anomalies.active,
+        }
+
+
+class VivrecoHistorySensor(VivrecoBaseEntity, SensorEntity):
+    """Capteur calculé à partir de l'historique en mémoire."""
 
-        for item in self.coordinator.data["energy"]:
-            if item["name"] == self.energy_type:
-                ch_consumption = item["y"]
-                break
+    def __init__(self, coordinator, sensor_key, unit, device_class) -> None:
+        """Initialisation du capteur d'historique."""
 
-        return ch_consumption if ch_consumption is not None else "N/A"
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._attr_has_entity_name = True
+        self._attr_translation_key = sensor_key
+        self._attr_unique_id = f"vivreco_{sensor_key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = SensorStateClass.MEASUREMENT
 
     @property
-    def state(self):
-        """Retourne la consommation quotidienne en kWh pour le chauffage (ch)."""
-        return self.get_consumption()
+    def native_value(self):
+        """Valeur calculée sur l'historique."""
+        return self.coordinator.data.get("history", {}).get(self._sensor_key)
+
+
+class VivrecoHistoryMemorySensor(VivrecoBaseEntity, SensorEntity):
+    """Mémoire occupée par l'historique en mémoire des relevés."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "history_memory"
+    _attr_unique_id = "vivreco_history_memory"
+    _attr_native_unit_of_measurement = UnitOfInformation.KILOBYTES
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def native_value(self):
+        """Mémoire occupée (ko)."""
+        return round(self.coordinator.history.memory_bytes / 1024, 1)
+
+    @property
+    def extra_state_attributes(self):
+        """Capacité, plafond et nombre de métriques suivies."""
+        return self.coordinator.history.stats()
+
+
+class VivrecoTrendSensor(VivrecoBaseEntity, SensorEntity):
+    """Pente lissée ou prévision à court terme d'une température."""
+
+    def __init__(self, coordinator, sensor_key, kind) -> None:
+        """Initialisation du capteur de tendance."""
+
+        super().__init__(coordinator)
+        self._sensor_key = sensor_key
+        self._kind = kind
+        self._attr_has_entity_name = True
+        self._attr_translation_key = f"{sensor_key}_{kind}"
+        self._attr_unique_id = f"vivreco_{sensor_key}_{kind}"
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        if kind == "forecast":
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        else:
+            self._attr_native_unit_of_measurement = "°C/h"
+            self._attr_icon = "mdi:chart-line-variant"
+
+    @property
+    def native_value(self):
+        """Valeur de la tendance."""
+        trend = self.coordinator.data.get("trends", {}).get(self._sensor_key, {})
+        return trend.get(self._kind)
+
+
+class VivrecoDiscoveredSensor(VivrecoBaseEntity, SensorEntity):
+    """Relevé ou paramètre sans entité dédiée (désactivé par défaut)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_registry_enabled_default = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, section, key, schema) -> None:
+        """Initialisation à partir du schéma découvert (`values` ou `settings`)."""
+
+        super().__init__(coordinator)
+        self._section = section
+        self._key = key
+        self._attr_name = schema["name"]
+        self._attr_unique_id = f"vivreco_discovered_{key}"
+        if schema.get("temperature"):
+            self._throttle_family = "temperature"
+            self._attr_device_class = SensorDeviceClass.TEMPERATURE
+            self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        if schema["type"] == "numeric":
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        """Valeur relevée."""
+        return self.coordinator.data.get(self._section, {}).get(self._key)
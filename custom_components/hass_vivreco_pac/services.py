@@ -0,0 +1,158 @@
+"""Services de l'intégration Vivreco PAC."""
+
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    CHAUFFAGE_SETPOINTS,
+    CONF_HP_ID,
+    DOMAIN,
+    ECS_SETPOINTS,
+    MODE,
+    MODE_AMBIANCE_ECS,
+    MODE_AMBIANCE_ZONE_PRINCIPALE,
+)
+from .profiler import async_profile
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SET_SETTINGS = "set_settings"
+ATTR_SETTINGS = "settings"
+ATTR_FORCE = "force"
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+
+SET_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HP_ID): cv.string,
+        vol.Required(ATTR_SETTINGS): vol.All(dict, vol.Length(min=1)),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_HP_ID): cv.string,
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=20)
+        ),
+    }
+)
+
+# Validation des paramètres connus de customer_settings
+SETTINGS_VALIDATORS = {
+    **{
+        info["key"]: vol.All(
+            vol.Coerce(float), vol.Range(min=info["min"], max=info["max"])
+        )
+        for info in (*ECS_SETPOINTS.values(), *CHAUFFAGE_SETPOINTS.values())
+    },
+    "mode_zone_p/ambiance": vol.In(MODE_AMBIANCE_ZONE_PRINCIPALE),
+    "mode_ecs/ambiance_ecs": vol.In(MODE_AMBIANCE_ECS),
+    **{key: cv.boolean for key in MODE},
+}
+
+
+def _get_coordinator(hass: HomeAssistant, hp_id: str | None):
+    """Retourne le coordinateur de la PAC visée.
+
+    `hp_id` peut être omis lorsqu'une seule PAC est chargée.
+    """
+    coordinators = {
+        coordinator.api.hp_id: coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if (coordinator := hass.data.get(DOMAIN, {}).get(entry.entry_id))
+    }
+    if not coordinators:
+        raise ServiceValidationError("Aucune PAC Vivreco configurée")
+    if hp_id is None:
+        if len(coordinators) > 1:
+            raise ServiceValidationError(
+                f"Plusieurs PAC configurées, précisez hp_id : {sorted(coordinators)}"
+            )
+        return next(iter(coordinators.values()))
+    if hp_id not in coordinators:
+        raise ServiceValidationError(f"PAC inconnue : {hp_id}")
+    return coordinators[hp_id]
+
+
+def _validate_settings(settings: dict, current: dict) -> dict:
+    """Valide les paramètres demandés et les convertit au type attendu."""
+    validated = {}
+    for key, value in settings.items():
+        validator = SETTINGS_VALIDATORS.get(key)
+        if validator is None:
+            # Paramètre non référencé : il doit exister côté PAC, on garde son type
+            if key not in current:
+                raise ServiceValidationError(f"Paramètre inconnu : {key}")
+            known = current[key]
+            if isinstance(known, bool):
+                validator = cv.boolean
+            elif isinstance(known, (int, float)):
+                validator = vol.Coerce(type(known))
+            else:
+                validator = cv.string
+        try:
+            validated[key] = validator(value)
+        except vol.Invalid as err:
+            raise ServiceValidationError(
+                f"Valeur invalide pour {key} : {value} ({err})"
+            ) from err
+    return validated
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Enregistre les services de l'intégration."""
+
+    async def async_set_settings(call: ServiceCall) -> ServiceResponse:
+        """Envoie plusieurs paramètres en une seule commande."""
+        coordinator = _get_coordinator(hass, call.data.get(CONF_HP_ID))
+        current = coordinator.data.get("settings", {})
+        requested = _validate_settings(call.data[ATTR_SETTINGS], current)
+
+        result = await coordinator.async_set_settings(
+            requested, force=call.data[ATTR_FORCE]
+        )
+        # API injoignable : les valeurs en file ne sont pas encore appliquées
+        skipped = sorted(
+            requested.keys() - result["sent"].keys() - result["queued"].keys()
+        )
+        _LOGGER.debug("set_settings : %s, ignorés %s", result, skipped)
+        return {**result, "skipped": skipped}
+
+    async def async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+        """Profile plusieurs rafraîchissements complets."""
+        coordinator = _get_coordinator(hass, call.data.get(CONF_HP_ID))
+        try:
+            result = await async_profile(hass, coordinator, call.data[ATTR_CYCLES])
+        except ValueError as err:
+            # Un autre profileur est déjà actif dans le processus
+            raise ServiceValidationError(f"Profilage impossible : {err}") from err
+        _LOGGER.info("Profil Vivreco écrit dans %s", result["profile"])
+        return result
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SETTINGS,
+        async_set_settings,
+        schema=SET_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile_refresh,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
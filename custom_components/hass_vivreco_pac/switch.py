@@ -75,15 +75,8 @@ class VivrecoSwitch(VivrecoBaseEntity, SwitchEntity):
             )
             values["mode_zone_p/ambiance"] = current_zone
 
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values=values,
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings(values)
 
     async def async_turn_off(self, **kwargs):
         """Éteint le switch via l’API."""
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={self._key: False}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({self._key: False})
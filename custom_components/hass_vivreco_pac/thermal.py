@@ -0,0 +1,179 @@
+"""Modèle thermique du logement et démarrage au plus juste du mode confort."""
+
+from datetime import datetime, time, timedelta
+import math
+
+from .const import (
+    CHAUFFAGE_SETPOINTS,
+    COMFORT_MARGIN,
+    THERMAL_FORGETTING,
+    THERMAL_MIN_SAMPLES,
+)
+
+# Paramètres initiaux : pertes (1/h), apport du compresseur et apports internes
+# (°C/h), et incertitude initiale de l'estimation
+INITIAL_THETA = (0.05, 1.0, 0.0)
+INITIAL_COVARIANCE = 100.0
+
+
+class VivrecoThermalModel:
+    """Modèle RC du premier ordre identifié par moindres carrés récursifs.
+
+    dT_int/dt = a (T_ext - T_int) + b chauffe + c
+
+    Chaque relevé met à jour les trois paramètres et leur matrice de
+    covariance (3 x 3) en O(1) ; le facteur d'oubli suit l'évolution du
+    logement (isolation, saison) sans conserver l'historique.
+    """
+
+    def __init__(self, max_gap: float) -> None:
+        """Initialise le modèle.
+
+        `max_gap` (secondes) : au-delà, deux relevés ne donnent pas de dérivée
+        (redémarrage, panne réseau...).
+        """
+        self._max_gap = max_gap
+        self.theta = list(INITIAL_THETA)
+        self._covariance = [
+            [INITIAL_COVARIANCE if row == col else 0.0 for col in range(3)]
+            for row in range(3)
+        ]
+        self.samples = 0
+        self._last: tuple[float, float, float, float] | None = None
+
+    def update(
+        self, timestamp: float, t_int: float, t_ext: float, heating: bool
+    ) -> None:
+        """Intègre un relevé ; l'écart avec le précédent donne la dérivée."""
+        last, self._last = self._last, (timestamp, t_int, t_ext, float(heating))
+        if last is None:
+            return
+
+        hours = (timestamp - last[0]) / 3600
+        if hours <= 0 or hours * 3600 > self._max_gap:
+            return
+
+        # Régresseurs de l'intervalle écoulé (état au début de l'intervalle)
+        x = (last[2] - last[1], last[3], 1.0)
+        y = (t_int - last[1]) / hours
+        self._fit(x, y)
+
+    def skip(self) -> None:
+        """Interrompt la série (relevé inexploitable, ex. rafraîchissement)."""
+        self._last = None
+
+    def _fit(self, x: tuple[float, float, float], y: float) -> None:
+        """Pas des moindres carrés récursifs avec oubli exponentiel."""
+        p = self._covariance
+        px = [sum(p[row][col] * x[col] for col in range(3)) for row in range(3)]
+        denominator = THERMAL_FORGETTING + sum(x[i] * px[i] for i in range(3))
+        gain = [value / denominator for value in px]
+        error = y - sum(self.theta[i] * x[i] for i in range(3))
+
+        self.theta = [self.theta[i] + gain[i] * error for i in range(3)]
+        self._covariance = [
+            [
+                (p[row][col] - gain[row] * px[col]) / THERMAL_FORGETTING
+                for col in range(3)
+            ]
+            for row in range(3)
+        ]
+        self.samples += 1
+
+    @property
+    def ready(self) -> bool:
+        """Modèle suffisamment appris et physiquement cohérent."""
+        loss, gain, _ = self.theta
+        return self.samples >= THERMAL_MIN_SAMPLES and loss > 0 and gain > 0
+
+    def time_to_reach(self, t_int: float, t_ext: float, target: float) -> float | None:
+        """Durée (heures) pour atteindre `target` en chauffe continue.
+
+        Retourne 0 si la cible est déjà atteinte et None si elle ne l'est
+        jamais (température d'équilibre trop basse) ou si le modèle n'est pas prêt.
+        """
+        if t_int >= target:
+            return 0.0
+        if not self.ready:
+            return None
+
+        loss, gain, offset = self.theta
+        equilibrium = t_ext + (gain + offset) / loss
+        if equilibrium <= target:
+            return None
+        return math.log((equilibrium - t_int) / (equilibrium - target)) / loss
+
+    def as_dict(self) -> dict:
+        """État sérialisable pour le stockage."""
+        return {
+            "theta": self.theta,
+            "covariance": self._covariance,
+            "samples": self.samples,
+        }
+
+    def load(self, data: dict) -> None:
+        """Restaure l'état depuis le stockage."""
+        theta = data.get("theta", [])
+        covariance = data.get("covariance", [])
+        if len(theta) == 3 and len(covariance) == 3:
+            self.theta = [float(value) for value in theta]
+            self._covariance = [[float(value) for value in row] for row in covariance]
+            self.samples = data.get("samples", 0)
+
+
+class VivrecoComfortScheduler:
+    """Passe la zone principale en confort juste à temps pour la plage confort.
+
+    Avant la plage, le mode réduit est conservé tant que la durée de montée
+    prévue par le modèle (plus une marge) laisse le temps d'atteindre la
+    consigne confort à l'heure de début.
+    """
+
+    # Paramètre piloté et modes que le planificateur peut écrire
+    KEY = "mode_zone_p/ambiance"
+    MODES = ("confort", "reduit")
+
+    def __init__(self, model: VivrecoThermalModel, start: time, end: time) -> None:
+        """Initialise le planificateur."""
+        self.model = model
+        self.start = start
+        self.end = end
+        self.preheat: float | None = None
+        self.next_start: datetime | None = None
+        # Dernier mode planifié et écrit, reprise en main par l'utilisateur
+        self.last_plan: str | None = None
+        self.written: str | None = None
+        self.overridden = False
+
+    def _in_comfort(self, moment: datetime) -> bool:
+        """Indique si l'instant est dans la plage confort."""
+        current = moment.time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        return current >= self.start or current < self.end
+
+    def plan(self, now: datetime, values: dict, settings: dict) -> dict:
+        """Retourne le mode d'ambiance souhaité pour l'instant donné."""
+        next_start = datetime.combine(now.date(), self.start, now.tzinfo)
+        if next_start <= now:
+            next_start += timedelta(days=1)
+        self.next_start = next_start
+
+        t_int, t_ext = values.get("t_int"), values.get("t_ext")
+        target = settings.get(CHAUFFAGE_SETPOINTS["confort"]["key"])
+        self.preheat = (
+            self.model.time_to_reach(float(t_int), float(t_ext), float(target))
+            if None not in (t_int, t_ext, target)
+            else None
+        )
+
+        if self._in_comfort(now):
+            return {"mode_zone_p/ambiance": "confort"}
+        if self.preheat is None:
+            # Durée inconnue : pas d'anticipation, confort à l'heure prévue
+            return {"mode_zone_p/ambiance": "reduit"}
+
+        lead = timedelta(hours=self.preheat) + COMFORT_MARGIN
+        if now + lead >= next_start:
+            return {"mode_zone_p/ambiance": "confort"}
+        return {"mode_zone_p/ambiance": "reduit"}
@@ -0,0 +1,132 @@
+"""Suivi de l'application des commandes envoyées à la PAC Vivreco."""
+
+import asyncio
+from itertools import count
+import logging
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    COMMAND_CONFIRM_FIRST_DELAY,
+    COMMAND_CONFIRM_MAX_DELAY,
+    COMMAND_CONFIRM_TIMEOUT,
+    EVENT_COMMAND_NOT_APPLIED,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VivrecoCommandTracker:
+    """Confirme l'application des commandes en relisant customer_settings.
+
+    Un 201 de l'API signifie seulement que la commande est en file d'attente :
+    après chaque écriture, les paramètres sont relus à intervalles croissants
+    jusqu'à ce que les nouvelles valeurs apparaissent ou que le délai expire.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator) -> None:
+        """Initialise le suivi."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._ids = count(1)
+        # Dernière commande ayant écrit chaque clé
+        self._latest: dict[str, int] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        self.confirmed = 0
+        self.not_applied = 0
+        self.last_latency: float | None = None
+        self._latency_total = 0.0
+
+    @property
+    def average_latency(self) -> float | None:
+        """Délai moyen d'application des commandes (secondes)."""
+        return self._latency_total / self.confirmed if self.confirmed else None
+
+    def confirming(self, key: str) -> bool:
+        """Indique si une écriture de la clé attend encore sa confirmation."""
+        return key in self._latest
+
+    @callback
+    def track(self, values: dict) -> None:
+        """Démarre la confirmation d'une commande envoyée."""
+        command_id = next(self._ids)
+        for key in values:
+            self._latest[key] = command_id
+
+        task = self.hass.async_create_background_task(
+            self._async_confirm(command_id, values, time.monotonic()),
+            f"vivreco_command_{command_id}",
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Annule les confirmations en cours (déchargement)."""
+        for task in self._tasks:
+            task.cancel()
+
+    async def _async_confirm(
+        self, command_id: int, values: dict, sent_at: float
+    ) -> None:
+        """Relit les paramètres avec un intervalle croissant jusqu'à confirmation."""
+        delay = COMMAND_CONFIRM_FIRST_DELAY
+        pending = dict(values)
+
+        while time.monotonic() - sent_at < COMMAND_CONFIRM_TIMEOUT:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, COMMAND_CONFIRM_MAX_DELAY)
+
+            # Les clés réécrites par une commande plus récente ne sont plus suivies
+            pending = {
+                key: value
+                for key, value in pending.items()
+                if self._latest.get(key) == command_id
+            }
+            if not pending:
+                return
+
+            try:
+                if not await self.coordinator.async_refresh_settings(notify=False):
+                    continue
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Relecture des paramètres impossible : %s", err)
+                continue
+
+            settings = self.coordinator.data.get("settings", {})
+            applied = all(settings.get(key) == value for key, value in pending.items())
+            if applied:
+                latency = time.monotonic() - sent_at
+                self.confirmed += 1
+                self.last_latency = round(latency, 1)
+                self._latency_total += latency
+                self._forget(command_id, pending)
+                _LOGGER.debug("Commande %s appliquée en %.1f s", pending, latency)
+
+            self.coordinator.async_update_listeners()
+            if applied:
+                return
+
+        self.not_applied += 1
+        self._forget(command_id, pending)
+        _LOGGER.warning(
+            "Commande non appliquée par la PAC après %s s : %s",
+            COMMAND_CONFIRM_TIMEOUT,
+            pending,
+        )
+        self.hass.bus.async_fire(
+            EVENT_COMMAND_NOT_APPLIED,
+            {
+                "values": pending,
+                "reason": "timeout",
+                "timeout": COMMAND_CONFIRM_TIMEOUT,
+            },
+        )
+
+    def _forget(self, command_id: int, values: dict) -> None:
+        """Retire les clés suivies par cette commande."""
+        for key in values:
+            if self._latest.get(key) == command_id:
+                del self._latest[key]
@@ -0,0 +1,51 @@
+"""Tendance lissée et prévision à court terme des températures relevées."""
+
+from .const import TREND_ALPHA, TREND_BETA, TREND_HORIZON
+
+
+class VivrecoTrend:
+    """Lissage exponentiel double (Holt) à pas de temps irrégulier.
+
+    Chaque relevé met à jour le niveau et la pente en O(1) ; la pente est
+    exprimée en °C par heure et la prévision extrapole le niveau lissé.
+    """
+
+    def __init__(self) -> None:
+        """Initialise la tendance."""
+        self.level: float | None = None
+        self.slope = 0.0
+        self._last_ts: float | None = None
+
+    def update(self, timestamp: float, value: float) -> None:
+        """Intègre une nouvelle mesure."""
+        if self.level is None or self._last_ts is None:
+            self.level = value
+            self._last_ts = timestamp
+            return
+
+        hours = (timestamp - self._last_ts) / 3600
+        if hours <= 0:
+            return
+
+        previous = self.level
+        predicted = previous + self.slope * hours
+        self.level = TREND_ALPHA * value + (1 - TREND_ALPHA) * predicted
+        self.slope = (
+            TREND_BETA * (self.level - previous) / hours + (1 - TREND_BETA) * self.slope
+        )
+        self._last_ts = timestamp
+
+    def forecast(self, minutes: float) -> float | None:
+        """Valeur prévue dans `minutes` minutes."""
+        if self.level is None:
+            return None
+        return self.level + self.slope * minutes / 60
+
+    @property
+    def snapshot(self) -> dict:
+        """Valeurs exposées par les capteurs."""
+        forecast = self.forecast(TREND_HORIZON)
+        return {
+            "slope": round(self.slope, 2) if self.level is not None else None,
+            "forecast": round(forecast, 1) if forecast is not None else None,
+        }
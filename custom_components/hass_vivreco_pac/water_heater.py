@@ -101,24 +101,15 @@ class VivrecoWaterHeater(VivrecoBaseEntity, WaterHeaterEntity):
         key = ECS_SETPOINTS.get(mode, ECS_SETPOINTS["normal"])["key"]
 
         _LOGGER.debug("Changement consigne ECS %s → %.1f °C", mode, temperature)
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={key: temperature}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({key: temperature})
 
     async def async_turn_on(self):
         """Active la production ECS."""
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"auth_p/etat_glob/aut_ecs": True}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"auth_p/etat_glob/aut_ecs": True})
 
     async def async_turn_off(self):
         """Désactive la production ECS."""
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"auth_p/etat_glob/aut_ecs": False}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"auth_p/etat_glob/aut_ecs": False})
 
     async def async_set_operation_mode(self, operation_mode: str) -> None:
         """Change le mode ECS (hg, reduit, normal, auto)."""
@@ -133,23 +124,15 @@ class VivrecoWaterHeater(VivrecoBaseEntity, WaterHeaterEntity):
         )
 
         _LOGGER.debug("Changement mode ECS → %s", operation_mode)
-        await self.coordinator.api.send_command(
-            group="customer_settings",
-            values={key: current_temp, "mode_ecs/ambiance_ecs": operation_mode},
+        await self.coordinator.async_set_settings(
+            {key: current_temp, "mode_ecs/ambiance_ecs": operation_mode}
         )
-        await self.coordinator.async_request_refresh()
         self._update_temp_range(operation_mode)
 
     async def async_turn_on(self) -> None:  # noqa: F811
         """Active l'ECS."""
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"auth_p/etat_glob/aut_ecs": True}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"auth_p/etat_glob/aut_ecs": True})
 
     async def async_turn_off(self) -> None:  # noqa: F811
         """Désactive l'ECS."""
-        await self.coordinator.api.send_command(
-            group="customer_settings", values={"auth_p/etat_glob/aut_ecs": False}
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_settings({"auth_p/etat_glob/aut_ecs": False})
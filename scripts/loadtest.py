@@ -0,0 +1,308 @@
+"""Banc de charge : un parc de PAC simulées géré par un seul Home Assistant.
+
+Pour chaque PAC du simulateur, crée le client API, le coordinateur et les
+entités de ses plateformes dans une instance Home Assistant, puis enchaîne
+des rafraîchissements de tout le parc. Le rapport donne le débit, la latence
+p50 / p99 des rafraîchissements (et de chaque phase mesurée par la sonde du
+coordinateur), le retard de la boucle d'événements, la mémoire par PAC et le
+nombre de requêtes par seconde.
+
+Usage, depuis la racine du dépôt (homeassistant installé) :
+    python -m scripts.loadtest --pumps 100 --cycles 5 --latency 0.05
+
+Sans `--url`, le simulateur tourne dans le même processus (sa charge est
+comptée dans le retard de la boucle) ; lancer `python -m scripts.simulator` à part
+et passer `--url` isole la mesure de l'intégration.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import aiohttp
+
+from custom_components.hass_vivreco_pac import supported_platforms
+from custom_components.hass_vivreco_pac.api import VivrecoApiClient
+from custom_components.hass_vivreco_pac.const import DEFAULT_UPDATE_INTERVAL, DOMAIN
+from custom_components.hass_vivreco_pac.coordinator import VivrecoDataUpdateCoordinator
+from homeassistant import bootstrap, loader
+from homeassistant.config_entries import ConfigEntries
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import EntityPlatform
+from scripts.simulator import VivrecoSimulator
+
+_LOGGER = logging.getLogger("vivreco_loadtest")
+
+# Période d'échantillonnage du retard de la boucle d'événements (secondes)
+LAG_INTERVAL = 0.05
+
+
+def _percentile(samples: list[float], percent: float) -> float | None:
+    """Percentile par rang le plus proche."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Secondes -> millisecondes arrondies."""
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class VivrecoLoadTest:
+    """Parc de coordinateurs et d'entités branchés sur le simulateur."""
+
+    def __init__(self, hass: HomeAssistant, url: str, concurrency: int) -> None:
+        """Initialise le banc."""
+        self.hass = hass
+        self.url = url
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.coordinators: list[VivrecoDataUpdateCoordinator] = []
+        self.entities = 0
+        self.latencies: list[float] = []
+        self.phases: dict[str, list[float]] = {}
+        self.failures = 0
+        self.loop_lag: list[float] = []
+
+    async def async_add_pump(self, hp_id: str) -> None:
+        """Reproduit `async_setup_entry` pour une PAC du simulateur."""
+        async with self._semaphore:
+            api = VivrecoApiClient(
+                username=hp_id, password="simulateur", base_url=self.url
+            )
+            entry = SimpleNamespace(entry_id=hp_id, data={}, options={}, title=hp_id)
+            coordinator = VivrecoDataUpdateCoordinator(
+                self.hass, entry, api, update_interval=DEFAULT_UPDATE_INTERVAL
+            )
+            await coordinator.async_load_state()
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise RuntimeError(f"Premier rafraîchissement en échec : {hp_id}")
+            coordinator.discovery.update(coordinator.data)
+            self.hass.data[DOMAIN][hp_id] = coordinator
+
+            for platform in supported_platforms(coordinator.data.get("config", {})):
+                module = importlib.import_module(
+                    f"custom_components.{DOMAIN}.{platform.value}"
+                )
+                entities: list = []
+                await module.async_setup_entry(self.hass, entry, entities.extend)
+                entity_platform = EntityPlatform(
+                    hass=self.hass,
+                    logger=_LOGGER,
+                    domain=platform.value,
+                    platform_name=DOMAIN,
+                    platform=None,
+                    scan_interval=coordinator.update_interval,
+                    entity_namespace=None,
+                )
+                await entity_platform.async_add_entities(entities)
+                self.entities += len(entities)
+            self.coordinators.append(coordinator)
+
+    async def _async_refresh(self, coordinator: VivrecoDataUpdateCoordinator) -> None:
+        """Rafraîchit une PAC et relève ses durées."""
+        async with self._semaphore:
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            self.latencies.append(time.perf_counter() - started)
+        if not coordinator.last_update_success:
+            self.failures += 1
+        for phase, seconds in coordinator.probe.last.items():
+            self.phases.setdefault(phase, []).append(seconds)
+
+    async def async_run(self, cycles: int) -> float:
+        """Enchaîne les cycles de rafraîchissement du parc ; retourne la durée."""
+        started = time.perf_counter()
+        for _ in range(cycles):
+            await asyncio.gather(
+                *(self._async_refresh(coordinator) for coordinator in self.coordinators)
+            )
+        return time.perf_counter() - started
+
+    async def async_watch_loop(self) -> None:
+        """Échantillonne le retard de réveil de la boucle d'événements."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.loop_lag.append(max(time.perf_counter() - started - LAG_INTERVAL, 0.0))
+
+
+def _request_phases(coordinators: list[VivrecoDataUpdateCoordinator]) -> dict:
+    """Durée moyenne (ms) de chaque phase des requêtes HTTP sur le parc."""
+    samples: dict[str, list[float]] = {}
+    for coordinator in coordinators:
+        for phase, seconds in coordinator.api.timer.average.items():
+            samples.setdefault(phase, []).append(seconds)
+    return {phase: _ms(sum(values) / len(values)) for phase, values in samples.items()}
+
+
+async def _fetch_stats(url: str) -> dict:
+    """Compteurs du simulateur."""
+    root = url.split("/api/", 1)[0]
+    async with aiohttp.ClientSession() as session:  # noqa: SIM117
+        async with session.get(f"{root}/_stats") as response:
+            return await response.json()
+
+
+async def _async_main(args: argparse.Namespace) -> dict:
+    """Déroule le banc et retourne le rapport."""
+    simulator = None
+    url = args.url
+    if url is None:
+        simulator = VivrecoSimulator(args.pumps, args.latency, args.seed)
+        url = await simulator.async_start()
+    hp_ids = [f"hp{index:04d}" for index in range(args.pumps)]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        loader.async_setup(hass)
+        hass.config_entries = ConfigEntries(hass, {})
+        await bootstrap.async_load_base_functionality(hass)
+        await hass.async_start()
+        hass.data.setdefault(DOMAIN, {})
+
+        bench = VivrecoLoadTest(hass, url, args.concurrency)
+        try:
+            # Mise en place du parc : mémoire conservée par PAC
+            tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            setup_started = time.perf_counter()
+            await asyncio.gather(*(bench.async_add_pump(hp_id) for hp_id in hp_ids))
+            setup = time.perf_counter() - setup_started
+            memory = tracemalloc.get_traced_memory()[0] - baseline
+            tracemalloc.stop()
+
+            # Rafraîchissements du parc, hors traçage mémoire
+            before = await _fetch_stats(url)
+            watcher = asyncio.create_task(bench.async_watch_loop())
+            elapsed = await bench.async_run(args.cycles)
+            watcher.cancel()
+            after = await _fetch_stats(url)
+        finally:
+            for coordinator in bench.coordinators:
+                await coordinator.async_shutdown()
+                await coordinator.api.async_close()
+            await hass.async_stop(force=True)
+            if simulator is not None:
+                await simulator.async_stop()
+
+    refreshes = len(bench.latencies)
+    return {
+        "pumps": args.pumps,
+        "cycles": args.cycles,
+        "concurrency": args.concurrency,
+        "latency": args.latency,
+        "entities": bench.entities,
+        "setup_seconds": round(setup, 3),
+        "seconds": round(elapsed, 3),
+        "refreshes": refreshes,
+        "failures": bench.failures,
+        "refreshes_per_second": round(refreshes / elapsed, 2),
+        "requests_per_second": round(
+            (after["requests"] - before["requests"]) / elapsed, 2
+        ),
+        "refresh_ms": {
+            "p50": _ms(_percentile(bench.latencies, 50)),
+            "p99": _ms(_percentile(bench.latencies, 99)),
+            "max": _ms(max(bench.latencies, default=None)),
+        },
+        "phases_ms": {
+            phase: {
+                "p50": _ms(_percentile(samples, 50)),
+                "p99": _ms(_percentile(samples, 99)),
+            }
+            for phase, samples in bench.phases.items()
+        },
+        "requests_ms": _request_phases(bench.coordinators),
+        "connections_reused": sum(
+            coordinator.api.timer.reused for coordinator in bench.coordinators
+        ),
+        "response_kb": round(
+            sum(coordinator.api.timer.bytes for coordinator in bench.coordinators)
+            / 1024,
+            1,
+        ),
+        "loop_lag_ms": {
+            "p50": _ms(_percentile(bench.loop_lag, 50)),
+            "p99": _ms(_percentile(bench.loop_lag, 99)),
+            "max": _ms(max(bench.loop_lag, default=None)),
+        },
+        "memory_per_pump_kb": round(memory / args.pumps / 1024, 1),
+    }
+
+
+def _print_report(report: dict) -> None:
+    """Affiche le rapport lisible."""
+    lines = [
+        (
+            f"PAC : {report['pumps']}, entités : {report['entities']}, "
+            f"mise en place : {report['setup_seconds']} s"
+        ),
+        (
+            f"Rafraîchissements : {report['refreshes']} en {report['seconds']} s "
+            f"({report['failures']} en échec)"
+        ),
+        (
+            f"Débit : {report['refreshes_per_second']} rafraîchissements/s, "
+            f"{report['requests_per_second']} requêtes/s"
+        ),
+        "Latence : p50 {p50} ms, p99 {p99} ms, max {max} ms".format(
+            **report["refresh_ms"]
+        ),
+        *(
+            f"  {phase} : p50 {values['p50']} ms, p99 {values['p99']} ms"
+            for phase, values in report["phases_ms"].items()
+        ),
+        "Requêtes HTTP (moyenne) : "
+        + ", ".join(
+            f"{phase} {value} ms" for phase, value in report["requests_ms"].items()
+        )
+        + (
+            f", {report['connections_reused']} connexions réutilisées, "
+            f"{report['response_kb']} ko reçus (décompressés)"
+        ),
+        "Retard de la boucle : p50 {p50} ms, p99 {p99} ms, max {max} ms".format(
+            **report["loop_lag_ms"]
+        ),
+        f"Mémoire : {report['memory_per_pump_kb']} ko par PAC",
+    ]
+    print("\n".join(lines))  # noqa: T201
+
+
+def main() -> None:
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pumps", type=int, default=10, help="1 à 1000")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument(
+        "--concurrency", type=int, default=100, help="rafraîchissements simultanés"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="latence simulée (secondes)"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", help="simulateur externe (…/api/v1)")
+    parser.add_argument("--json", action="store_true", help="rapport JSON")
+    args = parser.parse_args()
+    if not 1 <= args.pumps <= 1000:
+        parser.error("--pumps doit être compris entre 1 et 1000")
+
+    logging.basicConfig(level=logging.WARNING)
+    report = asyncio.run(_async_main(args))
+    if args.json:
+        print(json.dumps(report, indent=2))  # noqa: T201
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""Simulateur local de l'API Vivreco : un parc de PAC fictives.
+
+Répond aux mêmes chemins que vivrecocontrol.com (connexion, `user/me`,
+tableau de bord, compteurs, paramètres, commandes) pour des PAC dont les
+relevés évoluent à chaque lecture. Le compte `<hp_id>` (mot de passe
+quelconque) donne accès à la PAC du même nom.
+
+Usage autonome :
+    python -m scripts.simulator --pumps 100 --port 8765 --latency 0.05
+puis viser `http://127.0.0.1:8765/api/v1`.
+"""
+
+import argparse
+import asyncio
+import base64
+import contextlib
+import math
+import random
+import time
+
+from aiohttp import web
+
+API_PREFIX = "/api/v1"
+
+STATES = ["bt", "bt", "bt", "ecs", "degi", "arret"]
+
+
+class VivrecoSimulatedPump:
+    """État d'une PAC fictive."""
+
+    def __init__(self, hp_id: str, rng: random.Random) -> None:
+        """Initialise la PAC avec des valeurs plausibles."""
+        self.hp_id = hp_id
+        self._rng = rng
+        self._phase = rng.uniform(0, 2 * math.pi)
+        self.version = 1
+        self.values = {
+            "t_ext": 5.0,
+            "t_int": 19.5,
+            "t_ecs": 48.0,
+            "cons_t_int": 20.0,
+            "cons_t_ecs": 50.0,
+            "comp_one": 1,
+            "state": "bt",
+            "pression_circuit": 1.5,
+            "t_depart": 35.0,
+        }
+        self.labels = {
+            "t_ext": "Température extérieure",
+            "t_int": "Température intérieure",
+            "t_ecs": "Température ECS",
+            "pression_circuit": "Pression circuit",
+            "t_depart": "Température de départ",
+        }
+        self.energy = {"ch": 1200.0, "ecs": 400.0, "raf": 0.0, "other": 50.0}
+        self.settings = {
+            "auth_p/etat_glob/aut_app_elec": False,
+            "auth_p/etat_glob/aut_ch": True,
+            "auth_p/etat_glob/aut_ecs": True,
+            "auth_p/etat_glob/aut_raf": True,
+            "mode_zone_p/ambiance": "auto",
+            "mode_ecs/ambiance_ecs": "auto",
+            "consigne_p/t_confort_ch": 20.0,
+            "consigne_p/t_hg_ch": 8.0,
+            "consigne_p/t_normal_ch": 19.5,
+            "consigne_p/t_reduit_ch": 18.0,
+            "consigne_ecs/t_hg_ecs": 10.0,
+            "consigne_ecs/t_normal_ecs": 50.0,
+            "consigne_ecs/t_reduit_ecs": 40.0,
+            "loi_eau/pente": 1.2,
+        }
+
+    def step(self) -> None:
+        """Fait évoluer les relevés depuis la lecture précédente."""
+        rng = self._rng
+        values = self.values
+        values["t_ext"] = round(
+            5 + 5 * math.sin(time.time() / 13751 + self._phase) + rng.gauss(0, 0.2), 1
+        )
+        running = values["t_int"] < values["cons_t_int"]
+        values["comp_one"] = int(running)
+        values["state"] = rng.choice(STATES) if running else "arret"
+        values["t_int"] = round(
+            values["t_int"] + (0.15 if running else -0.1) + rng.gauss(0, 0.05), 1
+        )
+        values["t_ecs"] = round(min(values["t_ecs"] + rng.uniform(-0.5, 0.6), 55), 1)
+        values["t_depart"] = round(30 + 8 * running + rng.gauss(0, 0.3), 1)
+        self.energy["ch"] += rng.uniform(0.05, 0.15) if running else 0.0
+        self.energy["ecs"] += rng.uniform(0.0, 0.02)
+        self.energy["other"] += 0.001
+
+    def dashboard(self) -> dict:
+        """Réponse du tableau de bord."""
+        self.step()
+        return {"elements": {"values": dict(self.values), "labels": self.labels}}
+
+    def energy_meters(self) -> dict:
+        """Réponse des compteurs d'énergie."""
+        total = [
+            {"name": name, "y": round(value, 3)} for name, value in self.energy.items()
+        ]
+        return {"values": {"values": {"energyValues": {"total": total}}}}
+
+    def customer_settings(self) -> dict:
+        """Réponse des paramètres."""
+        return {"values": {"version": self.version, "values": dict(self.settings)}}
+
+    def command(self, payload: dict) -> bool:
+        """Applique une commande ; False si la version est obsolète."""
+        if payload.get("version") not in (None, self.version):
+            return False
+        self.settings.update(payload.get("values", {}))
+        for key, value in payload.get("values", {}).items():
+            if key == "consigne_p/t_confort_ch":
+                self.values["cons_t_int"] = value
+            elif key == "consigne_ecs/t_normal_ecs":
+                self.values["cons_t_ecs"] = value
+        self.version += 1
+        return True
+
+
+class VivrecoSimulator:
+    """Parc de PAC fictives servi par une application aiohttp."""
+
+    def __init__(self, pumps: int, latency: float = 0.0, seed: int = 0) -> None:
+        """Initialise le parc ; `latency` simule l'aller-retour réseau."""
+        rng = random.Random(seed)
+        self.pumps = {
+            f"hp{index:04d}": VivrecoSimulatedPump(f"hp{index:04d}", rng)
+            for index in range(pumps)
+        }
+        self.latency = latency
+        self.requests = 0
+        self.commands = 0
+        self.conflicts = 0
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.add_routes(
+            [
+                web.post(f"{API_PREFIX}/herja/login", self._login),
+                web.get(f"{API_PREFIX}/herja/user/me", self._user),
+                web.get(f"{API_PREFIX}/charts/{{hp_id}}/dashboard", self._dashboard),
+                web.get(
+                    f"{API_PREFIX}/commands/{{hp_id}}/values/energy_meters",
+                    self._energy,
+                ),
+                web.get(
+                    f"{API_PREFIX}/commands/{{hp_id}}/values/customer_settings",
+                    self._settings,
+                ),
+                web.post(f"{API_PREFIX}/commands/{{hp_id}}/command", self._command),
+                web.get("/_stats", self._stats),
+            ]
+        )
+        self._runner: web.AppRunner | None = None
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Démarre le serveur et retourne l'URL de base de l'API."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    async def async_stop(self) -> None:
+        """Arrête le serveur."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        """Compte les requêtes, simule la latence du réseau et compresse."""
+        if request.path != "/_stats":
+            self.requests += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        response = await handler(request)
+        # Compression négociée selon Accept-Encoding, comme l'API réelle
+        response.enable_compression()
+        return response
+
+    def _pump(self, request: web.Request) -> VivrecoSimulatedPump:
+        """PAC du chemin, accessible uniquement avec son token."""
+        pump = self.pumps.get(request.match_info["hp_id"])
+        if pump is None:
+            raise web.HTTPNotFound
+        if request.headers.get("Authorization") != f"Bearer token-{pump.hp_id}":
+            raise web.HTTPUnauthorized
+        return pump
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Connexion Basic : le nom d'utilisateur est l'identifiant de la PAC."""
+        header = request.headers.get("Authorization", "")
+        try:
+            username = base64.b64decode(header.removeprefix("Basic ")).decode()
+        except ValueError:
+            raise web.HTTPUnauthorized from None
+        hp_id = username.partition(":")[0]
+        if hp_id not in self.pumps:
+            raise web.HTTPUnauthorized
+        return web.json_response({"token": f"token-{hp_id}"})
+
+    async def _user(self, request: web.Request) -> web.Response:
+        """PAC du compte connecté."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        hp_id = token.removeprefix("token-")
+        if hp_id not in self.pumps:
+            raise web.HTTPUnauthorized
+        return web.json_response({"hp_id": [hp_id]})
+
+    async def _dashboard(self, request: web.Request) -> web.Response:
+        """Tableau de bord de la PAC."""
+        return web.json_response(self._pump(request).dashboard())
+
+    async def _energy(self, request: web.Request) -> web.Response:
+        """Compteurs de la PAC."""
+        return web.json_response(self._pump(request).energy_meters())
+
+    async def _settings(self, request: web.Request) -> web.Response:
+        """Paramètres de la PAC."""
+        return web.json_response(self._pump(request).customer_settings())
+
+    async def _command(self, request: web.Request) -> web.Response:
+        """Commande sur les paramètres de la PAC."""
+        pump = self._pump(request)
+        if not pump.command(await request.json()):
+            self.conflicts += 1
+            raise web.HTTPConflict
+        self.commands += 1
+        return web.json_response({"status": "ok"}, status=201)
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        """Compteurs du simulateur (non comptés comme requêtes)."""
+        return web.json_response(
+            {
+                "requests": self.requests,
+                "commands": self.commands,
+                "conflicts": self.conflicts,
+            }
+        )
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Sert le simulateur jusqu'à interruption."""
+    simulator = VivrecoSimulator(args.pumps, args.latency, args.seed)
+    url = await simulator.async_start(args.host, args.port)
+    print(f"{args.pumps} PAC simulées sur {url}")  # noqa: T201
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pumps", type=int, default=10)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="secondes")
+    parser.add_argument("--seed", type=int, default=0)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""Comparaison des latences : accès local avec repli cloud contre cloud seul.
+
+Deux simulateurs servent le même parc : l'un joue l'accès local (latence
+faible), l'autre le cloud (latence du lien internet). Pour chaque client, le
+banc mesure un rafraîchissement (tableau de bord, compteurs, paramètres) et
+une commande, puis coupe l'accès local pour vérifier le repli sur le cloud.
+
+Usage, depuis la racine du dépôt :
+    python -m scripts.transport_benchmark --rounds 50 --cloud-latency 0.15
+"""
+
+import argparse
+import asyncio
+import time
+
+from custom_components.hass_vivreco_pac.api import VivrecoApiClient
+from scripts.simulator import VivrecoSimulator
+
+HP_ID = "hp0000"
+
+
+def _percentile(samples: list[float], percent: float) -> float:
+    """Percentile par rang le plus proche, en millisecondes."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return round(ordered[index] * 1000, 1)
+
+
+async def _measure(client: VivrecoApiClient, rounds: int) -> dict[str, list[float]]:
+    """Durées des rafraîchissements et des commandes."""
+    durations: dict[str, list[float]] = {"refresh": [], "command": []}
+    for index in range(rounds):
+        started = time.perf_counter()
+        await client.get_chart_data()
+        await client.get_energy_data()
+        await client.get_settings_data()
+        durations["refresh"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await client.send_command(
+            "customer_settings", {"consigne_p/t_confort_ch": 20.0 + index % 2 / 2}
+        )
+        durations["command"].append(time.perf_counter() - started)
+    return durations
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Déroule la comparaison et affiche le rapport."""
+    local = VivrecoSimulator(1, args.local_latency)
+    cloud = VivrecoSimulator(1, args.cloud_latency)
+    cloud.pumps = local.pumps
+    local_url = await local.async_start()
+    cloud_url = await cloud.async_start()
+
+    clients = {
+        "cloud": VivrecoApiClient(HP_ID, "simulateur", base_url=cloud_url),
+        "local": VivrecoApiClient(
+            HP_ID, "simulateur", base_url=cloud_url, local_url=local_url
+        ),
+    }
+    try:
+        for name, client in clients.items():
+            await client.login()
+            await client.fetch_hp_id()
+            # Premier rafraîchissement hors mesure : ouverture des connexions
+            await client.get_settings_data()
+            durations = await _measure(client, args.rounds)
+            for operation, samples in durations.items():
+                print(  # noqa: T201
+                    f"{name:6} {operation:8} p50 {_percentile(samples, 50)} ms, "
+                    f"p99 {_percentile(samples, 99)} ms"
+                )
+
+        # Accès local coupé : les lectures doivent passer par le cloud
+        await local.async_stop()
+        client = clients["local"]
+        started = time.perf_counter()
+        data = await client.get_chart_data()
+        elapsed = (time.perf_counter() - started) * 1000
+        print(  # noqa: T201
+            f"Repli sur le cloud : {'réussi' if data else 'ÉCHEC'} en "
+            f"{elapsed:.1f} ms, transports {client.transport_stats}"
+        )
+    finally:
+        for client in clients.values():
+            await client.async_close()
+        await local.async_stop()
+        await cloud.async_stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument(
+        "--local-latency", type=float, default=0.002, help="secondes (accès local)"
+    )
+    parser.add_argument(
+        "--cloud-latency", type=float, default=0.15, help="secondes (cloud)"
+    )
+    asyncio.run(_async_main(parser.parse_args()))
@@ -0,0 +1,166 @@
+"""Fixtures communes : entrée de configuration et réponses de l'API simulées."""
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.hass_vivreco_pac.api import VivrecoVersionConflictError
+from custom_components.hass_vivreco_pac.const import (
+    API_BASE_URL,
+    API_CHART_URL_TEMPLATE,
+    API_ENERGY_URL_TEMPLATE,
+    API_LOGIN_URL,
+    API_SETTINGS_COMMAND,
+    API_SETTINGS_URL_TEMPLATE,
+    API_USER_URL,
+    CONF_HP_ID,
+    DOMAIN,
+)
+from custom_components.hass_vivreco_pac.coordinator import VivrecoDataUpdateCoordinator
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_TOKEN
+
+HP_ID = "hp0001"
+TOKEN = "token-hp0001"
+
+VALUES = {
+    "t_ext": 5.0,
+    "t_int": 19.5,
+    "t_ecs": 48.0,
+    "cons_t_int": 20.0,
+    "cons_t_ecs": 50.0,
+    "comp_one": 1,
+    "state": "bt",
+}
+
+SETTINGS = {
+    "auth_p/etat_glob/aut_app_elec": False,
+    "auth_p/etat_glob/aut_ch": True,
+    "auth_p/etat_glob/aut_ecs": True,
+    "auth_p/etat_glob/aut_raf": False,
+    "mode_zone_p/ambiance": "auto",
+    "mode_ecs/ambiance_ecs": "auto",
+    "consigne_p/t_confort_ch": 20.0,
+    "consigne_p/t_reduit_ch": 18.0,
+    "consigne_ecs/t_normal_ecs": 50.0,
+}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Charge l'intégration depuis custom_components."""
+    return
+
+
+def api_url(path: str) -> str:
+    """URL complète d'un chemin de l'API pour la PAC de test."""
+    return f"{API_BASE_URL}{path.format(hp_id=HP_ID)}"
+
+
+@pytest.fixture
+def config_entry(hass) -> MockConfigEntry:
+    """Entrée de configuration avec PAC et token déjà connus."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Vivreco PAC",
+        data={
+            CONF_EMAIL: "user@example.com",
+            CONF_PASSWORD: "secret",
+            CONF_HP_ID: HP_ID,
+            CONF_TOKEN: TOKEN,
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+def register_api(aioclient_mock, values: dict, settings: dict) -> None:
+    """Réponses de l'API Vivreco pour les relevés et paramètres donnés."""
+    aioclient_mock.post(api_url(API_LOGIN_URL), json={"token": TOKEN})
+    aioclient_mock.get(api_url(API_USER_URL), json={"hp_id": [HP_ID]})
+    aioclient_mock.get(
+        api_url(API_CHART_URL_TEMPLATE),
+        json={"elements": {"values": dict(values), "labels": {}}},
+    )
+    aioclient_mock.get(
+        api_url(API_ENERGY_URL_TEMPLATE),
+        json={
+            "values": {
+                "values": {
+                    "energyValues": {
+                        "total": [
+                            {"name": "ch", "y": 1200.0},
+                            {"name": "ecs", "y": 400.0},
+                        ]
+                    }
+                }
+            }
+        },
+    )
+    aioclient_mock.get(
+        api_url(API_SETTINGS_URL_TEMPLATE),
+        json={"values": {"version": 1, "values": dict(settings)}},
+    )
+    aioclient_mock.post(
+        api_url(API_SETTINGS_COMMAND), status=201, json={"status": "ok"}
+    )
+
+
+@pytest.fixture
+def mock_api(aioclient_mock):
+    """Réponses de l'API Vivreco (connexion, relevés, paramètres, commandes)."""
+    register_api(aioclient_mock, VALUES, SETTINGS)
+    return aioclient_mock
+
+
+class StubApi:
+    """Client API en mémoire : paramètres de la PAC et commandes reçues.
+
+    `errors` et `read_errors` listent les exceptions à lever aux prochains
+    envois et aux prochaines lectures ; une commande acceptée n'est appliquée
+    aux paramètres que si `applies` est vrai.
+    """
+
+    def __init__(self, settings: dict) -> None:
+        """Initialise la PAC simulée."""
+        self.hp_id = HP_ID
+        self.settings = dict(settings)
+        self.version = 1
+        self.applies = True
+        self.sent: list[dict] = []
+        self.errors: list[Exception] = []
+        self.read_errors: list[Exception] = []
+
+    async def send_command(self, group: str, values: dict, retry: bool = True):
+        """Commande : lève l'erreur programmée ou enregistre les valeurs."""
+        if self.errors:
+            error = self.errors.pop(0)
+            if isinstance(error, VivrecoVersionConflictError):
+                self.version += 1
+            raise error
+        self.sent.append(dict(values))
+        if self.applies:
+            self.settings.update(values)
+        return {"status": "ok"}
+
+    async def get_settings_data(self) -> dict:
+        """Paramètres courants et leur version."""
+        if self.read_errors:
+            raise self.read_errors.pop(0)
+        return {"values": {"version": self.version, "values": dict(self.settings)}}
+
+
+@pytest.fixture
+def stub_api() -> StubApi:
+    """PAC simulée en mémoire."""
+    return StubApi(SETTINGS)
+
+
+@pytest.fixture
+async def coordinator(hass, config_entry, stub_api):
+    """Coordinateur sur la PAC simulée, paramètres déjà lus."""
+    coordinator = VivrecoDataUpdateCoordinator(
+        hass, config_entry, stub_api, update_interval=5
+    )
+    await coordinator.async_refresh_settings(notify=False)
+    yield coordinator
+    coordinator.command_tracker.async_cancel()
+    await hass.async_block_till_done()
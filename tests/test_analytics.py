@@ -0,0 +1,48 @@
+"""Tests des agrégats de consommation."""
+
+from datetime import UTC, datetime, time, timedelta
+
+from custom_components.hass_vivreco_pac.analytics import (
+    VivrecoEnergyAnalytics,
+    VivrecoTariff,
+)
+
+TARIFF = VivrecoTariff(
+    peak_price=0.25, offpeak_price=0.20, offpeak_start=time(22), offpeak_end=time(6)
+)
+START = datetime(2026, 1, 15, 10, 0, tzinfo=UTC)
+VALUES = {"t_ext": 5.0, "cons_t_int": 20.0}
+
+
+def test_cost_today_and_last_reset():
+    """Coût du jour au tarif courant, remis à zéro à minuit."""
+    analytics = VivrecoEnergyAnalytics(TARIFF)
+    analytics.update(START, {"ch": 100.0}, VALUES)
+    analytics.update(START + timedelta(minutes=5), {"ch": 102.0}, VALUES)
+
+    snapshot = analytics.snapshot
+    assert snapshot["energy_today"] == 2.0
+    assert snapshot["cost_today"] == 0.5
+    assert snapshot["day_start"] == datetime(2026, 1, 15, tzinfo=UTC)
+
+    analytics.update(datetime(2026, 1, 16, 0, 5, tzinfo=UTC), {"ch": 103.0}, VALUES)
+    snapshot = analytics.snapshot
+    assert snapshot["cost_today"] == 0.2
+    assert snapshot["day_start"] == datetime(2026, 1, 16, tzinfo=UTC)
+    assert snapshot["history"][0]["cost"] == 0.5
+
+
+def test_state_survives_restart():
+    """Le cumul du jour repart de l'état stocké, sans coût négatif."""
+    analytics = VivrecoEnergyAnalytics(TARIFF)
+    analytics.update(START, {"ch": 100.0}, VALUES)
+    analytics.update(START + timedelta(minutes=5), {"ch": 102.0}, VALUES)
+
+    restored = VivrecoEnergyAnalytics(TARIFF)
+    restored.load(analytics.as_dict())
+    restored.update(START + timedelta(minutes=10), {"ch": 103.0}, VALUES)
+
+    snapshot = restored.snapshot
+    assert snapshot["energy_today"] == 3.0
+    assert snapshot["cost_today"] == 0.75
+    assert snapshot["energy_last_hour"] == 3.0
@@ -0,0 +1,137 @@
+"""Tests de la détection des anomalies."""
+
+from datetime import datetime, timedelta
+import json
+
+import pytest
+from pytest_homeassistant_custom_component.common import load_fixture
+
+from custom_components.hass_vivreco_pac.anomaly import (
+    VivrecoAnomalyDetector,
+    VivrecoEwma,
+)
+from custom_components.hass_vivreco_pac.const import (
+    ANOMALY_ALPHA,
+    ANOMALY_MIN_SAMPLES,
+    DOMAIN,
+)
+from homeassistant.helpers import issue_registry as ir
+
+from .conftest import HP_ID
+
+START = datetime(2024, 1, 8, 6, 0)
+
+
+def test_ewma_score():
+    """Moyenne et variance exponentielles, score après l'amorçage."""
+    ewma = VivrecoEwma()
+    for index in range(ANOMALY_MIN_SAMPLES):
+        assert ewma.score(10.0) is None
+        ewma.update(10.0 + (index % 2))
+
+    assert ewma.mean == pytest.approx(10.5, abs=0.3)
+    assert 0 < ewma.variance < 0.25
+    # Écart type plancher : 5 % de la moyenne
+    deviation = max(ewma.variance**0.5, 0.05 * ewma.mean)
+    assert ewma.score(20.0) == pytest.approx((20.0 - ewma.mean) / deviation)
+
+    mean = ewma.mean
+    ewma.update(mean + 1)
+    assert ewma.mean == pytest.approx(mean + ANOMALY_ALPHA)
+
+
+def _recoveries(detector: VivrecoAnomalyDetector, durations: list[float]) -> None:
+    """Une chauffe ECS terminée par heure, relevée trois fois chacune."""
+    for index, duration in enumerate(durations):
+        end = (START + timedelta(hours=index)).timestamp()
+        for minute in range(3):
+            now = START + timedelta(hours=index, minutes=minute)
+            detector.update(now, {}, ecs_recovery=duration, ecs_recovery_end=end)
+
+
+def test_recoveries_counted_once_each():
+    """Chaque chauffe compte une fois, même de durée égale à la précédente."""
+    detector = VivrecoAnomalyDetector(threshold=3.0)
+    _recoveries(detector, [30.0] * 5)
+    assert detector.metrics["ecs_recovery"].count == 5
+
+
+def test_anomaly_raised_and_cleared():
+    """Une chauffe anormalement longue lève l'anomalie, la suivante la retire."""
+    detector = VivrecoAnomalyDetector(threshold=3.0)
+    _recoveries(detector, [30.0 + index % 3 for index in range(ANOMALY_MIN_SAMPLES)])
+
+    end = START + timedelta(days=1)
+    raised, _ = detector.update(
+        end, {}, ecs_recovery=90.0, ecs_recovery_end=end.timestamp()
+    )
+    assert raised == {"ecs_recovery"}
+    # Valeur anormale hors de la moyenne
+    assert detector.metrics["ecs_recovery"].mean < 32
+
+    end += timedelta(hours=1)
+    _, cleared = detector.update(
+        end, {}, ecs_recovery=31.0, ecs_recovery_end=end.timestamp()
+    )
+    assert cleared == {"ecs_recovery"}
+
+
+def test_setback_not_anomalous():
+    """Abaissements nocturnes et relances (confort → réduit → confort) rejoués.
+
+    La température sous la consigne pendant la relance du matin n'est pas
+    mesurée ; une PAC qui ne tient plus la consigne l'est.
+    """
+    detector = VivrecoAnomalyDetector(threshold=3.0)
+    readings = json.loads(load_fixture("setback_week.json"))
+    for reading in readings:
+        now = START + timedelta(minutes=reading["minute"])
+        raised, _ = detector.update(now, reading)
+        assert not raised
+    assert detector.metrics["t_int_deviation"].count >= ANOMALY_MIN_SAMPLES
+
+    setpoint = reading["cons_t_int"]
+    for minute in range(10, 40, 10):
+        raised, _ = detector.update(
+            now + timedelta(minutes=minute),
+            {"t_int": setpoint - 2, "t_ext": 0.0, "cons_t_int": setpoint},
+        )
+    assert raised == {"t_int_deviation"}
+
+
+def test_active_restored():
+    """Les anomalies en cours et la dernière chauffe survivent au redémarrage."""
+    detector = VivrecoAnomalyDetector(threshold=3.0)
+    detector.active.add("t_int_deviation")
+    _recoveries(detector, [30.0])
+
+    restored = VivrecoAnomalyDetector(threshold=3.0)
+    restored.load(detector.as_dict())
+    assert restored.active == {"t_int_deviation"}
+    assert restored.metrics["ecs_recovery"].count == 1
+    _recoveries(restored, [30.0])
+    assert restored.metrics["ecs_recovery"].count == 1
+
+
+async def test_stale_issues_deleted(hass, coordinator):
+    """Au premier relevé, seules les réparations d'anomalies en cours restent."""
+    for issue_id in (
+        f"anomaly_ecs_recovery_{HP_ID}",
+        f"anomaly_t_int_deviation_{HP_ID}",
+    ):
+        ir.async_create_issue(
+            hass,
+            DOMAIN,
+            issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.WARNING,
+            translation_key="anomaly_ecs_recovery",
+        )
+    coordinator.anomalies.active.add("t_int_deviation")
+    coordinator.data.update(history={}, analytics={})
+
+    coordinator._update_anomalies({})  # noqa: SLF001
+
+    registry = ir.async_get(hass)
+    assert registry.async_get_issue(DOMAIN, f"anomaly_ecs_recovery_{HP_ID}") is None
+    assert registry.async_get_issue(DOMAIN, f"anomaly_t_int_deviation_{HP_ID}")
@@ -0,0 +1,109 @@
+"""Tests du client API : accès local et repli sur le cloud."""
+
+from datetime import timedelta
+
+import aiohttp
+import pytest
+
+from custom_components.hass_vivreco_pac.api import (
+    VivrecoApiClient,
+    VivrecoConnectionError,
+    VivrecoVersionConflictError,
+)
+from custom_components.hass_vivreco_pac.const import (
+    API_CHART_URL_TEMPLATE,
+    API_SETTINGS_COMMAND,
+    API_SETTINGS_URL_TEMPLATE,
+    LOCAL_RETRY_AFTER,
+)
+
+from .conftest import HP_ID, TOKEN, api_url
+
+LOCAL_URL = "http://192.168.1.50/api/v1"
+CHART = {"elements": {"values": {"t_ext": 5.0}, "labels": {}}}
+
+
+def local_url(path: str) -> str:
+    """URL d'un chemin de l'API sur l'accès local."""
+    return f"{LOCAL_URL}{path.format(hp_id=HP_ID)}"
+
+
+@pytest.fixture
+def client(hass) -> VivrecoApiClient:
+    """Client avec accès local, token déjà connu."""
+    return VivrecoApiClient(
+        "user@example.com",
+        "secret",
+        hp_id=HP_ID,
+        api_token=TOKEN,
+        hass=hass,
+        local_url=LOCAL_URL,
+    )
+
+
+def _calls(aioclient_mock, url: str) -> int:
+    """Nombre de requêtes reçues par une URL."""
+    return sum(1 for call in aioclient_mock.mock_calls if str(call[1]) == url)
+
+
+async def test_local_preferred(client, aioclient_mock):
+    """L'accès local répond : le cloud n'est pas sollicité."""
+    aioclient_mock.get(local_url(API_CHART_URL_TEMPLATE), json=CHART)
+    aioclient_mock.get(api_url(API_CHART_URL_TEMPLATE), json={})
+
+    assert await client.get_chart_data() == CHART
+    assert _calls(aioclient_mock, api_url(API_CHART_URL_TEMPLATE)) == 0
+    assert client.transport_stats["local"]["requests"] == 1
+
+
+async def test_fallback_and_retry_after(client, aioclient_mock, freezer):
+    """Accès local injoignable : repli sur le cloud, puis nouvel essai différé."""
+    local = local_url(API_CHART_URL_TEMPLATE)
+    aioclient_mock.get(local, exc=aiohttp.ClientConnectionError("refused"))
+    aioclient_mock.get(api_url(API_CHART_URL_TEMPLATE), json=CHART)
+
+    assert await client.get_chart_data() == CHART
+    assert not client.local.available
+    assert client.transport_stats["local"]["failures"] == 1
+
+    # Accès local écarté : pas de nouvel essai avant le délai
+    assert await client.get_chart_data() == CHART
+    assert _calls(aioclient_mock, local) == 1
+
+    freezer.tick(timedelta(seconds=LOCAL_RETRY_AFTER + 1))
+    assert client.local.available
+    await client.get_chart_data()
+    assert _calls(aioclient_mock, local) == 2
+
+
+async def test_command_fallback_on_server_error(client, aioclient_mock):
+    """Une erreur de l'accès local renvoie la commande par le cloud."""
+    aioclient_mock.post(local_url(API_SETTINGS_COMMAND), status=500)
+    aioclient_mock.post(
+        api_url(API_SETTINGS_COMMAND), status=201, json={"status": "ok"}
+    )
+
+    assert await client.send_command("customer_settings", {"a": 1}) == {"status": "ok"}
+    assert client.transport_stats["local"]["last_error"] == "HTTP 500"
+
+
+async def test_version_conflict_not_retried_on_cloud(client, aioclient_mock):
+    """Un conflit de version signalé par l'accès local n'est pas renvoyé au cloud."""
+    aioclient_mock.post(local_url(API_SETTINGS_COMMAND), status=409)
+    aioclient_mock.post(api_url(API_SETTINGS_COMMAND), status=201, json={})
+
+    with pytest.raises(VivrecoVersionConflictError):
+        await client.send_command("customer_settings", {"a": 1})
+    assert _calls(aioclient_mock, api_url(API_SETTINGS_COMMAND)) == 0
+    assert client.local.available
+
+
+async def test_cloud_read_error_wrapped(hass, aioclient_mock):
+    """Une lecture impossible sur le cloud lève une erreur de connexion claire."""
+    client = VivrecoApiClient(
+        "user@example.com", "secret", hp_id=HP_ID, api_token=TOKEN, hass=hass
+    )
+    aioclient_mock.get(api_url(API_SETTINGS_URL_TEMPLATE), exc=TimeoutError)
+
+    with pytest.raises(VivrecoConnectionError):
+        await client.get_settings_data()
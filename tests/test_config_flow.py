@@ -0,0 +1,126 @@
+"""Tests du flux de configuration et du flux d'options."""
+
+from unittest.mock import patch
+
+from custom_components.hass_vivreco_pac.const import (
+    API_LOGIN_URL,
+    API_USER_URL,
+    CONF_HP_ID,
+    CONF_OFFPEAK_END,
+    CONF_OFFPEAK_PRICE,
+    CONF_OFFPEAK_START,
+    CONF_PEAK_PRICE,
+    DOMAIN,
+)
+from homeassistant import config_entries
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONF_TOKEN
+from homeassistant.data_entry_flow import FlowResultType
+
+from .conftest import HP_ID, TOKEN, api_url
+
+
+async def test_options_tariff(hass, config_entry):
+    """L'étape tarif s'affiche et fusionne sa saisie dans les options."""
+    hass.config_entries.async_update_entry(config_entry, options={"export": True})
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] is FlowResultType.MENU
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "tariff"}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "tariff"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_PEAK_PRICE: 0.2516,
+            CONF_OFFPEAK_PRICE: 0.2068,
+            CONF_OFFPEAK_START: "22:00:00",
+            CONF_OFFPEAK_END: "06:00:00",
+        },
+    )
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options[CONF_OFFPEAK_PRICE] == 0.2068
+    assert config_entry.options["export"] is True
+
+
+async def _start_user_flow(hass):
+    """Démarre le flux et saisit les identifiants."""
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    return await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {CONF_EMAIL: "user@example.com", CONF_PASSWORD: "secret"},
+    )
+
+
+async def test_user_single_pump(hass, mock_api):
+    """Un compte à une seule PAC crée directement son entrée."""
+    result = await _start_user_flow(hass)
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "Vivreco PAC"
+    assert result["result"].unique_id == HP_ID
+    assert result["data"][CONF_HP_ID] == HP_ID
+    assert result["data"][CONF_TOKEN] == TOKEN
+
+
+async def test_user_invalid_auth(hass, aioclient_mock):
+    """Des identifiants refusés réaffichent le formulaire."""
+    aioclient_mock.post(api_url(API_LOGIN_URL), status=401)
+    result = await _start_user_flow(hass)
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+
+async def test_user_several_pumps(hass, aioclient_mock):
+    """Chaque PAC choisie reçoit sa propre entrée."""
+    aioclient_mock.post(api_url(API_LOGIN_URL), json={"token": TOKEN})
+    aioclient_mock.get(
+        api_url(API_USER_URL), json={"hp_id": ["hp0001", "hp0002", "hp0003"]}
+    )
+    result = await _start_user_flow(hass)
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "pump"
+
+    with patch(
+        "custom_components.hass_vivreco_pac.async_setup_entry", return_value=True
+    ):
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HP_ID: ["hp0001", "hp0003"]}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    entries = hass.config_entries.async_entries(DOMAIN)
+    assert sorted(entry.unique_id for entry in entries) == ["hp0001", "hp0003"]
+    assert {entry.title for entry in entries} == {
+        "Vivreco PAC hp0001",
+        "Vivreco PAC hp0003",
+    }
+
+
+async def test_reauth(hass, config_entry, mock_api):
+    """La réauthentification enregistre le nouveau mot de passe."""
+    with patch(
+        "custom_components.hass_vivreco_pac.async_setup_entry", return_value=True
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={
+                "source": config_entries.SOURCE_REAUTH,
+                "entry_id": config_entry.entry_id,
+            },
+            data=config_entry.data,
+        )
+        assert result["step_id"] == "reauth_confirm"
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_PASSWORD: "nouveau"}
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    assert result["reason"] == "reauth_successful"
+    assert config_entry.data[CONF_PASSWORD] == "nouveau"
+    assert config_entry.data[CONF_EMAIL] == "user@example.com"
@@ -0,0 +1,141 @@
+"""Tests des écritures de paramètres du coordinateur."""
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.hass_vivreco_pac.api import (
+    VivrecoConnectionError,
+    VivrecoVersionConflictError,
+)
+from custom_components.hass_vivreco_pac.const import (
+    COMMAND_MAX_RETRIES,
+    DOMAIN,
+    EVENT_COMMAND_NOT_APPLIED,
+)
+
+SETPOINT = "consigne_p/t_confort_ch"
+
+
+async def test_unchanged_values_skipped(coordinator, stub_api):
+    """Une valeur identique au cache n'est pas envoyée, sauf avec force."""
+    await coordinator.async_set_settings({SETPOINT: 20.0, "loi_eau": 1.2})
+    assert stub_api.sent == [{"loi_eau": 1.2}]
+    assert coordinator.values_skipped == 1
+
+    await coordinator.async_set_settings({SETPOINT: 20.0})
+    assert len(stub_api.sent) == 1
+    assert coordinator.commands_skipped == 1
+
+    await coordinator.async_set_settings({SETPOINT: 20.0}, force=True)
+    assert stub_api.sent[-1] == {SETPOINT: 20.0}
+
+
+async def test_stale_cache_not_deduplicated(coordinator, stub_api, freezer):
+    """Un cache trop ancien ne sert plus à ignorer les écritures."""
+    freezer.tick(16 * 60)
+    await coordinator.async_set_settings({SETPOINT: 20.0})
+    assert stub_api.sent == [{SETPOINT: 20.0}]
+
+
+async def test_revert_while_confirming_is_sent(coordinator, stub_api):
+    """Revenir à la valeur du cache pendant la confirmation n'est pas ignoré."""
+    stub_api.applies = False
+    await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert coordinator.command_tracker.confirming(SETPOINT)
+
+    # Le cache indique encore 20.0 alors que 21.0 est en cours d'application
+    await coordinator.async_set_settings({SETPOINT: 20.0})
+    assert stub_api.sent == [{SETPOINT: 21.0}, {SETPOINT: 20.0}]
+
+
+async def test_version_conflict_retried(coordinator, stub_api):
+    """Un conflit de version relit les paramètres puis renvoie la commande."""
+    stub_api.errors.append(VivrecoVersionConflictError("409"))
+    await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert stub_api.sent == [{SETPOINT: 21.0}]
+    assert coordinator.commands_sent == 1
+
+
+async def test_version_conflict_already_applied(coordinator, stub_api):
+    """Après relecture, une valeur déjà en place n'est pas renvoyée."""
+    stub_api.errors.append(VivrecoVersionConflictError("409"))
+    stub_api.settings[SETPOINT] = 21.0
+    await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert stub_api.sent == []
+
+
+async def test_version_conflict_gives_up(coordinator, stub_api):
+    """Les conflits répétés finissent par remonter à l'appelant."""
+    stub_api.errors.extend(
+        VivrecoVersionConflictError("409") for _ in range(COMMAND_MAX_RETRIES + 1)
+    )
+    with pytest.raises(VivrecoVersionConflictError):
+        await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert stub_api.sent == []
+
+
+async def test_version_conflict_reread_fails(coordinator, stub_api):
+    """API injoignable pendant la relecture : la commande est mise en file."""
+    stub_api.errors.append(VivrecoVersionConflictError("409"))
+    stub_api.read_errors.append(VivrecoConnectionError("timeout"))
+    result = await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert result == {"sent": {}, "queued": {SETPOINT: 21.0}}
+    assert coordinator.command_queue == {SETPOINT: {"value": 21.0, "base": 20.0}}
+    assert stub_api.sent == []
+
+
+async def test_outage_queues_and_replays(hass, coordinator, stub_api):
+    """API injoignable : valeurs en file, rejouées au retour de la connexion."""
+    stub_api.errors.append(VivrecoConnectionError("timeout"))
+    result = await coordinator.async_set_settings({SETPOINT: 21.0})
+    assert result == {"sent": {}, "queued": {SETPOINT: 21.0}}
+    assert coordinator.command_queue == {SETPOINT: {"value": 21.0, "base": 20.0}}
+
+    # Une écriture plus récente de la même clé remplace la valeur en file
+    stub_api.errors.append(VivrecoConnectionError("timeout"))
+    await coordinator.async_set_settings({SETPOINT: 21.5})
+    assert coordinator.command_queue == {SETPOINT: {"value": 21.5, "base": 20.0}}
+
+    await coordinator._async_replay_queue()  # noqa: SLF001
+    assert stub_api.sent == [{SETPOINT: 21.5}]
+    assert coordinator.command_queue == {}
+
+
+async def test_replay_skips_values_changed_elsewhere(hass, coordinator, stub_api):
+    """Une clé modifiée ailleurs pendant la coupure n'est pas écrasée."""
+    events = async_capture_events(hass, EVENT_COMMAND_NOT_APPLIED)
+    stub_api.errors.append(VivrecoConnectionError("timeout"))
+    await coordinator.async_set_settings({SETPOINT: 21.0})
+
+    stub_api.settings[SETPOINT] = 19.0
+    await coordinator.async_refresh_settings(notify=False)
+    await coordinator._async_replay_queue()  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert stub_api.sent == []
+    assert events[0].data == {
+        "values": {SETPOINT: 21.0},
+        "reason": "changed_elsewhere",
+    }
+
+
+async def test_service_reports_queued(hass, config_entry, mock_api, stub_api):
+    """La réponse du service distingue les valeurs en file des valeurs envoyées."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator.api = stub_api
+    stub_api.errors.append(VivrecoConnectionError("timeout"))
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "set_settings",
+        {"settings": {SETPOINT: 21.0, "consigne_p/t_reduit_ch": 18.0}},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "sent": {},
+        "queued": {SETPOINT: 21.0},
+        "skipped": ["consigne_p/t_reduit_ch"],
+    }
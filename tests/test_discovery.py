@@ -0,0 +1,57 @@
+"""Tests des entités générées pour les clés sans entité dédiée."""
+
+from custom_components.hass_vivreco_pac import discovery
+from custom_components.hass_vivreco_pac.const import DOMAIN
+from homeassistant.helpers import entity_registry as er
+
+from .conftest import HP_ID, SETTINGS, VALUES, register_api
+
+EXTRA_VALUES = {"pompe_circ": True, "t_retour": 30.5}
+EXTRA_SETTINGS = {
+    "loi_eau/pente": 1.2,
+    "auth_p/etat_glob/aut_silence": False,
+    "mode_zone_s/ambiance": "auto",
+}
+
+
+def test_settings_read_only():
+    """Les paramètres numériques sont en lecture seule, les modes en liste."""
+    schema = discovery.VivrecoDiscovery()
+    schema.update({"values": EXTRA_VALUES, "settings": EXTRA_SETTINGS})
+    assert schema.values["pompe_circ"]["type"] == "binary"
+    assert schema.values["t_retour"]["temperature"]
+    assert schema.settings["loi_eau/pente"]["type"] == "numeric"
+    assert schema.settings["auth_p/etat_glob/aut_silence"]["type"] == "binary"
+    assert schema.settings["mode_zone_s/ambiance"]["type"] == "select"
+    assert ("sensor", "loi_eau/pente") in schema.entities
+
+
+async def test_discovered_entities(hass, config_entry, aioclient_mock):
+    """Les clés découvertes ont la bonne plateforme, les orphelines disparaissent."""
+    register_api(
+        aioclient_mock, {**VALUES, **EXTRA_VALUES}, {**SETTINGS, **EXTRA_SETTINGS}
+    )
+    registry = er.async_get(hass)
+    # Paramètre exposé en nombre modifiable par une version précédente
+    stale = registry.async_get_or_create(
+        "number",
+        DOMAIN,
+        f"{HP_ID}_{DOMAIN}_discovered_loi_eau/pente",
+        config_entry=config_entry,
+    )
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    def _entity(domain: str, unique_id: str) -> str | None:
+        return registry.async_get_entity_id(domain, DOMAIN, f"{HP_ID}_{unique_id}")
+
+    assert registry.async_get(stale.entity_id) is None
+    assert _entity("sensor", "vivreco_discovered_loi_eau/pente")
+    assert _entity("sensor", "vivreco_discovered_t_retour")
+    assert _entity("binary_sensor", "vivreco_discovered_pompe_circ")
+    assert _entity("binary_sensor", "vivreco_discovered_auth_p/etat_glob/aut_silence")
+    assert _entity("select", f"{DOMAIN}_discovered_mode_zone_s/ambiance")
+    assert registry.async_get(
+        _entity("binary_sensor", "vivreco_discovered_pompe_circ")
+    ).disabled
@@ -0,0 +1,95 @@
+"""Tests de l'apprentissage des puisages et du préchauffage de l'ECS."""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from custom_components.hass_vivreco_pac.analytics import VivrecoTariff
+from custom_components.hass_vivreco_pac.const import ECS_USAGE_DECAY
+from custom_components.hass_vivreco_pac.ecs_scheduler import (
+    VivrecoEcsScheduler,
+    VivrecoEcsUsageLearner,
+)
+
+# Lundi
+MONDAY = datetime(2024, 1, 8)
+
+
+def _learner_with_morning_draw() -> VivrecoEcsUsageLearner:
+    """Puisage de 6 °C le lundi à 7 h."""
+    learner = VivrecoEcsUsageLearner()
+    learner.update(MONDAY.replace(hour=7), 50.0, "bt")
+    learner.update(MONDAY.replace(hour=7, minute=10), 44.0, "bt")
+    return learner
+
+
+def test_draws_and_heating_starts_counted():
+    """Une baisse hors chauffe et un début de chauffe marquent le créneau."""
+    learner = _learner_with_morning_draw()
+    assert learner.histogram[7] == pytest.approx(6.0)
+
+    # Chauffe en cours : la baisse n'est pas un puisage, le début compte une fois
+    learner.update(MONDAY.replace(hour=8), 43.0, "ecs")
+    learner.update(MONDAY.replace(hour=8, minute=10), 41.0, "ecs")
+    assert learner.histogram[8] == pytest.approx(1.5)
+
+    # Variation sous le seuil : ignorée
+    learner.update(MONDAY.replace(hour=9), 40.0, "bt")
+    assert learner.histogram[9] == 0.0
+
+
+def test_daily_decay():
+    """L'histogramme est atténué au changement de jour."""
+    learner = _learner_with_morning_draw()
+    learner.update(MONDAY + timedelta(days=1), None, "bt")
+    assert learner.histogram[7] == pytest.approx(6.0 * ECS_USAGE_DECAY)
+
+
+def test_demand_normalised_over_horizon():
+    """Le score est le créneau le plus chargé de l'horizon rapporté au maximum."""
+    learner = _learner_with_morning_draw()
+    assert learner.demand(MONDAY.replace(hour=2), 6) == 1.0
+    assert learner.demand(MONDAY.replace(hour=2), 5) == 0.0
+    assert VivrecoEcsUsageLearner().demand(MONDAY, 24) == 0.0
+
+
+def test_heating_in_offpeak_before_demand():
+    """Chauffe en heures creuses avant un puisage, en heures pleines s'il est proche."""
+    tariff = VivrecoTariff(0.25, 0.18, time(22), time(6))
+    scheduler = VivrecoEcsScheduler(_learner_with_morning_draw(), tariff, 8, 55.0)
+    normal = {"mode_ecs/ambiance_ecs": "normal", "consigne_ecs/t_normal_ecs": 55.0}
+    settings = {"consigne_ecs/t_normal_ecs": 55.0}
+
+    assert scheduler.plan(MONDAY.replace(hour=1), settings) == normal
+    assert scheduler.demand == 1.0
+    # Heures pleines, puisage dans deux heures : attente
+    assert scheduler.plan(MONDAY.replace(hour=6), settings) == {
+        "mode_ecs/ambiance_ecs": "reduit"
+    }
+    assert scheduler.plan(MONDAY.replace(hour=7, minute=5), settings) == normal
+    assert scheduler.plan(MONDAY.replace(hour=12), settings) == {
+        "mode_ecs/ambiance_ecs": "reduit"
+    }
+
+
+def test_user_setpoint_restored():
+    """La consigne normale de l'utilisateur est rétablie après le préchauffage."""
+    tariff = VivrecoTariff(0.25, 0.18, time(22), time(6))
+    scheduler = VivrecoEcsScheduler(_learner_with_morning_draw(), tariff, 8, 55.0)
+    settings = {"consigne_ecs/t_normal_ecs": 48.0}
+
+    planned = scheduler.plan(MONDAY.replace(hour=1), settings)
+    assert planned["consigne_ecs/t_normal_ecs"] == 55.0
+    settings.update(planned)
+    scheduler.plan(MONDAY.replace(hour=2), settings)
+    assert scheduler.saved == 48.0
+
+    # Fin du préchauffage : rétablissement jusqu'à confirmation
+    restore = {"mode_ecs/ambiance_ecs": "reduit", "consigne_ecs/t_normal_ecs": 48.0}
+    assert scheduler.plan(MONDAY.replace(hour=12), settings) == restore
+    assert scheduler.plan(MONDAY.replace(hour=13), settings) == restore
+    settings.update(restore)
+    assert scheduler.plan(MONDAY.replace(hour=14), settings) == {
+        "mode_ecs/ambiance_ecs": "reduit"
+    }
+    assert scheduler.saved is None
@@ -0,0 +1,106 @@
+"""Tests de l'export des relevés bruts."""
+
+import csv
+from datetime import datetime, timedelta
+import gzip
+from pathlib import Path
+from unittest.mock import patch
+
+from custom_components.hass_vivreco_pac.exporter import VivrecoExporter
+
+START = datetime(2024, 1, 8, 23, 50)
+
+
+def _read(path: Path) -> list[dict]:
+    """Lignes d'un fichier exporté, compressé ou non."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+async def test_files_per_day_and_columns(hass, tmp_path):
+    """Nouveau fichier au changement de jour ou de colonnes, ajout sinon."""
+    exporter = VivrecoExporter(hass, tmp_path, retention=7)
+    for minute in range(0, 20, 5):
+        exporter.append(START + timedelta(minutes=minute), {"t_ext": minute}, {}, {})
+    exporter.append(START + timedelta(minutes=20), {"t_ext": 1, "t_int": 19}, {}, {})
+    await exporter.async_flush()
+    # Lot suivant : même jour, mêmes colonnes
+    exporter.append(START + timedelta(minutes=25), {"t_ext": 2, "t_int": 19}, {}, {})
+    await exporter.async_flush()
+
+    # Fichiers clos compressés, fichier en cours en CSV simple
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "vivreco_2024-01-08_235000.csv.gz",
+        "vivreco_2024-01-09_000000.csv.gz",
+        "vivreco_2024-01-09_001000.csv",
+    ]
+    assert [
+        row["values.t_ext"]
+        for row in _read(tmp_path / "vivreco_2024-01-08_235000.csv.gz")
+    ] == ["0", "5"]
+    assert [
+        row["values.t_ext"]
+        for row in _read(tmp_path / "vivreco_2024-01-09_000000.csv.gz")
+    ] == ["10", "15"]
+    assert _read(tmp_path / "vivreco_2024-01-09_001000.csv") == [
+        {
+            "timestamp": (START + timedelta(minutes=20)).isoformat(),
+            "values.t_ext": "1",
+            "values.t_int": "19",
+        },
+        {
+            "timestamp": (START + timedelta(minutes=25)).isoformat(),
+            "values.t_ext": "2",
+            "values.t_int": "19",
+        },
+    ]
+    assert exporter.rows_written == 6
+
+
+async def test_restart_closes_previous_file(hass, tmp_path):
+    """Après un redémarrage, le fichier resté ouvert est compressé."""
+    exporter = VivrecoExporter(hass, tmp_path, retention=7)
+    exporter.append(START, {"t_ext": 5}, {}, {})
+    await exporter.async_flush()
+
+    restarted = VivrecoExporter(hass, tmp_path, retention=7)
+    restarted.append(START + timedelta(minutes=5), {"t_ext": 6}, {}, {})
+    await restarted.async_flush()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "vivreco_2024-01-08_235000.csv.gz",
+        "vivreco_2024-01-08_235500.csv",
+    ]
+
+
+async def test_write_error_keeps_rows(hass, tmp_path):
+    """Un lot non écrit reste en tampon et part avec l'écriture suivante."""
+    exporter = VivrecoExporter(hass, tmp_path, retention=7)
+    exporter.append(START, {"t_ext": 5}, {}, {})
+    with patch.object(Path, "mkdir", side_effect=OSError("disque plein")):
+        await exporter.async_flush()
+    assert exporter.stats["buffered"] == 1
+    assert exporter.stats["last_error"] == "disque plein"
+
+    exporter.append(START + timedelta(minutes=5), {"t_ext": 6}, {}, {})
+    await exporter.async_flush()
+    assert exporter.rows_written == 2
+    assert exporter.stats["last_error"] is None
+    assert [
+        row["values.t_ext"] for row in _read(tmp_path / "vivreco_2024-01-08_235000.csv")
+    ] == ["5", "6"]
+
+
+async def test_retention(hass, tmp_path):
+    """Les fichiers plus anciens que la rétention sont supprimés."""
+    old = tmp_path / "vivreco_2023-12-01_000000.csv.gz"
+    recent = tmp_path / "vivreco_2024-01-05_000000.csv.gz"
+    for path in (old, recent):
+        path.write_bytes(gzip.compress(b"timestamp\n"))
+
+    exporter = VivrecoExporter(hass, tmp_path, retention=7)
+    exporter.append(START, {"t_ext": 5}, {}, {})
+    await exporter.async_flush()
+    assert not old.exists()
+    assert recent.exists()
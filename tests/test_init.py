@@ -0,0 +1,65 @@
+"""Tests du chargement et du déchargement de l'entrée."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.hass_vivreco_pac.const import DOMAIN
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.helpers import entity_registry as er
+
+from .conftest import HP_ID
+
+
+async def test_setup_and_unload(hass, config_entry, mock_api):
+    """L'entrée se charge, crée ses entités et se décharge proprement."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get("sensor.vivreco_pac_outdoor_temperature").state == "5.0"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert config_entry.state is ConfigEntryState.NOT_LOADED
+    assert config_entry.entry_id not in hass.data[DOMAIN]
+
+
+async def test_unload_saves_state(hass, config_entry, mock_api, hass_storage):
+    """Le déchargement enregistre l'état sans attendre le délai de sauvegarde."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    coordinator.command_queue["consigne_p/t_confort_ch"] = {"value": 21.0, "base": 20.0}
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    stored = hass_storage[f"{DOMAIN}.{config_entry.entry_id}"]["data"]
+    assert stored["command_queue"] == coordinator.command_queue
+    assert "analytics" in stored
+    # Plus d'enregistrement différé qui écraserait l'état de l'entrée rechargée
+    coordinator._schedule_save(0)  # noqa: SLF001
+    assert coordinator._store._delay_handle is None  # noqa: SLF001
+
+
+async def test_unique_ids_migrated(hass, mock_api):
+    """Les entités d'une entrée antérieure à la 1.2 sont préfixées par la PAC."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Vivreco PAC",
+        minor_version=1,
+        data={CONF_EMAIL: "user@example.com", CONF_PASSWORD: "secret"},
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    old = registry.async_get_or_create(
+        "sensor", DOMAIN, "vivreco_t_ext", config_entry=entry
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert registry.async_get(old.entity_id).unique_id == f"{HP_ID}_vivreco_t_ext"
+    assert entry.unique_id == HP_ID
+    assert entry.minor_version == 2
+    assert hass.states.get(old.entity_id).state == "5.0"
@@ -0,0 +1,92 @@
+"""Tests de l'optimisation de la consigne de chauffage."""
+
+import pytest
+
+from custom_components.hass_vivreco_pac.const import THERMAL_MIN_SAMPLES
+from custom_components.hass_vivreco_pac.optimizer import VivrecoHeatingOptimizer
+from custom_components.hass_vivreco_pac.thermal import VivrecoThermalModel
+
+KEY = "consigne_p/t_confort_ch"
+# Logement simulé : pertes (1/h), apport du compresseur et apports internes (°C/h)
+THETA = [0.05, 2.0, 0.2]
+
+
+def _optimizer() -> VivrecoHeatingOptimizer:
+    """Optimiseur 19-21 °C ; la PAC consomme 1 kWh/h à 10 °C et 3 kWh/h à -10 °C."""
+    model = VivrecoThermalModel(max_gap=900)
+    model.theta = list(THETA)
+    model.samples = THERMAL_MIN_SAMPLES
+    optimizer = VivrecoHeatingOptimizer(model, 19.0, 21.0, threshold=0.3)
+    timestamp, energy = 0.0, 0.0
+    for _ in range(20):
+        for t_ext, kwh in ((10.0, 1.0), (-10.0, 3.0)):
+            optimizer.learn(timestamp, energy, True, t_ext)
+            timestamp += 3600
+            energy += kwh
+    return optimizer
+
+
+def test_power_follows_outdoor_temperature():
+    """La consommation horaire apprise dépend de la température extérieure."""
+    optimizer = _optimizer()
+    assert optimizer.power(10.0) == pytest.approx(1.0)
+    assert optimizer.power(-10.0) == pytest.approx(3.0)
+    assert optimizer.power(0.0) == pytest.approx(2.0)
+
+
+def test_simulate_steady_state():
+    """À consigne tenue, la marche compense les pertes du logement."""
+    optimizer = _optimizer()
+    energy, lowest = optimizer.simulate(20.0, [5.0] * 12, [20.0] * 12)
+
+    loss, gain, offset = THETA
+    duty = (loss * (20.0 - 5.0) - offset) / gain
+    assert energy == pytest.approx(duty * 12 * optimizer.power(5.0), rel=0.05)
+    assert lowest == pytest.approx(20.0, abs=0.2)
+
+
+def test_optimize_stable_forecast():
+    """Sans refroidissement annoncé, le bas de la plage est le plus économe."""
+    result = _optimizer().optimize(19.5, [5.0] * 12, current=20.0)
+    assert result["setpoint"] == 19.0
+    assert not result["preheat"]
+    assert result["saving"] > 0
+    assert result["apply"]
+
+
+def test_optimize_preheats_before_cold():
+    """Un froid annoncé fait préchauffer pendant que la PAC a un bon rendement."""
+    optimizer = _optimizer()
+    result = optimizer.optimize(19.5, [12.0] + [-10.0] * 11, current=19.0)
+    assert result["setpoint"] > 19.0
+    assert result["preheat"]
+    assert result["energy"] < result["current_energy"]
+
+
+async def test_optimized_setpoint_written_once(hass, coordinator, stub_api):
+    """En mode application, la consigne est envoyée en une seule commande."""
+    coordinator.optimizer = _optimizer()
+    coordinator.optimizer_mode = "apply"
+    coordinator.data["settings"]["mode_zone_p/ambiance"] = "confort"
+    values = {"t_int": 19.5, "t_ext": 5.0, "comp_one": 1}
+
+    await coordinator._async_update_heating_curve(values)  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert stub_api.sent == [{KEY: 19.0}]
+    assert coordinator.data["heating_curve"]["setpoint"] == 19.0
+
+
+async def test_simulation_mode_writes_nothing(hass, coordinator, stub_api):
+    """En simulation, la consigne recommandée est seulement exposée."""
+    coordinator.optimizer = _optimizer()
+    coordinator.optimizer_mode = "simulate"
+    coordinator.data["settings"]["mode_zone_p/ambiance"] = "confort"
+    values = {"t_int": 19.5, "t_ext": 5.0, "comp_one": 1}
+
+    await coordinator._async_update_heating_curve(values)  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert stub_api.sent == []
+    assert coordinator.data["heating_curve"]["setpoint"] == 19.0
+    assert coordinator.data["heating_curve"]["apply"]
@@ -0,0 +1,35 @@
+"""Tests du profilage à la demande."""
+
+import os
+from pathlib import Path
+
+from custom_components.hass_vivreco_pac.const import DOMAIN, PROFILE_KEEP
+from custom_components.hass_vivreco_pac.profiler import async_profile
+
+
+async def test_profiles_kept_in_folder(hass, config_entry, mock_api, tmp_path):
+    """Les profils vont dans leur dossier, seuls les plus récents sont gardés."""
+    hass.config.config_dir = str(tmp_path)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    directory = Path(hass.config.path("vivreco_profiles"))
+    directory.mkdir()
+    for index in range(PROFILE_KEEP):
+        old = directory / f"vivreco_profile_20240101_00000{index}.prof"
+        old.write_bytes(b"")
+        old.with_suffix(".txt").write_text("")
+        os.utime(old, (index, index))
+
+    result = await async_profile(hass, coordinator, 1)
+
+    path = Path(result["profile"])
+    assert path.parent == directory
+    assert path.exists()
+    assert Path(result["report"]).exists()
+    profiles = sorted(directory.glob("*.prof"))
+    assert len(profiles) == PROFILE_KEEP
+    # Le plus ancien a disparu avec son résumé
+    assert not (directory / "vivreco_profile_20240101_000000.prof").exists()
+    assert not (directory / "vivreco_profile_20240101_000000.txt").exists()
@@ -0,0 +1,83 @@
+"""Tests de l'application des plans ECS et confort."""
+
+from datetime import time
+
+from custom_components.hass_vivreco_pac.ecs_scheduler import (
+    VivrecoEcsScheduler,
+    VivrecoEcsUsageLearner,
+)
+from custom_components.hass_vivreco_pac.thermal import (
+    VivrecoComfortScheduler,
+    VivrecoThermalModel,
+)
+
+KEY = VivrecoComfortScheduler.KEY
+
+
+def _scheduler() -> VivrecoComfortScheduler:
+    """Planificateur confort de 7 h à 22 h."""
+    return VivrecoComfortScheduler(VivrecoThermalModel(max_gap=900), time(7), time(22))
+
+
+def _changes(coordinator, scheduler, mode: str) -> dict:
+    """Paramètres envoyés pour le mode planifié."""
+    return coordinator._scheduled_changes(scheduler, {KEY: mode})  # noqa: SLF001
+
+
+async def test_plan_applied_to_scheduled_modes(coordinator):
+    """Le plan est appliqué tant que la zone est dans un mode piloté."""
+    scheduler = _scheduler()
+    coordinator.data["settings"][KEY] = "reduit"
+    assert _changes(coordinator, scheduler, "confort") == {KEY: "confort"}
+
+    coordinator.data["settings"][KEY] = "confort"
+    assert _changes(coordinator, scheduler, "confort") == {KEY: "confort"}
+
+
+async def test_manual_mode_never_replaced(coordinator):
+    """Hors-gel, absence ou auto ne sont jamais remplacés par le plan."""
+    scheduler = _scheduler()
+    for mode in ("hg", "auto"):
+        coordinator.data["settings"][KEY] = mode
+        assert _changes(coordinator, scheduler, "confort") == {}
+        assert _changes(coordinator, scheduler, "reduit") == {}
+
+
+async def test_manual_override_until_next_step(coordinator):
+    """Un changement manuel est respecté jusqu'à l'étape suivante du plan."""
+    scheduler = _scheduler()
+    coordinator.data["settings"][KEY] = "confort"
+    _changes(coordinator, scheduler, "reduit")
+
+    # L'utilisateur repasse en confort pendant la plage réduite
+    assert _changes(coordinator, scheduler, "reduit") == {}
+    assert scheduler.overridden
+
+    # Étape suivante : le plan reprend la main
+    assert _changes(coordinator, scheduler, "confort") == {KEY: "confort"}
+    assert not scheduler.overridden
+
+
+async def test_waits_for_pending_write(coordinator, stub_api):
+    """Rien n'est envoyé pendant la confirmation d'une écriture de la clé."""
+    scheduler = _scheduler()
+    stub_api.applies = False
+    await coordinator.async_set_settings({KEY: "hg"})
+    assert _changes(coordinator, scheduler, "confort") == {}
+
+
+async def test_ecs_setpoint_restored_after_takeover(hass, coordinator, stub_api):
+    """La consigne ECS de l'utilisateur est rétablie même en mode repris en main."""
+    scheduler = VivrecoEcsScheduler(
+        VivrecoEcsUsageLearner(), coordinator.analytics.tariff, 8, 55.0
+    )
+    scheduler.saved = 48.0
+    coordinator.ecs_scheduler = scheduler
+    coordinator.data["settings"].update(
+        {"mode_ecs/ambiance_ecs": "auto", "consigne_ecs/t_normal_ecs": 55.0}
+    )
+
+    coordinator._update_ecs_schedule({})  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    assert stub_api.sent == [{"consigne_ecs/t_normal_ecs": 48.0}]
@@ -0,0 +1,49 @@
+"""Tests des capteurs de consommation et du filtrage des écritures d'état."""
+
+from datetime import timedelta
+
+from custom_components.hass_vivreco_pac.const import DOMAIN, THROTTLE_DEFAULTS
+
+
+async def test_missing_counter_unavailable(hass, config_entry, mock_api):
+    """Un compteur absent de la réponse est indisponible, les autres non."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.vivreco_pac_heating").state == "1200.0"
+    assert hass.states.get("sensor.vivreco_pac_dhw").state == "400.0"
+    assert hass.states.get("sensor.vivreco_pac_cooling").state == "unavailable"
+    assert hass.states.get("sensor.vivreco_pac_other").state == "unavailable"
+
+
+async def test_energy_index_filters_spurious_drops(coordinator):
+    """Une légère baisse garde l'ancienne valeur, une remise à zéro passe."""
+    index = coordinator._index_energy  # noqa: SLF001
+    assert index([{"name": "ch", "y": 1200}, {"name": "ecs", "y": None}]) == {
+        "ch": 1200.0
+    }
+    assert index([{"name": "ch", "y": 1199.5}]) == {"ch": 1200.0}
+    assert index([{"name": "ch", "y": 1201}]) == {"ch": 1201.0}
+    assert index([{"name": "ch", "y": 3}]) == {"ch": 3.0}
+
+
+async def test_throttled_state_writes(hass, config_entry, mock_api, freezer):
+    """Petites variations filtrées, changement franc et délai écrits aussitôt."""
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    entity_id = "sensor.vivreco_pac_outdoor_temperature"
+
+    def _update(t_ext: float) -> str:
+        coordinator.data["values"]["t_ext"] = t_ext
+        coordinator.async_update_listeners()
+        return hass.states.get(entity_id).state
+
+    # Variation de 0,1 °C sous le seuil de 0,5 °C : état inchangé
+    assert _update(5.1) == "5.0"
+    # Changement franc : écrit immédiatement
+    assert _update(6.0) == "6.0"
+    assert _update(6.1) == "6.0"
+    # Délai minimal écoulé depuis la dernière écriture : petite variation écrite
+    freezer.tick(timedelta(minutes=THROTTLE_DEFAULTS["temperature"][1], seconds=1))
+    assert _update(6.2) == "6.2"
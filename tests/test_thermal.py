@@ -0,0 +1,87 @@
+"""Tests du modèle thermique et du démarrage du mode confort."""
+
+from datetime import datetime, time
+import math
+
+import pytest
+
+from custom_components.hass_vivreco_pac.thermal import (
+    VivrecoComfortScheduler,
+    VivrecoThermalModel,
+)
+
+# Logement simulé : pertes (1/h), apport du compresseur et apports internes (°C/h)
+LOSS, GAIN, OFFSET = 0.1, 2.0, 0.2
+STEP = 600
+
+
+def _trained_model() -> VivrecoThermalModel:
+    """Modèle appris sur deux jours simulés (chauffe par intermittence)."""
+    model = VivrecoThermalModel(max_gap=3 * STEP)
+    t_int = 19.0
+    for index in range(288):
+        t_ext = 5 + 5 * math.sin(index / 20)
+        heating = index % 7 < 3
+        model.update(index * STEP, t_int, t_ext, heating)
+        t_int += (LOSS * (t_ext - t_int) + GAIN * heating + OFFSET) * STEP / 3600
+    return model
+
+
+def test_rls_identifies_parameters():
+    """Les moindres carrés récursifs retrouvent les paramètres du logement."""
+    model = _trained_model()
+    assert model.ready
+    assert model.theta == pytest.approx([LOSS, GAIN, OFFSET], rel=1e-2)
+
+
+def test_gap_interrupts_series():
+    """Un trou dans les relevés n'est pas pris pour une dérivée."""
+    model = VivrecoThermalModel(max_gap=3 * STEP)
+    model.update(0, 19.0, 5.0, True)
+    model.update(7200, 25.0, 5.0, True)
+    assert model.samples == 0
+
+
+def test_gap_follows_scan_interval():
+    """Un relevé horaire reste exploitable avec un scan toutes les heures."""
+    model = VivrecoThermalModel(max_gap=3 * 3600)
+    model.update(0, 19.0, 5.0, True)
+    model.update(3600, 19.5, 5.0, True)
+    assert model.samples == 1
+
+
+def test_time_to_reach_matches_simulation():
+    """La durée de montée prévue correspond à une chauffe continue simulée."""
+    model = VivrecoThermalModel(max_gap=3 * STEP)
+    model.theta = [LOSS, GAIN, OFFSET]
+    model.samples = 100
+
+    expected = model.time_to_reach(18.0, 5.0, 20.0)
+    t_int, hours = 18.0, 0.0
+    while t_int < 20.0:
+        t_int += (LOSS * (5.0 - t_int) + GAIN + OFFSET) * 0.001
+        hours += 0.001
+    assert expected == pytest.approx(hours, abs=0.01)
+
+    assert model.time_to_reach(21.0, 5.0, 20.0) == 0.0
+    # Équilibre (5 + 22 °C) sous la cible : jamais atteinte
+    assert model.time_to_reach(18.0, 5.0, 28.0) is None
+
+
+def test_comfort_started_just_in_time():
+    """Le confort démarre à l'heure de début moins la montée et la marge."""
+    model = VivrecoThermalModel(max_gap=3 * STEP)
+    model.theta = [LOSS, GAIN, 0.0]
+    model.samples = 100
+    scheduler = VivrecoComfortScheduler(model, time(7), time(22))
+    values = {"t_int": 18.0, "t_ext": 5.0}
+    settings = {"consigne_p/t_confort_ch": 20.0}
+
+    # Montée de ln(7 / 5) / 0.1 = 3,36 h, plus 15 min de marge
+    plan = scheduler.plan(datetime(2024, 1, 8, 3, 0), values, settings)
+    assert plan == {"mode_zone_p/ambiance": "reduit"}
+    assert scheduler.preheat == pytest.approx(math.log(1.4) / LOSS)
+    plan = scheduler.plan(datetime(2024, 1, 8, 3, 30), values, settings)
+    assert plan == {"mode_zone_p/ambiance": "confort"}
+    plan = scheduler.plan(datetime(2024, 1, 8, 22, 30), values, settings)
+    assert plan == {"mode_zone_p/ambiance": "reduit"}
@@ -0,0 +1,68 @@
+"""Tests de la confirmation des commandes."""
+
+import asyncio
+
+import pytest
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.hass_vivreco_pac import tracker
+from custom_components.hass_vivreco_pac.const import EVENT_COMMAND_NOT_APPLIED
+
+KEY = "consigne_p/t_confort_ch"
+
+
+@pytest.fixture(autouse=True)
+def short_delays(monkeypatch):
+    """Relectures rapprochées et délai d'abandon court."""
+    monkeypatch.setattr(tracker, "COMMAND_CONFIRM_FIRST_DELAY", 0.01)
+    monkeypatch.setattr(tracker, "COMMAND_CONFIRM_MAX_DELAY", 0.02)
+    monkeypatch.setattr(tracker, "COMMAND_CONFIRM_TIMEOUT", 0.1)
+
+
+async def _wait(command_tracker: tracker.VivrecoCommandTracker) -> None:
+    """Attend la fin des confirmations en cours."""
+    await asyncio.gather(*command_tracker._tasks)  # noqa: SLF001
+
+
+async def test_confirmed(hass, coordinator, stub_api):
+    """La valeur relue confirme la commande et mesure sa latence."""
+    command_tracker = coordinator.command_tracker
+    stub_api.settings[KEY] = 21.0
+    command_tracker.track({KEY: 21.0})
+    assert command_tracker.confirming(KEY)
+
+    await _wait(command_tracker)
+    assert not command_tracker.confirming(KEY)
+    assert command_tracker.confirmed == 1
+    assert command_tracker.last_latency is not None
+    assert coordinator.data["settings"][KEY] == 21.0
+
+
+async def test_not_applied_fires_event(hass, coordinator):
+    """Sans la nouvelle valeur avant le délai, l'événement est émis."""
+    events = async_capture_events(hass, EVENT_COMMAND_NOT_APPLIED)
+    command_tracker = coordinator.command_tracker
+    command_tracker.track({KEY: 22.0})
+
+    await _wait(command_tracker)
+    await hass.async_block_till_done()
+    assert command_tracker.not_applied == 1
+    assert not command_tracker.confirming(KEY)
+    assert len(events) == 1
+    assert events[0].data["values"] == {KEY: 22.0}
+    assert events[0].data["reason"] == "timeout"
+
+
+async def test_superseded_command_dropped(hass, coordinator, stub_api):
+    """Une clé réécrite n'est suivie que par la commande la plus récente."""
+    events = async_capture_events(hass, EVENT_COMMAND_NOT_APPLIED)
+    command_tracker = coordinator.command_tracker
+    command_tracker.track({KEY: 22.0})
+    stub_api.settings[KEY] = 21.0
+    command_tracker.track({KEY: 21.0})
+
+    await _wait(command_tracker)
+    await hass.async_block_till_done()
+    assert command_tracker.confirmed == 1
+    assert command_tracker.not_applied == 0
+    assert not events
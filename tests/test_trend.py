@@ -0,0 +1,28 @@
+"""Tests de la tendance lissée."""
+
+import pytest
+
+from custom_components.hass_vivreco_pac.trend import VivrecoTrend
+
+
+def test_slope_follows_ramp():
+    """Sur une rampe de 2 °C/h, la pente et la prévision convergent."""
+    trend = VivrecoTrend()
+    for minute in range(0, 600, 5):
+        trend.update(minute * 60, 10 + 2 * minute / 60)
+
+    assert trend.slope == pytest.approx(2.0, rel=1e-3)
+    assert trend.forecast(30) == pytest.approx(10 + 2 * 595 / 60 + 1, rel=1e-3)
+    assert trend.snapshot == {"slope": 2.0, "forecast": round(trend.forecast(30), 1)}
+
+
+def test_irregular_steps_and_duplicates():
+    """Le pas irrégulier est pris en compte, un horodatage répété est ignoré."""
+    trend = VivrecoTrend()
+    assert trend.snapshot == {"slope": None, "forecast": None}
+    for seconds in (0, 300, 360, 1800, 1800, 2000, 5400, 7200):
+        trend.update(seconds, 20 - seconds / 3600)
+
+    assert trend.slope == pytest.approx(-1.0, rel=0.1)
+    trend.update(7200, 50.0)
+    assert trend.level == pytest.approx(18.0, abs=0.05)